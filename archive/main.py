@@ -1,11 +1,285 @@
-from bs4 import BeautifulSoup
+from lxml import etree
 import os
-from datetime import datetime
+import re
+from calendar import timegm
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+
+MESSAGES_FILE_NUMBER = re.compile(r"messages(\d*)\.html$")
+
+
+DATE_FORMAT = "%d.%m.%Y %H:%M:%S UTC%z"
+
+# The messages of a page were sent within few days and time zones, so the
+# recently seen days and offsets are kept instead of parsing them every time.
+MEMO_SIZE = 4096
+DAY_PREFIXES = {}
+TIMEZONES = {}
+
+
+def parse_day(day_string):
+    # `27.02.2023` -> (2023, 2, 27, UNIX timestamp of the day's midnight in UTC)
+    day = DAY_PREFIXES.get(day_string)
+    if day is None:
+        year, month, day_ = int(day_string[6:]), int(day_string[3:5]), int(day_string[:2])
+        day = (year, month, day_, timegm(datetime(year, month, day_).timetuple()))
+        if len(DAY_PREFIXES) >= MEMO_SIZE:
+            DAY_PREFIXES.clear()
+
+        DAY_PREFIXES[day_string] = day
+
+    return day
+
+
+def parse_timezone(offset_string):
+    # `+01:00` or `+0100` -> (timezone, offset in seconds)
+    zone = TIMEZONES.get(offset_string)
+    if zone is None:
+        digits = offset_string[1:].replace(":", "")
+        if offset_string[0] not in "+-" or len(digits) != 4 or not digits.isdigit():
+            raise ValueError(f"Malformed time zone: {offset_string!r}")
+
+        offset = int(digits[:2]) * 3600 + int(digits[2:]) * 60
+        if offset_string[0] == "-":
+            offset = -offset
+
+        zone = (timezone(timedelta(seconds=offset)), offset)
+        if len(TIMEZONES) >= MEMO_SIZE:
+            TIMEZONES.clear()
+
+        TIMEZONES[offset_string] = zone
+
+    return zone
+
+
+def split_date_string(date_string):
+    # Slices the fixed `DD.MM.YYYY HH:MM:SS UTC+HH:MM` format, falling back to
+    # `strptime` for anything else.
+    if (
+        len(date_string) < 24
+        or date_string[2] != "."
+        or date_string[5] != "."
+        or date_string[10] != " "
+        or date_string[13] != ":"
+        or date_string[16] != ":"
+        or date_string[19:23] != " UTC"
+    ):
+        date = datetime.strptime(date_string, DATE_FORMAT)
+        offset = int(date.utcoffset().total_seconds())
+        day = (date.year, date.month, date.day, timegm(date.date().timetuple()))
+        return day, date.hour, date.minute, date.second, (date.tzinfo, offset)
+
+    hour = int(date_string[11:13])
+    minute = int(date_string[14:16])
+    second = int(date_string[17:19])
+    if hour > 23 or minute > 59 or second > 59:
+        raise ValueError(f"Malformed date: {date_string!r}")
+
+    return (
+        parse_day(date_string[:10]),
+        hour,
+        minute,
+        second,
+        parse_timezone(date_string[23:]),
+    )
 
 
 def parse_date_string(date_string):
-    format_string = "%d.%m.%Y %H:%M:%S UTC%z"
-    return datetime.strptime(date_string, format_string)
+    (year, month, day, _), hour, minute, second, (tzinfo, _) = split_date_string(
+        date_string
+    )
+    return datetime(year, month, day, hour, minute, second, tzinfo=tzinfo)
+
+
+def parse_timestamp(date_string):
+    # Returns the UNIX timestamp of a date, or None for messages without one.
+    if date_string is None:
+        return None
+
+    day, hour, minute, second, (_, offset) = split_date_string(date_string)
+    return day[3] + hour * 3600 + minute * 60 + second - offset
+
+
+def has_class(element, class_):
+    # Matches like BeautifulSoup's `class_`: a single class is looked up in the
+    # element's classes, while several classes must match the attribute exactly.
+    classes = element.get("class")
+    if classes is None:
+        return False
+
+    if " " in class_:
+        return classes == class_
+
+    return class_ in classes.split()
+
+
+def find_element(element, tag, class_):
+    for descendant in element.iterdescendants(tag):
+        if has_class(descendant, class_):
+            return descendant
+
+    return None
+
+
+def get_text(element):
+    if element is None:
+        return None
+
+    return "".join(element.itertext())
+
+
+# The fields of a message, keyed by the tag and class of the element holding
+# them. An element matches the first time it is met inside the element of the
+# enclosing entry, like a `find()` call on it would. Every entry can take the
+# element's text into a field, its attributes into fields, and look up the
+# entries of `children` inside of it.
+MESSAGE_SCHEMA = {
+    ("div", "initials"): {"text": "initials"},
+    ("div", "body"): {
+        "children": {
+            # Telegram writes `pull_right date details`, so the date is matched
+            # by its class alone.
+            ("div", "date"): {"text": "time_", "attributes": {"title": "date_"}},
+            ("div", "from_name"): {"text": "from_name"},
+            ("div", "reply_to"): {"text": "reply_to"},
+            ("div", "text"): {"text": "text"},
+            ("div", "media_wrap"): {
+                "children": {
+                    # For calls
+                    ("div", "media_call"): {
+                        "children": {
+                            ("div", "title"): {"text": "media_call_title"},
+                            ("div", "status"): {"text": "media_call_status"},
+                        },
+                    },
+                    # For share location
+                    ("a", "media_live_location"): {
+                        "attributes": {"href": "media_live_location_map_url"},
+                        "children": {
+                            ("div", "title"): {"text": "media_live_location_title"},
+                            ("div", "status"): {"text": "media_live_location_status"},
+                        },
+                    },
+                    # For photos
+                    ("a", "photo_wrap"): {
+                        "attributes": {"href": "photo_path"},
+                        "children": {
+                            ("img", "photo"): {"attributes": {"src": "photo_thumb_path"}},
+                        },
+                    },
+                    # For round videos
+                    ("a", "media_video"): {
+                        "attributes": {"href": "round_video_message_path"},
+                        "children": {
+                            ("img", "thumb"): {
+                                "attributes": {"src": "round_video_message_thumb_path"}
+                            },
+                            ("div", "title"): {"text": "round_video_message_title"},
+                            ("div", "status"): {"text": "round_video_message_status"},
+                        },
+                    },
+                    # For video files
+                    ("a", "video_file_wrap"): {
+                        "attributes": {"href": "video_file_path"},
+                        "children": {
+                            ("img", "video_file"): {
+                                "attributes": {"src": "video_file_thumb_path"}
+                            },
+                            ("div", "video_duration"): {"text": "video_file_duration"},
+                        },
+                    },
+                    # For voice messages
+                    ("a", "media_voice_message"): {
+                        "attributes": {"href": "media_voice_message_path"},
+                        "children": {
+                            ("div", "title"): {"text": "media_voice_message_title"},
+                            ("div", "status"): {"text": "media_voice_message_status"},
+                        },
+                    },
+                },
+            },
+        },
+    },
+}
+
+
+class FieldExtractor:
+    def __init__(self, schema):
+        # Every entry is compiled to a tuple of its number, the field of its
+        # text, its attribute and field pairs and its compiled children. The
+        # number indexes the flags marking the entries already matched while
+        # extracting a message.
+        self.fields = []
+        self.rule_count = 0
+        self.rules = self.compile(schema)
+
+    def compile(self, schema):
+        rules = {}
+        for key, entry in schema.items():
+            text_field = entry.get("text")
+            attributes = tuple(entry.get("attributes", {}).items())
+            children = entry.get("children")
+            if children is not None:
+                children = self.compile(children)
+
+            if text_field is not None:
+                self.fields.append(text_field)
+
+            self.fields.extend(field for _, field in attributes)
+
+            rules[key] = (self.rule_count, text_field, attributes, children)
+            self.rule_count += 1
+
+        return rules
+
+    def extract(self, element):
+        # Walks the element once, matching every descendant against the entries
+        # of the elements enclosing it.
+        fields = dict.fromkeys(self.fields)
+        matched = [False] * self.rule_count
+        self.visit(element, (self.rules,), matched, fields)
+        return fields
+
+    def visit(self, element, scopes, matched, fields):
+        for child in element:
+            tag = child.tag
+            if not isinstance(tag, str):
+                continue
+
+            child_scopes = scopes
+            classes = child.get("class")
+            if classes is not None:
+                # A single class is looked up in the element's classes, several
+                # ones must match the attribute exactly, like in `has_class`.
+                keys = [(tag, classes)]
+                keys.extend((tag, class_) for class_ in classes.split())
+
+                for scope in scopes:
+                    for key in keys:
+                        rule = scope.get(key)
+                        if rule is None:
+                            continue
+
+                        index, text_field, attributes, children = rule
+                        if matched[index]:
+                            continue
+
+                        matched[index] = True
+                        if text_field is not None:
+                            fields[text_field] = get_text(child)
+
+                        for name, field in attributes:
+                            fields[field] = child.get(name)
+
+                        if children is not None:
+                            child_scopes = child_scopes + (children,)
+
+            if len(child):
+                self.visit(child, child_scopes, matched, fields)
+
+
+MESSAGE_EXTRACTOR = FieldExtractor(MESSAGE_SCHEMA)
 
 
 class MessageService:
@@ -19,10 +293,14 @@ class MessageService:
     def __repr__(self):
         return f"MessageService(id_={self.id_}, body_details='{self.body_details}')"
 
+    def __reduce__(self):
+        # Sent between processes as a plain tuple of the fields.
+        return type(self), (self.id_, self.body_details)
+
     @classmethod
-    def from_bs4(cls, bs4):
-        body_details = bs4.find("div", class_="body details").text
-        return MessageService(bs4["id"], body_details)
+    def from_lxml(cls, element):
+        body_details = get_text(find_element(element, "div", "body details"))
+        return cls(element.get("id"), body_details)
 
 
 class MessageJoined:
@@ -30,10 +308,6 @@ class MessageJoined:
         self.id_ = id_
         self.body_details = body_details
 
-    @classmethod
-    def from_bs4(cls, bs4):
-        pass
-
 
 class Message:
     def __init__(
@@ -92,129 +366,108 @@ class Message:
         self.media_voice_message_title = media_voice_message_title
         self.media_voice_message_status = media_voice_message_status
 
-    @classmethod
-    def from_bs4(cls, bs4):
-        _body = bs4.find("div", class_="body")
-        _date = _body.find("div", class_="date details")
+        # The date is kept as a UNIX timestamp, the datetime is only created when
+        # asked for.
+        self.timestamp = parse_timestamp(date_)
 
-        # required stuff
-        id_ = bs4["id"]
-        initials = bs4.find("div", class_="initials")
-        time_ = _date.text
-        date_ = _date["title"]
-        from_name = _date.find("div", class_="from_name").text
+    def __str__(self):
+        return f"Message {self.id_} from {self.from_name}: {self.text}"
 
-        # not required
-        reply_to = _body.find("div", class_="reply_to").text
-        text = _body.find("div", class_="text").text
+    @property
+    def datetime(self):
+        if self.timestamp is None:
+            return None
 
-        _media_wrap = _body.find("div", class_="media_wrap")
+        return datetime.fromtimestamp(self.timestamp, timezone.utc)
 
-        if _media_wrap is None:
-            return cls(id_, initials, time_, date_, from_name)
+    def __repr__(self):
+        return f"Message(id_={self.id_}, from_name='{self.from_name}', text='{self.text}')"
+
+    def __reduce__(self):
+        # Sent between processes as a plain tuple of the fields, in the order of
+        # the constructor's parameters.
+        return type(self), (
+            self.id_,
+            self.initials,
+            self.time_,
+            self.date_,
+            self.from_name,
+            self.reply_to,
+            self.text,
+            self.media_call_title,
+            self.media_call_status,
+            self.media_live_location_map_url,
+            self.media_live_location_title,
+            self.media_live_location_status,
+            self.photo_path,
+            self.photo_thumb_path,
+            self.round_video_message_path,
+            self.round_video_message_thumb_path,
+            self.round_video_message_title,
+            self.round_video_message_status,
+            self.video_file_path,
+            self.video_file_thumb_path,
+            self.video_file_duration,
+            self.media_voice_message_path,
+            self.media_voice_message_title,
+            self.media_voice_message_status,
+        )
 
-        # For calls
-        _media_call = _media_wrap.find("div", class_="media_call")
-        if _media_call is None:
-            media_call_title = None
-            media_call_status = None
+    @classmethod
+    def from_lxml(cls, element):
+        # Every field is extracted as a string, since the streaming engine
+        # clears the element afterwards.
+        return cls(element.get("id"), **MESSAGE_EXTRACTOR.extract(element))
+
+
+def iter_html_messages(path):
+    # Streams the messages of a `messages*.html` file: every message div is
+    # parsed as soon as it is closed, then it and the messages before it are
+    # removed from the tree, so memory does not grow with the file.
+    for _, element in etree.iterparse(path, events=("end",), tag="div", html=True):
+        classes = element.get("class")
+        if classes is None or "message" not in classes.split():
+            continue
 
+        if "service" in classes.split():
+            parsed_message = MessageService.from_lxml(element)
         else:
-            media_call_title = _media_call.find("div", class_="title")
-            media_call_status = _media_call.find("div", class_="status")
+            parsed_message = Message.from_lxml(element)
 
-        # For share location
-        _media_live_location = _media_wrap.find("a", class_="media_live_location")
-        if _media_live_location is None:
-            media_live_location_map_url = None
-            media_live_location_title = None
-            media_live_location_status = None
+        element.clear(keep_tail=True)
+        parent = element.getparent()
+        while element.getprevious() is not None:
+            del parent[0]
 
-        else:
-            media_live_location_map_url = _media_live_location["href"]
-            media_live_location_title = _media_live_location.find("div", class_="title")
-            media_live_location_status = _media_live_location.find(
-                "div", class_="status"
-            )
-
-        # For photos
-        _photo_wrap = _media_wrap.find("a", class_="photo_wrap")
-        if _photo_wrap is None:
-            photo_path = None
-            photo_thumb_path = None
+        yield parsed_message
 
-        else:
-            photo_path = _photo_wrap["href"]
-            photo_thumb_path = _photo_wrap.find("img", class_="photo")["src"]
 
-        # For round videos
-        _media_video = _media_wrap.find("a", class_="media_video")
-        if _media_video is None:
-            round_video_message_path = None
-            round_video_message_thumb_path = None
-            round_video_message_title = None
-            round_video_message_status = None
+def parse_html_file(path):
+    return list(iter_html_messages(path))
 
-        else:
-            round_video_message_path = _media_video["href"]
-            round_video_message_thumb_path = _media_video.find("img", class_="thumb")[
-                "src"
-            ]
-            round_video_message_title = _media_video.find("div", class_="title")
-            round_video_message_status = _media_video.find("div", class_="status")
-
-        # For video files
-        _video_file_wrap = _media_wrap.find("a", class_="video_file_wrap")
-        if _video_file_wrap is None:
-            video_file_path = None
-            video_file_thumb_path = None
-            video_file_duration = None
 
-        else:
-            video_file_path = _video_file_wrap["href"]
-            video_file_thumb_path = _video_file_wrap.find("img", class_="video_file")[
-                "src"
-            ]
-            video_file_duration = _video_file_wrap.find("div", class_="video_duration")
-
-        # For voice messages
-        _media_voice_message = _media_wrap.find("a", class_="media_voice_message")
-        if _media_voice_message is None:
-            media_voice_message_path = None
-            media_voice_message_title = None
-            media_voice_message_status = None
+def parse_html_files(paths, workers=None):
+    # Every page is parsed in a worker process, the pages are yielded in the
+    # given order as soon as they and the pages before them are done.
+    if workers == 1 or len(paths) < 2:
+        for path in paths:
+            yield from iter_html_messages(path)
 
-        else:
-            media_voice_message_path = _media_voice_message["href"]
-            media_voice_message_title = _media_voice_message.find("div", "title")
-            media_voice_message_status = _media_voice_message.find("div", "status")
-
-        return cls(
-            id_,
-            initials,
-            time_,
-            date_,
-            from_name,
-            reply_to=reply_to,
-            text=text,
-            media_call_title=media_call_title,
-            media_call_status=media_call_status,
-            media_live_location_map_url=media_live_location_map_url,
-            media_live_location_title=media_live_location_title,
-            media_live_location_status=media_live_location_status,
-            photo_path=photo_path,
-            photo_thumb_path=photo_thumb_path,
-            round_video_message_path=round_video_message_path,
-            round_video_message_thumb_path=round_video_message_thumb_path,
-            round_video_message_title=round_video_message_title,
-            round_video_message_status=round_video_message_status,
-            video_file_path=video_file_path,
-            video_file_thumb_path=video_file_thumb_path,
-            video_file_duration=video_file_duration,
-            media_voice_message_path=media_voice_message_path,
-            media_voice_message_title=media_voice_message_title,
-            media_voice_message_status=media_voice_message_status,
-        )
+        return
+
+    with ProcessPoolExecutor(workers) as executor:
+        for messages in executor.map(parse_html_file, paths):
+            yield from messages
+
+
+def get_messages_file_number(file_name):
+    # `messages.html` is the first page, followed by `messages2.html`,
+    # `messages3.html`, ...
+    match = MESSAGES_FILE_NUMBER.search(file_name)
+    if match is None or not match.group(1):
+        return 1
+
+    return int(match.group(1))
 
 
 def find_messages_files(directory):
@@ -226,12 +479,10 @@ def find_messages_files(directory):
 
         message_files.append(os.path.join(directory, file_name))
 
-    return sorted(message_files)
-
-
-def parse_messages_service(messages_service):
-    body_details = messages_service.find("div", class_="body details")
-    return MessageService(messages_service["id"], body_details)
+    return sorted(
+        message_files,
+        key=lambda path: (get_messages_file_number(os.path.basename(path)), path),
+    )
 
 
 def parse_messages_joined(messages_service):
@@ -257,28 +508,18 @@ if __name__ == "__main__":
     message_joined_list = []
     message_list = []
 
-    for message_file_path in message_files_paths:
-        with open(message_file_path) as message_file:
-            zoup = BeautifulSoup(message_file, "lxml")
+    for parsed_message in parse_html_files(message_files_paths):
+        message_all.append(parsed_message)
 
-        for child in zoup.find_all("div", class_="message"):
-            child_class = child["class"]
+        # check what kind of message
+        if isinstance(parsed_message, MessageService):
+            message_service_list.append(parsed_message)
 
-            # check what kind of child
-            if "service" in child_class:
-                parsed_message = parse_messages_service(child)
-                message_all.append(parsed_message)
-                message_service_list.append(parsed_message)
+        elif parsed_message.from_name is None:
+            message_joined_list.append(parsed_message)
 
-            elif "joined" in child_class:
-                parsed_message = parse_messages_joined(child)
-                # message_all.append(parsed_message)
-                # message_joined_list.append(parsed_message)
-
-            else:
-                parsed_message = parse_messages(child)
-                # message_all.append(parsed_message)
-                # message_list.append(parsed_message)
+        else:
+            message_list.append(parsed_message)
 
     # print the output
     for message in message_all:
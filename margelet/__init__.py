@@ -1,3 +1,35 @@
+from .cache import *
 from .entity import *
+from .frame import *
+from .hashing import *
+from .incremental import *
+from .index import *
+from .lazy import *
+from .media import *
+from .merge import *
+from .reader import *
+from .search import *
+from .sqlite import *
+from .symbols import *
+from .text import *
+from .thread import *
+from .timeline import *
 
-__all__ = (*entity.__all__,)
+__all__ = (
+    *cache.__all__,
+    *entity.__all__,
+    *frame.__all__,
+    *hashing.__all__,
+    *incremental.__all__,
+    *index.__all__,
+    *lazy.__all__,
+    *media.__all__,
+    *merge.__all__,
+    *reader.__all__,
+    *search.__all__,
+    *sqlite.__all__,
+    *symbols.__all__,
+    *text.__all__,
+    *thread.__all__,
+    *timeline.__all__,
+)
@@ -0,0 +1,485 @@
+__all__ = ("BackupCache", "CacheStats")
+
+import hashlib
+import marshal
+import mmap
+import os
+import struct
+import sys
+import zlib
+
+from .entity import Backup, Chat, File, Message, TextEntity
+from .lazy import LazyMessageList
+from .symbols import MESSAGE_SYMBOL_FIELDS, SymbolTable
+
+
+CACHE_FILE_SUFFIX = ".cache"
+CACHE_MAGIC = b"MRGLCCH\x03"
+# The marshal format differs between Python versions, so snapshots are tagged
+# with the version that wrote them.
+CACHE_VERSION = (
+    f"{sys.implementation.name}-{sys.version_info[0]}.{sys.version_info[1]}-"
+    f"{marshal.version}"
+).encode("ascii")
+CACHE_HEADER = struct.Struct("<8s24sQQQI")
+DEFAULT_CACHE_DIRECTORY = os.path.join(os.path.expanduser("~"), ".cache", "margelet")
+
+MESSAGE_FIELDS = tuple(
+    field for field in Message.__slots__ if not field.startswith("_")
+)
+MESSAGE_PARAMETERS = tuple(
+    {"timestamp": "date_unixtime", "edited_timestamp": "edited_unixtime"}.get(
+        field, field
+    )
+    for field in MESSAGE_FIELDS
+)
+FILE_SECTIONS = Backup.DIRECTORIES
+
+
+def update_tree_digest(digest, path, prefix):
+    """
+    Feeds the relative path, size and modification time of every file and folder
+    under a folder into a digest.
+
+    Parameters
+    ----------
+    digest : hashlib._Hash
+        The digest to update.
+    path : str
+        The path to the folder.
+    prefix : str
+        The relative path of the folder, written before the names of its entries.
+
+    """
+    folders = [(prefix, path)]
+    while folders:
+        prefix, path = folders.pop()
+        try:
+            with os.scandir(path) as iterator:
+                entries = sorted(iterator, key=lambda entry: entry.name)
+        except (FileNotFoundError, NotADirectoryError):
+            digest.update(f"{prefix}\0missing\n".encode("utf-8", "surrogateescape"))
+            continue
+
+        for entry in entries:
+            relative_path = f"{prefix}/{entry.name}"
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+
+            digest.update(
+                f"{relative_path}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode(
+                    "utf-8", "surrogateescape"
+                )
+            )
+            if entry.is_dir():
+                folders.append((relative_path, entry.path))
+
+
+class CacheStats:
+    """
+    A class counting the outcomes of backup cache lookups.
+
+    Attributes
+    ----------
+    hits : int
+        The amount of backups loaded from the cache.
+    misses : int
+        The amount of backups that had no cache entry.
+    stale : int
+        The amount of cache entries ignored because the backup changed.
+    stores : int
+        The amount of backups written to the cache.
+
+    Methods
+    -------
+    __init__()
+        Initializes a new instance of CacheStats.
+
+    """
+
+    __slots__ = ("hits", "misses", "stale", "stores")
+
+    def __init__(self):
+        """
+        Initializes a new instance of the CacheStats class.
+        """
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.stores = 0
+
+    def __repr__(self):
+        """
+        Returns a string representation of the CacheStats instance.
+
+        Returns
+        -------
+        str
+            A string representation of the CacheStats instance.
+
+        """
+        return (
+            f"CacheStats(hits={self.hits}, misses={self.misses}, "
+            f"stale={self.stale}, stores={self.stores})"
+        )
+
+
+class BackupCache:
+    """
+    A class persisting parsed backups as compact binary snapshots.
+
+    Every backup folder gets one snapshot, keyed by the folder's path and
+    invalidated by the size and modification time of its `result.json` file and
+    of every file and folder within its media directories. The snapshot stores
+    the messages column by column, it is memory mapped when loaded and each column
+    is only decoded when first needed.
+
+    Attributes
+    ----------
+    directory : str
+        The directory the snapshots are stored in.
+    stats : CacheStats
+        The outcomes of the lookups made through this cache.
+
+    Methods
+    -------
+    __init__(directory=None)
+        Initializes a new instance of BackupCache.
+    get_cache_path(folder_path)
+        Returns the path the snapshot of a backup folder is stored at.
+    get_fingerprint(folder_path)
+        Returns the values identifying the current state of a backup folder.
+    load(folder_path, symbols=None)
+        Loads the snapshot of a backup folder if it is still valid.
+    store(backup)
+        Writes the snapshot of a backup.
+
+    """
+
+    __slots__ = ("directory", "stats")
+
+    def __init__(self, directory=None):
+        """
+        Initializes a new instance of the BackupCache class.
+
+        Parameters
+        ----------
+        directory : str, optional
+            The directory the snapshots are stored in. Defaults to
+            `~/.cache/margelet`.
+
+        """
+        if directory is None:
+            directory = DEFAULT_CACHE_DIRECTORY
+
+        self.directory = directory
+        self.stats = CacheStats()
+
+    def __repr__(self):
+        """
+        Returns a string representation of the BackupCache instance.
+
+        Returns
+        -------
+        str
+            A string representation of the BackupCache instance.
+
+        """
+        return f"BackupCache(directory='{self.directory}', stats={self.stats})"
+
+    def get_cache_path(self, folder_path):
+        """
+        Returns the path the snapshot of a backup folder is stored at.
+
+        Parameters
+        ----------
+        folder_path : str
+            The path to the folder containing the backup data.
+
+        Returns
+        -------
+        str
+            The path to the snapshot.
+
+        """
+        key = hashlib.sha1(os.path.abspath(folder_path).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, key + CACHE_FILE_SUFFIX)
+
+    @staticmethod
+    def get_fingerprint(folder_path):
+        """
+        Returns the values identifying the current state of a backup folder.
+
+        Parameters
+        ----------
+        folder_path : str
+            The path to the folder containing the backup data.
+
+        Returns
+        -------
+        tuple
+            The absolute folder path, the size and modification time of
+            `result.json`, None if it is missing, and the digest of the media
+            directories' trees.
+
+        """
+        try:
+            stat = os.stat(os.path.join(folder_path, Backup.CHAT_FILE_NAME))
+        except FileNotFoundError:
+            chat_file = None
+        else:
+            chat_file = (stat.st_size, stat.st_mtime_ns)
+
+        digest = hashlib.sha1()
+        for name in Backup.DIRECTORIES:
+            update_tree_digest(digest, os.path.join(folder_path, name), name)
+
+        return (os.path.abspath(folder_path), chat_file, digest.digest())
+
+    def load(self, folder_path, symbols=None):
+        """
+        Loads the snapshot of a backup folder if it is still valid.
+
+        Snapshots written by another Python version, truncated or otherwise
+        corrupt are counted as misses, so the backup is parsed and stored again.
+
+        Parameters
+        ----------
+        folder_path : str
+            The path to the folder containing the backup data.
+        symbols : SymbolTable, optional
+            The table to intern the repeated fields of the messages with. Defaults
+            to a new table.
+
+        Returns
+        -------
+        Backup or None
+            The cached backup, or None if there is no valid snapshot.
+
+        """
+        try:
+            with open(self.get_cache_path(folder_path), "rb") as file:
+                data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            self.stats.misses += 1
+            return None
+
+        snapshot = _Snapshot(data, symbols)
+        if snapshot.fingerprint is None:
+            data.close()
+            self.stats.misses += 1
+            return None
+
+        if snapshot.fingerprint != self.get_fingerprint(folder_path):
+            data.close()
+            self.stats.stale += 1
+            return None
+
+        self.stats.hits += 1
+        return snapshot.to_backup(folder_path)
+
+    def store(self, backup):
+        """
+        Writes the snapshot of a backup.
+
+        Parameters
+        ----------
+        backup : Backup
+            The backup loaded from its folder.
+
+        Raises
+        ------
+        ValueError
+            If the backup was not loaded from a folder.
+
+        """
+        if backup.folder_path is None:
+            raise ValueError("Backup has no folder_path to cache it by")
+
+        fingerprint = marshal.dumps(self.get_fingerprint(backup.folder_path))
+        sections = {}
+
+        chat = backup.chat
+        if chat is None:
+            sections["chat"] = None
+            messages = []
+        else:
+            sections["chat"] = (chat.name, chat.type_, chat.id_, len(chat.messages))
+            messages = chat.messages
+
+        for name in FILE_SECTIONS:
+            sections[name] = [
+                (file.name, file.thumbnail_name, file.size, file.mtime_ns)
+                for file in getattr(backup, name)
+            ]
+
+        columns = {field: [] for field in MESSAGE_FIELDS}
+        text_entities = []
+        for message in messages:
+            for field, column in columns.items():
+                column.append(getattr(message, field))
+
+            entities = [
+                (text_entity.type_, text_entity.text)
+                for text_entity in message.text_entities
+            ]
+            if isinstance(message.text, str) and (
+                entities == [("plain", message.text)] if message.text else not entities
+            ):
+                entities = None
+
+            text_entities.append(entities)
+
+        sections.update(columns)
+        sections["text_entities"] = text_entities
+
+        table = {}
+        blobs = []
+        offset = 0
+        for name, value in sections.items():
+            blob = marshal.dumps(value)
+            table[name] = (offset, len(blob))
+            blobs.append(blob)
+            offset += len(blob)
+
+        table = marshal.dumps(table)
+        checksum = 0
+        for blob in blobs:
+            checksum = zlib.crc32(blob, checksum)
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.get_cache_path(backup.folder_path)
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+
+        with open(temporary_path, "wb") as file:
+            file.write(
+                CACHE_HEADER.pack(
+                    CACHE_MAGIC,
+                    CACHE_VERSION,
+                    len(fingerprint),
+                    len(table),
+                    offset,
+                    checksum,
+                )
+            )
+            file.write(fingerprint)
+            file.write(table)
+            for blob in blobs:
+                file.write(blob)
+
+        os.replace(temporary_path, path)
+        self.stats.stores += 1
+
+
+class _Snapshot:
+    """
+    A memory mapped snapshot decoding its sections on first access.
+    """
+
+    __slots__ = ("columns", "data", "fingerprint", "start", "symbols", "table")
+
+    def __init__(self, data, symbols=None):
+        if symbols is None:
+            symbols = SymbolTable()
+
+        self.fingerprint = None
+        self.symbols = symbols
+        if len(data) < CACHE_HEADER.size:
+            return
+
+        (
+            magic,
+            version,
+            fingerprint_length,
+            table_length,
+            sections_length,
+            checksum,
+        ) = CACHE_HEADER.unpack_from(data)
+        if magic != CACHE_MAGIC or version.rstrip(b"\0") != CACHE_VERSION:
+            return
+
+        offset = CACHE_HEADER.size
+        start = offset + fingerprint_length + table_length
+        if start + sections_length != len(data):
+            return
+
+        # The sections are checked up front, so decoding them on first access
+        # cannot fail.
+        with memoryview(data) as view, view[start:] as sections:
+            if zlib.crc32(sections) != checksum:
+                return
+
+        try:
+            fingerprint = marshal.loads(data[offset : offset + fingerprint_length])
+            offset += fingerprint_length
+            self.table = marshal.loads(data[offset:start])
+        except (EOFError, ValueError, TypeError):
+            return
+
+        self.fingerprint = fingerprint
+        self.start = start
+        self.data = data
+        self.columns = {}
+
+    def get_section(self, name):
+        """Decodes a section, caching it."""
+        try:
+            return self.columns[name]
+        except KeyError:
+            pass
+
+        offset, length = self.table[name]
+        offset += self.start
+        value = marshal.loads(self.data[offset : offset + length])
+        self.columns[name] = value
+        return value
+
+    def get_message(self, position):
+        """Creates the message at the given position from the columns."""
+        message_columns = self.columns.get(None)
+        if message_columns is None:
+            message_columns = [self.get_section(field) for field in MESSAGE_FIELDS]
+            intern = self.symbols.intern
+            for index, field in enumerate(MESSAGE_FIELDS):
+                if field in MESSAGE_SYMBOL_FIELDS:
+                    column = message_columns[index]
+                    message_columns[index] = [intern(value) for value in column]
+
+            self.columns[None] = message_columns
+
+        fields = dict(
+            zip(MESSAGE_PARAMETERS, [column[position] for column in message_columns])
+        )
+        entities = self.get_section("text_entities")[position]
+        if entities is not None:
+            entities = [
+                TextEntity(self.symbols.intern(type_), text) for type_, text in entities
+            ]
+
+        fields["text_entities"] = entities
+        return Message(**fields)
+
+    def to_backup(self, folder_path):
+        """Creates the backup stored in the snapshot."""
+        media = [
+            [File(*fields) for fields in self.get_section(name)]
+            for name in FILE_SECTIONS
+        ]
+
+        header = self.get_section("chat")
+        if header is None:
+            chat = None
+        else:
+            name, type_, id_, count = header
+            messages = LazyMessageList(range(count), self.get_message)
+            chat = Chat(
+                name=name,
+                type_=type_,
+                id_=id_,
+                messages=messages,
+                symbols=self.symbols,
+            )
+
+        return Backup(*media, chat, folder_path)
@@ -1,10 +1,40 @@
-__all__ = ("TextEntity", "Message", "Chat", "Backup", "File")
-
+__all__ = (
+    "TextEntity",
+    "TextEntityRuns",
+    "Message",
+    "Chat",
+    "ChatStream",
+    "AsyncChatStream",
+    "Backup",
+    "BackupLoadResult",
+    "File",
+)
+
+import asyncio
 import os
-from typing import List
+import threading
+from array import array
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from functools import partial
+from itertools import islice
+from typing import List, Sequence
+
+from .index import MessageIndex
+from .lazy import LazyMessageList
+from .media import MediaIndex
+from .ndjson import iter_ndjson, load_line, open_ndjson, read_ndjson, write_ndjson
+from .parallel import read_records_parallel
+from .reader import ResultReader, load_record, read_record_slices
+from .search import SearchIndex
+from .symbols import SymbolTable
+from .text import flatten_text
+from .thread import ReplyGraph
+from .timeline import TimeIndex, get_day_range, to_timestamp, to_unixtime
 
 
 THUMBNAIL_SUFFIX = "_thumb.jpg"
+ASYNC_BATCH_SIZE = 1000
 
 
 class TextEntity:
@@ -25,7 +55,11 @@ class TextEntity:
         Returns a string representation of the TextEntity instance.
     __str__()
         Returns a string representation of the TextEntity instance.
-    from_dict(data)
+    __eq__(other)
+        Returns whether the two text entities are equal.
+    __reduce__()
+        Returns the arguments to recreate the TextEntity instance when unpickling.
+    from_dict(data, symbols=None)
         Creates a new TextEntity instance from a dictionary.
 
     """
@@ -71,8 +105,35 @@ class TextEntity:
         """
         return f"Type: {self.type_}, Text: {self.text}"
 
+    def __eq__(self, other):
+        """
+        Returns whether the two text entities are equal.
+
+        Returns
+        -------
+        bool
+            Whether the two text entities are equal.
+
+        """
+        if type(self) is not type(other):
+            return NotImplemented
+
+        return self.type_ == other.type_ and self.text == other.text
+
+    def __reduce__(self):
+        """
+        Returns the arguments to recreate the TextEntity instance when unpickling.
+
+        Returns
+        -------
+        tuple
+            The class and its constructor arguments.
+
+        """
+        return type(self), (self.type_, self.text)
+
     @classmethod
-    def from_dict(cls, data):
+    def from_dict(cls, data, symbols=None):
         """
         Creates a new TextEntity instance from a dictionary.
 
@@ -80,6 +141,8 @@ class TextEntity:
         ----------
         data : dict
             The dictionary containing 'type' and 'text' keys.
+        symbols : SymbolTable, optional
+            The table to intern the type with.
 
         Returns
         -------
@@ -87,7 +150,260 @@ class TextEntity:
             A new TextEntity instance.
 
         """
-        return cls(type_=data["type"], text=data["text"])
+        type_ = data["type"]
+        if symbols is not None:
+            type_ = symbols.intern(type_)
+
+        return cls(type_=type_, text=data["text"])
+
+
+class TextEntityRuns:
+    """
+    A class storing the text entities of a message as runs into its flattened
+    text.
+
+    Every entity is stored as the code of its type in the chat's symbol table,
+    its start and its length in the flattened text, and a `TextEntity` is only
+    created when accessed.
+
+    Attributes
+    ----------
+    text : str
+        The flattened text of the message.
+    runs : array
+        The type code, start and length of every entity.
+    symbols : SymbolTable
+        The table the type codes belong to.
+
+    Methods
+    -------
+    __init__(text, runs, symbols)
+        Initializes a new instance of TextEntityRuns.
+    __len__()
+        Returns the amount of text entities.
+    __getitem__(index)
+        Returns the text entity at the given index, or a list of them for a slice.
+    __iter__()
+        Yields the text entities.
+    __eq__(other)
+        Returns whether the text entities are equal to the given ones.
+    __reduce__()
+        Returns the arguments to recreate the TextEntityRuns instance when
+        unpickling.
+    from_dicts(text, entity_dicts, symbols=None)
+        Creates a new TextEntityRuns instance from the raw text entities of a
+        message.
+    intern_types(symbols)
+        Moves the type codes over to another symbol table.
+
+    """
+
+    __slots__ = ("text", "runs", "symbols")
+
+    def __init__(self, text, runs, symbols):
+        """
+        Initializes a new instance of the TextEntityRuns class.
+
+        Parameters
+        ----------
+        text : str
+            The flattened text of the message.
+        runs : array
+            The type code, start and length of every entity.
+        symbols : SymbolTable
+            The table the type codes belong to.
+
+        """
+        self.text = text
+        self.runs = runs
+        self.symbols = symbols
+
+    def __repr__(self):
+        """
+        Returns a string representation of the TextEntityRuns instance.
+
+        Returns
+        -------
+        str
+            A string representation of the TextEntityRuns instance.
+
+        """
+        return f"TextEntityRuns({list(self)!r})"
+
+    def __len__(self):
+        """
+        Returns the amount of text entities.
+
+        Returns
+        -------
+        int
+            The amount of text entities.
+
+        """
+        return len(self.runs) // 3
+
+    def __getitem__(self, index):
+        """
+        Returns the text entity at the given index, or a list of them for a slice.
+
+        Parameters
+        ----------
+        index : int or slice
+            The index of the text entity.
+
+        Returns
+        -------
+        TextEntity or List[TextEntity]
+            The created text entity, or entities.
+
+        Raises
+        ------
+        IndexError
+            If the index is out of range.
+
+        """
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+
+        length = len(self)
+        if index < 0:
+            index += length
+
+        if not 0 <= index < length:
+            raise IndexError("TextEntityRuns index out of range")
+
+        code, start, length = self.runs[index * 3 : index * 3 + 3]
+        return TextEntity(self.symbols.symbols[code], self.text[start : start + length])
+
+    def __iter__(self):
+        """
+        Yields the text entities, creating them one at a time.
+
+        Yields
+        ------
+        TextEntity
+            The next text entity.
+
+        """
+        for index in range(len(self)):
+            yield self[index]
+
+    def __eq__(self, other):
+        """
+        Returns whether the text entities are equal to the given ones.
+
+        Returns
+        -------
+        bool
+            Whether the text entities are equal.
+
+        """
+        if not isinstance(other, (list, tuple, TextEntityRuns)):
+            return NotImplemented
+
+        return len(self) == len(other) and all(
+            entity == other_entity for entity, other_entity in zip(self, other)
+        )
+
+    def __reduce__(self):
+        """
+        Returns the arguments to recreate the TextEntityRuns instance when
+        unpickling.
+
+        The symbol table is sent along with the runs. Runs pickled together
+        share a single copy of it, keeping their codes valid.
+
+        Returns
+        -------
+        tuple
+            The class and its constructor arguments.
+
+        """
+        return type(self), (self.text, self.runs, self.symbols)
+
+    @classmethod
+    def from_dicts(cls, text, entity_dicts, symbols=None):
+        """
+        Creates a new TextEntityRuns instance from the raw text entities of a
+        message.
+
+        Parameters
+        ----------
+        text : str or list
+            The text of the message.
+        entity_dicts : list of dict
+            The dictionaries containing the 'type' and 'text' keys of the
+            entities.
+        symbols : SymbolTable, optional
+            The table to intern the types with. Defaults to a new table.
+
+        Returns
+        -------
+        TextEntityRuns or None
+            A new TextEntityRuns instance, or None if the entities do not follow
+            each other in the text.
+
+        """
+        if symbols is None:
+            symbols = SymbolTable()
+
+        text = flatten_text(text)
+        runs = array("i")
+        intern_code = symbols.intern_code
+        start = 0
+
+        for entity_dict in entity_dicts:
+            entity_text = entity_dict["text"]
+            if not text.startswith(entity_text, start):
+                return None
+
+            runs.append(intern_code(entity_dict["type"]))
+            runs.append(start)
+            runs.append(len(entity_text))
+            start += len(entity_text)
+
+        return cls(text, runs, symbols)
+
+    def intern_types(self, symbols):
+        """
+        Moves the type codes over to another symbol table.
+
+        Parameters
+        ----------
+        symbols : SymbolTable
+            The table to intern the types with.
+
+        """
+        if symbols is self.symbols:
+            return
+
+        runs = self.runs
+        types = self.symbols.symbols
+        intern_code = symbols.intern_code
+        for index in range(0, len(runs), 3):
+            runs[index] = intern_code(types[runs[index]])
+
+        self.symbols = symbols
+
+
+def _is_plain(text, entity_dicts):
+    """Returns whether the text has no entities other than a single plain one."""
+    if not isinstance(text, str):
+        return False
+
+    if not entity_dicts:
+        return not text
+
+    if len(entity_dicts) != 1:
+        return False
+
+    entity_dict = entity_dicts[0]
+    return entity_dict["type"] == "plain" and entity_dict["text"] == text
+
+
+def _unchanged(value):
+    """Returns the value itself, used instead of interning without a table."""
+    return value
 
 
 class Message:
@@ -96,32 +412,49 @@ class Message:
 
     Attributes
     ----------
-    id_ : str
+    id_ : int
         The ID of the message.
     type_ : str
         The type of the message.
     date : str
         The date of the message.
-    date_unixtime : int
+    timestamp : int
         The UNIX timestamp of the message date.
+    date_unixtime : str
+        The UNIX timestamp of the message date as exported.
+    datetime : datetime
+        The message date in UTC, created on every access.
+    edited_timestamp : int
+        The UNIX timestamp of the last edit, None if the message was not edited.
+    edited_unixtime : str
+        The UNIX timestamp of the last edit as exported.
+    edited_datetime : datetime
+        The date of the last edit in UTC, created on every access.
     from_ : str
         The sender of the message.
     from_id : str
         The ID of the message sender.
-    text : str
+    text : str or list
         The text content of the message.
-    text_entities : List[TextEntity]
-        The text entities associated with the message.
+    text_entities : Sequence[TextEntity]
+        The text entities associated with the message. Messages created from raw
+        data store them as `TextEntityRuns`, or not at all when the text is a
+        single plain run.
+    plain_text : str
+        The text content of the message flattened into a single string,
+        flattened once when first accessed.
 
     Methods
     -------
-    __init__(id_, type_, date, date_unixtime, from_, from_id, text, text_entities)
+    __init__(id_, type_, date, date_unixtime, text, text_entities, **fields)
         Initializes a new instance of Message.
     __repr__()
         Returns a string representation of the Message instance.
     __str__()
         Returns a string representation of the Message instance.
-    from_dict(data)
+    __reduce__()
+        Returns the arguments to recreate the Message instance when unpickling.
+    from_dict(data, symbols=None)
         Creates a new Message instance from a dictionary.
 
     """
@@ -131,17 +464,14 @@ class Message:
         "actor",
         "actor_id",
         "action",
-        "text_entities",
         "emoticon",
-        "date_unixtime",
 
         # optional action fields
         "discard_reason",
         "message_id",
 
         # message fields
-        "date_unixtime",
-        "from",
+        "from_",
         "from_id",
 
         # optional message fields
@@ -150,7 +480,7 @@ class Message:
         "height",
         "reply_to_message_id",
         "edited",
-        "edited_unixtime",
+        "edited_timestamp",
         "file",
         "mime_type",
         "media_type",
@@ -158,80 +488,127 @@ class Message:
 
         # both fields:
         "duration_seconds",
-        "type",
+        "type_",
         "date",
-        "id",
+        "timestamp",
+        "id_",
         "text",
+        "_text_entities",
+        "_plain_text",
     )
 
     def __init__(
         self,
-        # action fields
-        actor,
-        actor_id,
-        action,
+        # both fields:
+        id_,
+        type_,
+        date,
+        date_unixtime,
+        text,
         text_entities,
-        emoticon,
+        duration_seconds=None,
+
+        # action fields
+        actor=None,
+        actor_id=None,
+        action=None,
+        emoticon=None,
 
         # optional action fields
-        discard_reason,
-        message_id,
+        discard_reason=None,
+        message_id=None,
 
         # message fields
-        from_,
-        from_id,
+        from_=None,
+        from_id=None,
 
         # optional message fields
-        photo,
-        width,
-        height,
-        reply_to_message_id,
-        edited,
-        edited_unixtime,
-        file,
-        mime_type,
-        media_type,
-        thumbnail,
-
-        # both fields:
-        date_unixtime,
-        duration_seconds,
-        type_,
-        date,
-        id,
-        text,
+        photo=None,
+        width=None,
+        height=None,
+        reply_to_message_id=None,
+        edited=None,
+        edited_unixtime=None,
+        file=None,
+        mime_type=None,
+        media_type=None,
+        thumbnail=None,
     ):
         """
         Initializes a new instance of the Message class.
 
         Parameters
         ----------
-        id_ : str
+        id_ : int
             The ID of the message.
         type_ : str
             The type of the message.
         date : str
             The date of the message.
-        date_unixtime : int
-            The UNIX timestamp of the message date.
-        from_ : str
+        date_unixtime : int or str
+            The UNIX timestamp of the message date. If None, it is parsed from the
+            date.
+        text : str or list
+            The text content of the message.
+        text_entities : Sequence[TextEntity]
+            The text entities associated with the message, None if the text is a
+            single plain run.
+        duration_seconds : int, optional
+            The duration of the call or media.
+        actor, actor_id, action, emoticon : str, optional
+            The fields of service messages.
+        discard_reason : str, optional
+            The reason a call was discarded.
+        message_id : int, optional
+            The ID of the message a service message refers to.
+        from_ : str, optional
             The sender of the message.
-        from_id : str
+        from_id : str, optional
             The ID of the message sender.
-        text : str
-            The text content of the message.
-        text_entities : TextEntity
-            The text entities associated with the message.
+        photo, file, thumbnail : str, optional
+            The relative paths of the attached media.
+        width, height : int, optional
+            The dimensions of the attached media.
+        reply_to_message_id : int, optional
+            The ID of the message this message replies to.
+        edited : str, optional
+            The date of the last edit.
+        edited_unixtime : int or str, optional
+            The UNIX timestamp of the last edit, parsed from `edited` if None.
+        mime_type, media_type : str, optional
+            The types of the attached media.
 
         """
         self.id_ = id_
         self.type_ = type_
         self.date = date
-        self.date_unixtime = date_unixtime
+        self.timestamp = to_timestamp(date_unixtime, date)
+        self.text = text
+        self._text_entities = text_entities
+        self._plain_text = None
+        self.duration_seconds = duration_seconds
+
+        self.actor = actor
+        self.actor_id = actor_id
+        self.action = action
+        self.emoticon = emoticon
+
+        self.discard_reason = discard_reason
+        self.message_id = message_id
+
         self.from_ = from_
         self.from_id = from_id
-        self.text = text
-        self.text_entities = text_entities
+
+        self.photo = photo
+        self.width = width
+        self.height = height
+        self.reply_to_message_id = reply_to_message_id
+        self.edited = edited
+        self.edited_timestamp = to_timestamp(edited_unixtime, edited)
+        self.file = file
+        self.mime_type = mime_type
+        self.media_type = media_type
+        self.thumbnail = thumbnail
 
     def __repr__(self):
         """
@@ -265,8 +642,176 @@ class Message:
             f"{self.from_}, Text: {self.text}, Text Entities: {self.text_entities}"
         )
 
+    def __reduce__(self):
+        """
+        Returns the arguments to recreate the Message instance when unpickling.
+
+        Recreating the message through its constructor is much faster than
+        restoring the slots one by one, which matters when messages are sent
+        between processes.
+
+        Returns
+        -------
+        tuple
+            The class and its constructor arguments.
+
+        """
+        return type(self), (
+            self.id_,
+            self.type_,
+            self.date,
+            self.timestamp,
+            self.text,
+            self._text_entities,
+            self.duration_seconds,
+            self.actor,
+            self.actor_id,
+            self.action,
+            self.emoticon,
+            self.discard_reason,
+            self.message_id,
+            self.from_,
+            self.from_id,
+            self.photo,
+            self.width,
+            self.height,
+            self.reply_to_message_id,
+            self.edited,
+            self.edited_timestamp,
+            self.file,
+            self.mime_type,
+            self.media_type,
+            self.thumbnail,
+        )
+
+    @property
+    def date_unixtime(self):
+        """
+        Returns the UNIX timestamp of the message date as exported.
+
+        Returns
+        -------
+        str or None
+            The UNIX timestamp, or None if the message has no date.
+
+        """
+        timestamp = self.timestamp
+        if timestamp is None:
+            return None
+
+        return str(timestamp)
+
+    @date_unixtime.setter
+    def date_unixtime(self, date_unixtime):
+        self.timestamp = to_timestamp(date_unixtime, self.date)
+
+    @property
+    def edited_unixtime(self):
+        """
+        Returns the UNIX timestamp of the last edit as exported.
+
+        Returns
+        -------
+        str or None
+            The UNIX timestamp, or None if the message was not edited.
+
+        """
+        edited_timestamp = self.edited_timestamp
+        if edited_timestamp is None:
+            return None
+
+        return str(edited_timestamp)
+
+    @edited_unixtime.setter
+    def edited_unixtime(self, edited_unixtime):
+        self.edited_timestamp = to_timestamp(edited_unixtime, self.edited)
+
+    @property
+    def datetime(self):
+        """
+        Returns the message date.
+
+        Returns
+        -------
+        datetime or None
+            The date in UTC, or None if the message has no date.
+
+        """
+        timestamp = self.timestamp
+        if timestamp is None:
+            return None
+
+        return datetime.fromtimestamp(timestamp, timezone.utc)
+
+    @property
+    def edited_datetime(self):
+        """
+        Returns the date of the last edit.
+
+        Returns
+        -------
+        datetime or None
+            The date in UTC, or None if the message was not edited.
+
+        """
+        edited_timestamp = self.edited_timestamp
+        if edited_timestamp is None:
+            return None
+
+        return datetime.fromtimestamp(edited_timestamp, timezone.utc)
+
+    @property
+    def text_entities(self):
+        """
+        Returns the text entities associated with the message.
+
+        Returns
+        -------
+        Sequence[TextEntity]
+            The text entities. A text that is a single plain run returns a new
+            list every time.
+
+        """
+        text_entities = self._text_entities
+        if text_entities is None:
+            text = self.text
+            return [TextEntity("plain", text)] if text else []
+
+        return text_entities
+
+    @text_entities.setter
+    def text_entities(self, text_entities):
+        self._text_entities = text_entities
+
+    @property
+    def plain_text(self):
+        """
+        Returns the text content of the message flattened into a single string.
+
+        Returns
+        -------
+        str
+            The flattened text.
+
+        """
+        text = self.text
+        if isinstance(text, str):
+            return text
+
+        plain_text = self._plain_text
+        if plain_text is None:
+            text_entities = self._text_entities
+            if isinstance(text_entities, TextEntityRuns):
+                plain_text = text_entities.text
+            else:
+                plain_text = flatten_text(text)
+
+            self._plain_text = plain_text
+
+        return plain_text
+
     @classmethod
-    def from_dict(cls, data):
+    def from_dict(cls, data, symbols=None):
         """
         Creates a new Message instance from a dictionary.
 
@@ -274,6 +819,9 @@ class Message:
         ----------
         data : dict
             The dictionary containing message data.
+        symbols : SymbolTable, optional
+            The table to intern the type, sender, actor, action and media type
+            fields with.
 
         Returns
         -------
@@ -281,16 +829,42 @@ class Message:
             A new Message instance.
 
         """
-        text_entities = [TextEntity.from_dict(dte) for dte in data["text_entities"]]
+        text = data["text"]
+        entity_dicts = data["text_entities"]
+        if _is_plain(text, entity_dicts):
+            text_entities = None
+        else:
+            text_entities = TextEntityRuns.from_dicts(text, entity_dicts, symbols)
+            if text_entities is None:
+                text_entities = [TextEntity.from_dict(dte, symbols) for dte in entity_dicts]
+
+        intern = _unchanged if symbols is None else symbols.intern
         return cls(
             id_=data["id"],
-            type_=data["type"],
+            type_=intern(data["type"]),
             date=data["date"],
-            date_unixtime=data["date_unixtime"],
-            from_=data["from"],
-            from_id=data["from_id"],
-            text=data["text"],
+            date_unixtime=data.get("date_unixtime"),
+            text=text,
             text_entities=text_entities,
+            duration_seconds=data.get("duration_seconds"),
+            actor=intern(data.get("actor")),
+            actor_id=intern(data.get("actor_id")),
+            action=intern(data.get("action")),
+            emoticon=data.get("emoticon"),
+            discard_reason=data.get("discard_reason"),
+            message_id=data.get("message_id"),
+            from_=intern(data.get("from")),
+            from_id=intern(data.get("from_id")),
+            photo=data.get("photo"),
+            width=data.get("width"),
+            height=data.get("height"),
+            reply_to_message_id=data.get("reply_to_message_id"),
+            edited=data.get("edited"),
+            edited_unixtime=data.get("edited_unixtime"),
+            file=data.get("file"),
+            mime_type=intern(data.get("mime_type")),
+            media_type=intern(data.get("media_type")),
+            thumbnail=data.get("thumbnail"),
         )
 
 
@@ -306,25 +880,86 @@ class Chat:
         The type of the chat.
     id_ : str
         The ID of the chat.
-    messages : List[Message]
-        The list of messages in the chat.
+    messages : Sequence[Message]
+        The messages in the chat. Chats created from raw data hold a
+        `LazyMessageList` decoding each message on first access.
+    index : MessageIndex
+        The byte offset index of the chat's file, if the chat was opened with one.
+    time_index : TimeIndex
+        The messages ordered by date, built on the first date query. Reset it to
+        None after changing the messages.
+    search_index : SearchIndex
+        The full-text index of the messages, built on the first search unless
+        loaded beforehand.
+    reply_graph : ReplyGraph
+        The replies of the messages, built on the first thread query. Reset it to
+        None after changing the messages.
+    symbols : SymbolTable
+        The table the repeated fields of the messages were interned with, if the
+        chat was loaded with one.
 
     Methods
     -------
-    __init__(name, type_, id_, messages)
+    __init__(name, type_, id_, messages, index=None, symbols=None)
         Initializes a new instance of Chat.
     __repr__()
         Returns a string representation of the Chat instance.
     __str__()
         Returns a string representation of the Chat instance.
-    from_dict(data)
+    from_dict(data, symbols=None)
         Creates a new Chat instance from a dictionary.
+    from_file(path, workers=None, symbols=None)
+        Creates a new Chat instance from a `result.json` file.
+    iter_messages(path, symbols=None)
+        Streams the messages of a `result.json` file.
+    aiter_messages(path, symbols=None, batch_size=ASYNC_BATCH_SIZE, executor=None)
+        Streams the messages of a `result.json` file without blocking the event
+        loop.
+    open(path, symbols=None)
+        Creates a new Chat instance reading its messages through a byte offset
+        index.
+    from_ndjson(path, symbols=None, compression=None)
+        Creates a new Chat instance from a newline-delimited JSON file.
+    iter_ndjson(path, symbols=None, compression=None)
+        Streams the messages of a newline-delimited JSON file.
+    to_ndjson(path, compression=None)
+        Writes the chat into a newline-delimited JSON file.
+    get_message(id_)
+        Returns the message with the given ID.
+    messages_between(start, end)
+        Returns the messages sent within a time range.
+    messages_on(day, tzinfo=timezone.utc)
+        Returns the messages sent on a day.
+    search(query)
+        Returns the IDs of the messages matching a full-text query.
+    thread(message_id)
+        Returns the messages of the thread a message belongs to.
+    replies_to(message_id)
+        Returns the direct replies to a message.
 
     """
 
-    __slots__ = ("name", "type_", "id_", "messages")
+    __slots__ = (
+        "name",
+        "type_",
+        "id_",
+        "messages",
+        "index",
+        "time_index",
+        "search_index",
+        "reply_graph",
+        "symbols",
+    )
 
-    def __init__(self, name, type_, id_, messages: List[Message]):
+    def __init__(
+        self,
+        name,
+        type_,
+        id_,
+        messages: Sequence[Message],
+        index: MessageIndex = None,
+        symbols: SymbolTable = None,
+    ):
         """
         Initializes a new instance of the Chat class.
 
@@ -336,14 +971,23 @@ class Chat:
             The type of the chat.
         id_ : str
             The ID of the chat.
-        messages : List[Message]
-            The list of messages in the chat.
+        messages : Sequence[Message]
+            The messages in the chat.
+        index : MessageIndex, optional
+            The byte offset index of the chat's file.
+        symbols : SymbolTable, optional
+            The table the repeated fields of the messages were interned with.
 
         """
         self.name = name
         self.type_ = type_
         self.id_ = id_
         self.messages = messages
+        self.index = index
+        self.time_index = None
+        self.search_index = None
+        self.reply_graph = None
+        self.symbols = symbols
 
     def __repr__(self):
         """
@@ -376,7 +1020,7 @@ class Chat:
         )
 
     @classmethod
-    def from_dict(cls, data):
+    def from_dict(cls, data, symbols=None):
         """
         Creates a new Chat instance from a dictionary.
 
@@ -384,6 +1028,9 @@ class Chat:
         ----------
         data : dict
             The dictionary containing chat data.
+        symbols : SymbolTable, optional
+            The table to intern the repeated fields of the messages with. Defaults
+            to a new table.
 
         Returns
         -------
@@ -391,52 +1038,863 @@ class Chat:
             A new Chat instance.
 
         """
-        messages = [Message.from_dict(msg) for msg in data["messages"]]
+        if symbols is None:
+            symbols = SymbolTable()
+
+        messages = LazyMessageList(
+            data["messages"], partial(Message.from_dict, symbols=symbols)
+        )
         return cls(
-            name=data["name"], type_=data["type"], id_=data["id"], messages=messages
+            name=data["name"],
+            type_=data["type"],
+            id_=data["id"],
+            messages=messages,
+            symbols=symbols,
         )
 
+    @classmethod
+    def from_file(cls, path, workers=None, symbols=None):
+        """
+        Creates a new Chat instance from a `result.json` file.
 
-class File:
-    """
-    A class representing a file.
+        Only the json text of every message record is kept, so the whole document
+        is never decoded at once, and each record is decoded into a message when
+        first accessed.
 
-    Attributes
-    ----------
-    file_name : str
-        The name of the file.
-    file_thumbnail_name : str, optional
-        The name of the file's thumbnail (default is None).
+        With multiple workers the messages array is split into chunks which are
+        decoded and turned into messages on a process pool instead, all of them
+        up front. Files too small to benefit are still read serially.
 
-    Methods
-    -------
-    __init__(file_name, file_thumbnail_name=None)
-        Initializes a new instance of File.
-    from_folder(folder_path)
-        Creates a new File instance from a folder path.
+        Parameters
+        ----------
+        path : str
+            The path to the `result.json` file.
+        workers : int, optional
+            The amount of worker processes to decode the messages with.
+        symbols : SymbolTable, optional
+            The table to intern the repeated fields of the messages with. Defaults
+            to a new table.
 
-    """
+        Returns
+        -------
+        Chat
+            A new Chat instance, its messages a `LazyMessageList` either way.
+
+        """
+        if symbols is None:
+            symbols = SymbolTable()
+
+        if workers is not None:
+            result = read_records_parallel(
+                path, workers, partial(Message.from_dict, symbols=SymbolTable())
+            )
+            if result is not None:
+                header, messages = result
+                for message in messages:
+                    symbols.intern_message(message)
+
+                return cls(
+                    name=header.get("name"),
+                    type_=header.get("type"),
+                    id_=header.get("id"),
+                    messages=LazyMessageList.from_messages(messages),
+                    symbols=symbols,
+                )
+
+        header, records = read_record_slices(path)
+        return cls._from_record_slices(header, records, symbols)
 
-    __slots__ = ("name", "thumbnail_name")
+    @classmethod
+    def _from_record_slices(cls, header, records, symbols):
+        """Creates a chat decoding the json text of its records on access."""
+        messages = LazyMessageList(
+            records, partial(load_record, partial(Message.from_dict, symbols=symbols))
+        )
+        return cls(
+            name=header.get("name"),
+            type_=header.get("type"),
+            id_=header.get("id"),
+            messages=messages,
+            symbols=symbols,
+        )
 
-    def __init__(self, name, thumbnail_name=None):
+    @classmethod
+    def iter_messages(cls, path, symbols=None):
         """
-        Initializes a new instance of the File class.
+        Streams the messages of a `result.json` file.
 
         Parameters
         ----------
-        file_name : str
-            The name of the file.
-        file_thumbnail_name : str, optional
-            The name of the file's thumbnail (default is None).
+        path : str
+            The path to the `result.json` file.
+        symbols : SymbolTable, optional
+            The table to intern the repeated fields of the messages with. Defaults
+            to a new table.
 
-        """
-        self.name = name
-        self.thumbnail_name = thumbnail_name
+        Returns
+        -------
+        ChatStream
+            An iterable yielding the messages one at a time, exposing the chat's
+            header fields.
 
-    def __repr__(self):
         """
-        Returns a string representation of the File instance.
+        return ChatStream(path, symbols)
+
+    @classmethod
+    def aiter_messages(
+        cls, path, symbols=None, batch_size=ASYNC_BATCH_SIZE, executor=None
+    ):
+        """
+        Streams the messages of a `result.json` file without blocking the event
+        loop.
+
+        Parameters
+        ----------
+        path : str
+            The path to the `result.json` file.
+        symbols : SymbolTable, optional
+            The table to intern the repeated fields of the messages with. Defaults
+            to a new table.
+        batch_size : int, optional
+            The amount of messages read by each executor call.
+        executor : Executor, optional
+            The executor to read with. Defaults to the event loop's default
+            executor.
+
+        Returns
+        -------
+        AsyncChatStream
+            An asynchronous iterable yielding the messages one at a time.
+
+        """
+        return AsyncChatStream(path, symbols, batch_size, executor)
+
+    @classmethod
+    def open(cls, path, symbols=None):
+        """
+        Creates a new Chat instance reading its messages through a byte offset
+        index.
+
+        The index is loaded from next to the file, or built with one streaming
+        pass and persisted there. Afterwards each message is read from the file
+        only when accessed.
+
+        Parameters
+        ----------
+        path : str
+            The path to the `result.json` file.
+        symbols : SymbolTable, optional
+            The table to intern the repeated fields of the messages with. Defaults
+            to a new table.
+
+        Returns
+        -------
+        Chat
+            A new Chat instance.
+
+        """
+        index = MessageIndex.for_file(path)
+        header = index.header
+        if symbols is None:
+            symbols = SymbolTable()
+
+        def read_message(position):
+            return Message.from_dict(index.read_record(position), symbols)
+
+        messages = LazyMessageList(range(len(index)), read_message)
+        return cls(
+            name=header.get("name"),
+            type_=header.get("type"),
+            id_=header.get("id"),
+            messages=messages,
+            index=index,
+            symbols=symbols,
+        )
+
+    @classmethod
+    def from_ndjson(cls, path, symbols=None, compression=None):
+        """
+        Creates a new Chat instance from a newline-delimited JSON file.
+
+        The lines are read as they are, and each one is decoded into a message
+        only when accessed.
+
+        Parameters
+        ----------
+        path : str
+            The path to the file written by `to_ndjson`, or a part of it.
+        symbols : SymbolTable, optional
+            The table to intern the repeated fields of the messages with. Defaults
+            to a new table.
+        compression : str, optional
+            `"gzip"`, `"bz2"` or `"xz"`. Defaults to the one matching the file's
+            suffix.
+
+        Returns
+        -------
+        Chat
+            A new Chat instance. Its name, type and ID are None if the file has
+            no header line.
+
+        """
+        if symbols is None:
+            symbols = SymbolTable()
+
+        with open_ndjson(path, "r", compression) as file:
+            header, lines = read_ndjson(file)
+
+        messages = LazyMessageList(
+            lines, partial(load_line, partial(Message.from_dict, symbols=symbols))
+        )
+        return cls(
+            name=header.get("name"),
+            type_=header.get("type"),
+            id_=header.get("id"),
+            messages=messages,
+            symbols=symbols,
+        )
+
+    @classmethod
+    def iter_ndjson(cls, path, symbols=None, compression=None):
+        """
+        Streams the messages of a newline-delimited JSON file.
+
+        Parameters
+        ----------
+        path : str
+            The path to the file written by `to_ndjson`, or a part of it.
+        symbols : SymbolTable, optional
+            The table to intern the repeated fields of the messages with. Defaults
+            to a new table.
+        compression : str, optional
+            `"gzip"`, `"bz2"` or `"xz"`. Defaults to the one matching the file's
+            suffix.
+
+        Yields
+        ------
+        Message
+            The next message.
+
+        """
+        if symbols is None:
+            symbols = SymbolTable()
+
+        with open_ndjson(path, "r", compression) as file:
+            yield from iter_ndjson(file, partial(Message.from_dict, symbols=symbols))
+
+    def to_ndjson(self, path, compression=None):
+        """
+        Writes the chat into a newline-delimited JSON file.
+
+        The first line holds the chat's name, type and ID, every further line a
+        message in the format of `result.json`, with its text flattened into a
+        single string. The messages are written one at a time, so lazily loaded
+        chats are never decoded at once.
+
+        Parameters
+        ----------
+        path : str
+            The path to the file.
+        compression : str, optional
+            `"gzip"`, `"bz2"` or `"xz"`. Defaults to the one matching the file's
+            suffix, or no compression.
+
+        Returns
+        -------
+        int
+            The amount of written messages.
+
+        """
+        header = {"name": self.name, "type": self.type_, "id": self.id_}
+        with open_ndjson(path, "w", compression) as file:
+            return write_ndjson(file, header, self.messages)
+
+    def get_message(self, id_):
+        """
+        Returns the message with the given ID.
+
+        With an index only the message's own bytes are read from the file,
+        otherwise the messages are searched one by one.
+
+        Parameters
+        ----------
+        id_ : int
+            The ID of the message.
+
+        Returns
+        -------
+        Message or None
+            The message, or None if the chat has no message with the given ID.
+
+        """
+        if self.index is not None:
+            position = self.index.find(id_)
+            if position is None:
+                return None
+
+            return self.messages[position]
+
+        for message in self.messages:
+            if message.id_ == id_:
+                return message
+
+        return None
+
+    def messages_between(self, start, end):
+        """
+        Returns the messages sent within a time range.
+
+        The messages are ordered by date once, afterwards every query is a binary
+        search.
+
+        Parameters
+        ----------
+        start : int or datetime
+            The inclusive start of the range, as UNIX timestamp or datetime.
+        end : int or datetime
+            The exclusive end of the range, as UNIX timestamp or datetime.
+
+        Returns
+        -------
+        Sequence[Message]
+            The messages in date order, as a lazy sequence when the chat's
+            messages are lazy.
+
+        """
+        time_index = self.time_index
+        if time_index is None:
+            time_index = TimeIndex.from_messages(self.messages)
+            self.time_index = time_index
+
+        return time_index.select(self.messages, to_unixtime(start), to_unixtime(end))
+
+    def messages_on(self, day, tzinfo=timezone.utc):
+        """
+        Returns the messages sent on a day.
+
+        Parameters
+        ----------
+        day : date
+            The day.
+        tzinfo : tzinfo, optional
+            The time zone of the day. Defaults to UTC.
+
+        Returns
+        -------
+        Sequence[Message]
+            The messages in date order.
+
+        """
+        return self.messages_between(*get_day_range(day, tzinfo))
+
+    def search(self, query):
+        """
+        Returns the IDs of the messages matching a full-text query.
+
+        Every word of the query must be present, while quoted parts must be present
+        as a phrase. Hashtags, mentions and links are matched as whole entities.
+
+        Parameters
+        ----------
+        query : str
+            The query.
+
+        Returns
+        -------
+        List[int]
+            The IDs of the matching messages in ascending order.
+
+        """
+        search_index = self.search_index
+        if search_index is None:
+            search_index = SearchIndex.from_messages(self.messages)
+            self.search_index = search_index
+
+        return search_index.search(query)
+
+    def thread(self, message_id):
+        """
+        Returns the messages of the thread a message belongs to.
+
+        The replies of the messages are collected once, afterwards every query
+        only visits the messages of the thread.
+
+        Parameters
+        ----------
+        message_id : int
+            The ID of any message of the thread.
+
+        Returns
+        -------
+        Sequence[Message]
+            The first message of the thread and all its direct and indirect
+            replies in chat order, empty if the chat has no message with the given
+            ID.
+
+        """
+        reply_graph = self._get_reply_graph()
+        return reply_graph.select(self.messages, reply_graph.get_thread(message_id))
+
+    def replies_to(self, message_id):
+        """
+        Returns the direct replies to a message.
+
+        Parameters
+        ----------
+        message_id : int
+            The ID of the message.
+
+        Returns
+        -------
+        Sequence[Message]
+            The replies in chat order.
+
+        """
+        reply_graph = self._get_reply_graph()
+        return reply_graph.select(
+            self.messages, reply_graph.children.get(message_id, ())
+        )
+
+    def _get_reply_graph(self):
+        """Returns the reply graph of the messages, building it if needed."""
+        reply_graph = self.reply_graph
+        if reply_graph is None:
+            reply_graph = ReplyGraph.from_messages(self.messages)
+            self.reply_graph = reply_graph
+
+        return reply_graph
+
+
+class ChatStream:
+    """
+    A class streaming the messages of a `result.json` file.
+
+    The header fields are read when the stream is created, while the messages are
+    decoded one at a time while iterating, so memory usage is bounded by the
+    biggest message instead of the whole file.
+
+    Attributes
+    ----------
+    name : str
+        The name of the chat.
+    type_ : str
+        The type of the chat.
+    id_ : int
+        The ID of the chat.
+    path : str
+        The path to the `result.json` file.
+    symbols : SymbolTable
+        The table the repeated fields of the messages are interned with.
+
+    Methods
+    -------
+    __init__(path, symbols=None)
+        Initializes a new instance of ChatStream.
+    __iter__()
+        Yields the messages of the chat.
+    iter_records()
+        Yields the raw message records of the chat.
+    close()
+        Closes the underlying file.
+
+    """
+
+    __slots__ = ("name", "type_", "id_", "path", "symbols", "_file", "_reader")
+
+    def __init__(self, path, symbols=None):
+        """
+        Initializes a new instance of the ChatStream class.
+
+        Parameters
+        ----------
+        path : str
+            The path to the `result.json` file.
+        symbols : SymbolTable, optional
+            The table to intern the repeated fields of the messages with. Defaults
+            to a new table.
+
+        """
+        if symbols is None:
+            symbols = SymbolTable()
+
+        self.path = path
+        self.symbols = symbols
+        self._file = open(path, "rb")
+
+        try:
+            self._reader = ResultReader(self._file)
+        except BaseException:
+            self._file.close()
+            raise
+
+        header = self._reader.header
+        self.name = header.get("name")
+        self.type_ = header.get("type")
+        self.id_ = header.get("id")
+
+    def __repr__(self):
+        """
+        Returns a string representation of the ChatStream instance.
+
+        Returns
+        -------
+        str
+            A string representation of the ChatStream instance.
+
+        """
+        return (
+            f"ChatStream(name='{self.name}', type_='{self.type_}', id_={self.id_}, "
+            f"path='{self.path}')"
+        )
+
+    def __iter__(self):
+        """
+        Yields the messages of the chat, closing the file when exhausted.
+
+        Yields
+        ------
+        Message
+            The next message of the chat.
+
+        """
+        symbols = self.symbols
+        for data in self.iter_records():
+            yield Message.from_dict(data, symbols)
+
+    def iter_records(self):
+        """
+        Yields the raw message records of the chat, closing the file when
+        exhausted.
+
+        Yields
+        ------
+        dict
+            The next message record.
+
+        """
+        try:
+            for _, _, data in self._reader.iter_records():
+                yield data
+        finally:
+            self.close()
+
+    def __enter__(self):
+        """Returns the stream itself."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Closes the stream."""
+        self.close()
+
+    def close(self):
+        """Closes the underlying file."""
+        self._file.close()
+
+
+def read_batch(iterator, batch_size, factory):
+    """
+    Creates objects from the next items of an iterator.
+
+    Parameters
+    ----------
+    iterator : iterator
+        The iterator to read.
+    batch_size : int
+        The maximal amount of items to read.
+    factory : callable
+        The function creating an object from an item.
+
+    Returns
+    -------
+    list
+        The created objects, empty once the iterator is exhausted.
+
+    """
+    return [factory(item) for item in islice(iterator, batch_size)]
+
+
+class AsyncChatStream:
+    """
+    A class streaming the messages of a `result.json` file without blocking the
+    event loop.
+
+    The file is opened and read on an executor, one batch of messages at a time.
+    Control returns to the event loop between batches, where the iteration can
+    also be cancelled. The file is closed when the iteration ends, fails or is
+    cancelled, after the batch being read finished.
+
+    Attributes
+    ----------
+    name : str
+        The name of the chat, available once opened.
+    type_ : str
+        The type of the chat, available once opened.
+    id_ : int
+        The ID of the chat, available once opened.
+    path : str
+        The path to the `result.json` file.
+    symbols : SymbolTable
+        The table the repeated fields of the messages are interned with.
+    batch_size : int
+        The amount of messages read by each executor call.
+    executor : Executor
+        The executor to read with, None for the event loop's default executor.
+
+    Methods
+    -------
+    __init__(path, symbols=None, batch_size=ASYNC_BATCH_SIZE, executor=None)
+        Initializes a new instance of AsyncChatStream.
+    __aiter__()
+        Yields the messages of the chat.
+    open()
+        Opens the file and reads the chat's header fields.
+    iter_batches()
+        Yields the messages of the chat in batches.
+    iter_record_batches()
+        Yields the raw message records of the chat in batches.
+    close()
+        Closes the underlying file.
+
+    """
+
+    __slots__ = (
+        "name",
+        "type_",
+        "id_",
+        "path",
+        "symbols",
+        "batch_size",
+        "executor",
+        "_closing",
+        "_lock",
+        "_reading",
+        "_stream",
+    )
+
+    def __init__(self, path, symbols=None, batch_size=ASYNC_BATCH_SIZE, executor=None):
+        """
+        Initializes a new instance of the AsyncChatStream class.
+
+        Parameters
+        ----------
+        path : str
+            The path to the `result.json` file.
+        symbols : SymbolTable, optional
+            The table to intern the repeated fields of the messages with. Defaults
+            to a new table.
+        batch_size : int, optional
+            The amount of messages read by each executor call.
+        executor : Executor, optional
+            The executor to read with. Defaults to the event loop's default
+            executor.
+
+        """
+        if symbols is None:
+            symbols = SymbolTable()
+
+        self.name = None
+        self.type_ = None
+        self.id_ = None
+        self.path = path
+        self.symbols = symbols
+        self.batch_size = batch_size
+        self.executor = executor
+        self._closing = False
+        self._lock = threading.Lock()
+        self._reading = False
+        self._stream = None
+
+    def __repr__(self):
+        """
+        Returns a string representation of the AsyncChatStream instance.
+
+        Returns
+        -------
+        str
+            A string representation of the AsyncChatStream instance.
+
+        """
+        return (
+            f"AsyncChatStream(name='{self.name}', type_='{self.type_}', "
+            f"id_={self.id_}, path='{self.path}')"
+        )
+
+    async def __aiter__(self):
+        """
+        Yields the messages of the chat, closing the file when done.
+
+        Yields
+        ------
+        Message
+            The next message of the chat.
+
+        """
+        async for batch in self.iter_batches():
+            for message in batch:
+                yield message
+
+    async def __aenter__(self):
+        """Opens the stream, returning it."""
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        """Closes the stream."""
+        self.close()
+
+    async def open(self):
+        """
+        Opens the file and reads the chat's header fields.
+
+        Raises
+        ------
+        FileNotFoundError
+            If the file does not exist.
+
+        """
+        if self._stream is not None:
+            return
+
+        loop = asyncio.get_running_loop()
+        stream = await loop.run_in_executor(
+            self.executor, ChatStream, self.path, self.symbols
+        )
+        self._stream = stream
+        self.name = stream.name
+        self.type_ = stream.type_
+        self.id_ = stream.id_
+
+    async def iter_batches(self):
+        """
+        Yields the messages of the chat in batches, closing the file when done.
+
+        Yields
+        ------
+        List[Message]
+            The next messages of the chat.
+
+        """
+        async for batch in self._iter_batches(
+            partial(Message.from_dict, symbols=self.symbols)
+        ):
+            yield batch
+
+    async def iter_record_batches(self):
+        """
+        Yields the raw message records of the chat in batches, closing the file
+        when done.
+
+        Yields
+        ------
+        List[dict]
+            The next message records.
+
+        """
+        async for batch in self._iter_batches(_unchanged):
+            yield batch
+
+    async def _iter_batches(self, factory):
+        """Yields the created objects of the records in batches."""
+        await self.open()
+        loop = asyncio.get_running_loop()
+        records = self._stream.iter_records()
+
+        try:
+            while True:
+                batch = await loop.run_in_executor(
+                    self.executor, self._read_batch, records, factory
+                )
+                if not batch:
+                    break
+
+                yield batch
+        finally:
+            # A cancelled batch may still be read on the executor, which then
+            # closes the file itself.
+            with self._lock:
+                self._closing = True
+                reading = self._reading
+
+            if not reading:
+                self.close()
+
+    def _read_batch(self, records, factory):
+        """Reads the next batch on the executor, unless the stream is closing."""
+        with self._lock:
+            if self._closing:
+                return []
+
+            self._reading = True
+
+        try:
+            return read_batch(records, self.batch_size, factory)
+        finally:
+            with self._lock:
+                self._reading = False
+                closing = self._closing
+
+            if closing:
+                self.close()
+
+    def close(self):
+        """Closes the underlying file."""
+        if self._stream is not None:
+            self._stream.close()
+
+
+class File:
+    """
+    A class representing a file.
+
+    Attributes
+    ----------
+    name : str
+        The path of the file relative to its media directory, using `/` as
+        separator.
+    thumbnail_name : str, optional
+        The path of the file's thumbnail relative to its media directory (default
+        is None).
+    size : int, optional
+        The size of the file in bytes, as seen when scanned.
+    mtime_ns : int, optional
+        The modification time of the file in nanoseconds, as seen when scanned.
+
+    Methods
+    -------
+    __init__(name, thumbnail_name=None, size=None, mtime_ns=None)
+        Initializes a new instance of File.
+    from_folder(folder_path)
+        Lists the files of a folder and of its subfolders.
+
+    """
+
+    __slots__ = ("name", "thumbnail_name", "size", "mtime_ns")
+
+    def __init__(self, name, thumbnail_name=None, size=None, mtime_ns=None):
+        """
+        Initializes a new instance of the File class.
+
+        Parameters
+        ----------
+        name : str
+            The path of the file relative to its media directory.
+        thumbnail_name : str, optional
+            The path of the file's thumbnail relative to its media directory
+            (default is None).
+        size : int, optional
+            The size of the file in bytes.
+        mtime_ns : int, optional
+            The modification time of the file in nanoseconds.
+
+        """
+        self.name = name
+        self.thumbnail_name = thumbnail_name
+        self.size = size
+        self.mtime_ns = mtime_ns
+
+    def __repr__(self):
+        """
+        Returns a string representation of the File instance.
 
         Returns
         -------
@@ -461,33 +1919,73 @@ class File:
     @classmethod
     def from_folder(cls, folder_path):
         """
-        Creates a new File instance from a folder path.
+        Lists the files of a folder and of its subfolders.
+
+        Every folder is listed once with `os.scandir`. Thumbnails are paired with
+        the file of the same name without the `_thumb.jpg` suffix from the same
+        listing, and are only listed on their own if that file is missing. The
+        size and modification time of every file are stored from a single stat
+        call.
 
         Parameters
         ----------
         folder_path : str
-            The path to the folder containing the file.
+            The path to the folder containing the files.
 
         Returns
         -------
         list of `File`
-            A list of `File` objects.
+            A list of `File` objects, sorted by name within each folder.
+
+        Raises
+        ------
+        FileNotFoundError
+            If the folder does not exist.
 
         """
         files = []
+        folders = [("", folder_path)]
+
+        while folders:
+            prefix, path = folders.pop()
+            try:
+                with os.scandir(path) as iterator:
+                    entries = sorted(iterator, key=lambda entry: entry.name)
+            except (FileNotFoundError, NotADirectoryError):
+                # Subfolders removed while scanning are skipped.
+                if not prefix:
+                    raise
 
-        for file_name in os.listdir(folder_path):
-            if os.path.isdir(file_name):
                 continue
 
-            file_thumbnail_path = file_name + THUMBNAIL_SUFFIX
-
-            if os.path.isfile(file_thumbnail_path):
-                file = cls(file_name, file_thumbnail_path)
-            else:
-                file = cls(file_name)
-
-            files.append(file)
+            originals = []
+            thumbnails = {}
+
+            for entry in entries:
+                if entry.is_dir():
+                    folders.append((prefix + entry.name + "/", entry.path))
+                elif entry.name.endswith(THUMBNAIL_SUFFIX):
+                    thumbnails[entry.name[: -len(THUMBNAIL_SUFFIX)]] = entry
+                else:
+                    originals.append(entry)
+
+            for entry in originals:
+                thumbnail = thumbnails.pop(entry.name, None)
+                stat = entry.stat()
+                files.append(
+                    cls(
+                        prefix + entry.name,
+                        None if thumbnail is None else prefix + thumbnail.name,
+                        stat.st_size,
+                        stat.st_mtime_ns,
+                    )
+                )
+
+            for entry in thumbnails.values():
+                stat = entry.stat()
+                files.append(
+                    cls(prefix + entry.name, None, stat.st_size, stat.st_mtime_ns)
+                )
 
         return files
 
@@ -508,23 +2006,62 @@ class Backup:
         The list of voice messages in the backup.
     chat : Chat
         The chat in the backup.
+    folder_path : str
+        The path to the folder containing the backup data.
+    symbols : SymbolTable
+        The table the repeated fields of the chat's messages were interned with.
+    media_index : MediaIndex
+        The files keyed by the paths messages refer to them with, built on the
+        first media lookup. Reset it to None after changing the files.
 
     Methods
     -------
-    __init__(files, photos, video_files, voice_messages, chat)
+    __init__(files, photos, video_files, voice_messages, chat, folder_path=None)
         Initializes a new instance of Backup.
     __repr__()
         Returns a string representation of the Backup instance.
     __str__()
         Returns a string representation of the Backup instance.
-    from_folder_path(folder_path)
+    from_folder_path(folder_path, indexed=False, cache=None, workers=None,
+                     symbols=None, threads=SCAN_THREADS)
         Creates a new Backup instance from a folder path.
+    aload(folder_path, symbols=None, batch_size=ASYNC_BATCH_SIZE, executor=None)
+        Creates a new Backup instance from a folder path without blocking the
+        event loop.
+    from_folder_paths(folder_paths, workers=None)
+        Loads many backups concurrently, yielding each one as soon as it is ready.
+    scan_directories(folder_path, threads=SCAN_THREADS)
+        Lists the files of the media directories of a backup folder.
+    iter_messages()
+        Streams the messages of the backup's chat.
+    aiter_messages(batch_size=ASYNC_BATCH_SIZE, executor=None)
+        Streams the messages of the backup's chat without blocking the event
+        loop.
+    load_search_index()
+        Loads the persisted search index of the backup's chat, bringing it up to
+        date.
+    media_for(message)
+        Returns the file attached to a message.
+    check_media()
+        Finds the media references without files and the files without
+        references.
+    to_ndjson(path, compression=None)
+        Writes the backup's chat into a newline-delimited JSON file.
 
     """
 
-    __slots__ = ("files", "photos", "video_files", "voice_messages", "chat")
+    __slots__ = (
+        "files",
+        "photos",
+        "video_files",
+        "voice_messages",
+        "chat",
+        "folder_path",
+        "media_index",
+    )
     DIRECTORIES = ("files", "photos", "video_files", "voice_messages")
     CHAT_FILE_NAME = "result.json"
+    SCAN_THREADS = len(DIRECTORIES)
 
     def __init__(
         self,
@@ -533,6 +2070,7 @@ class Backup:
         video_files: List[File],
         voice_messages: List[File],
         chat: Chat,
+        folder_path=None,
     ):
         """
         Initializes a new instance of the Backup class.
@@ -549,6 +2087,8 @@ class Backup:
             The list of voice messages in the backup.
         chat : Chat
             The chat in the backup.
+        folder_path : str, optional
+            The path to the folder containing the backup data.
 
         """
         self.files = files
@@ -556,6 +2096,8 @@ class Backup:
         self.video_files = video_files
         self.voice_messages = voice_messages
         self.chat = chat
+        self.folder_path = folder_path
+        self.media_index = None
 
     def __repr__(self):
         """
@@ -592,15 +2134,60 @@ class Backup:
             f"  chat: {self.chat}"
         )
 
+    @property
+    def symbols(self):
+        """
+        Returns the table the repeated fields of the chat's messages were interned
+        with.
+
+        Returns
+        -------
+        SymbolTable
+            The symbol table of the chat, or None if the backup has no chat or its
+            messages were not interned.
+
+        """
+        if self.chat is None:
+            return None
+
+        return self.chat.symbols
+
     @classmethod
-    def from_folder_path(cls, folder_path):
+    def from_folder_path(
+        cls,
+        folder_path,
+        indexed=False,
+        cache=None,
+        workers=None,
+        symbols=None,
+        threads=SCAN_THREADS,
+    ):
         """
         Creates a new Backup instance from a folder path.
 
+        The media directories are scanned on a thread pool while the chat is read,
+        so the latencies of the directory listings overlap each other and the
+        decoding instead of adding up.
+
         Parameters
         ----------
         folder_path : str
             The path to the folder containing the backup data.
+        indexed : bool, optional
+            Whether the chat should be opened through a persisted byte offset
+            index instead of being read completely.
+        cache : BackupCache, optional
+            The cache to load the backup from, and to store it in when it has no
+            valid snapshot. A cached chat is always decoded lazily from its
+            snapshot, so `indexed` and `workers` only apply when it is parsed.
+        workers : int, optional
+            The amount of worker processes to decode the messages with.
+        symbols : SymbolTable, optional
+            The table to intern the repeated fields of the messages with, shared
+            between backups when given. Defaults to a new table.
+        threads : int, optional
+            The amount of threads to scan the media directories with, 1 to scan
+            them one after the other before reading the chat.
 
         Returns
         -------
@@ -608,26 +2195,445 @@ class Backup:
             A new Backup instance.
 
         """
-        files = []
-        photos = []
-        video_files = []
-        voice_messages = []
-        chat = None
-
-        for directory in cls.DIRECTORIES:
-            files_in_directory = File.from_folder(os.path.join(folder_path, directory))
-
-            if directory == "chat":
-                chat = files_in_directory[0]
-            elif directory == "files":
-                files.extend(files_in_directory)
-            elif directory == "photos":
-                photos.extend(files_in_directory)
-            elif directory == "video_files":
-                video_files.extend(files_in_directory)
-            elif directory == "voice_messages":
-                voice_messages.extend(files_in_directory)
+        if cache is not None:
+            backup = cache.load(folder_path, symbols)
+            if backup is not None:
+                return backup
+
+        if threads > 1:
+            with ThreadPoolExecutor(threads) as executor:
+                futures = cls._submit_scans(executor, folder_path)
+                chat = cls._read_chat(folder_path, indexed, workers, symbols)
+                media = [future.result() for future in futures]
+        else:
+            media = cls.scan_directories(folder_path, 1)
+            chat = cls._read_chat(folder_path, indexed, workers, symbols)
+
+        backup = cls(*media, chat, folder_path)
+        if cache is not None:
+            cache.store(backup)
+
+        return backup
+
+    @classmethod
+    async def aload(
+        cls, folder_path, symbols=None, batch_size=ASYNC_BATCH_SIZE, executor=None
+    ):
+        """
+        Creates a new Backup instance from a folder path without blocking the
+        event loop.
+
+        The media directories are scanned on the executor while the chat is read
+        there in batches of records, returning control to the event loop between
+        batches. Cancelling the returned coroutine stops reading after the
+        current batch and closes the file.
+
+        Parameters
+        ----------
+        folder_path : str
+            The path to the folder containing the backup data.
+        symbols : SymbolTable, optional
+            The table to intern the repeated fields of the messages with. Defaults
+            to a new table.
+        batch_size : int, optional
+            The amount of records read by each executor call.
+        executor : Executor, optional
+            The executor to scan and read with. Defaults to the event loop's
+            default executor.
+
+        Returns
+        -------
+        Backup
+            A new Backup instance.
+
+        """
+        if symbols is None:
+            symbols = SymbolTable()
+
+        loop = asyncio.get_running_loop()
+        scans = asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    executor, File.from_folder, os.path.join(folder_path, directory)
+                )
+                for directory in cls.DIRECTORIES
+            )
+        )
+
+        try:
+            stream = AsyncChatStream(
+                os.path.join(folder_path, cls.CHAT_FILE_NAME),
+                symbols,
+                batch_size,
+                executor,
+            )
+            try:
+                await stream.open()
+            except FileNotFoundError:
+                chat = None
             else:
-                raise ValueError("Value not in DIRECTORIES")
+                records = []
+                async for batch in stream.iter_record_batches():
+                    records.extend(batch)
+
+                chat = Chat(
+                    name=stream.name,
+                    type_=stream.type_,
+                    id_=stream.id_,
+                    messages=LazyMessageList(
+                        records, partial(Message.from_dict, symbols=symbols)
+                    ),
+                    symbols=symbols,
+                )
+        except BaseException:
+            if not scans.cancel():
+                # Already finished, mark a failure as retrieved.
+                scans.exception()
+
+            raise
+
+        media = await scans
+        return cls(*media, chat, folder_path)
+
+    @classmethod
+    def from_folder_paths(cls, folder_paths, workers=None):
+        """
+        Loads many backups concurrently, yielding each one as soon as it is ready.
+
+        The media directories are scanned and the chats are split into the json
+        text of their records on a thread pool. The records are not decoded there,
+        each one is decoded into a message when first accessed, like with
+        `Chat.from_file`, so no worker processes are used: splitting is mostly
+        file reading, and sending the records back from a process would cost
+        more than it saves. A folder failing to load does not stop the others,
+        its error is reported in its result instead.
+
+        Parameters
+        ----------
+        folder_paths : iterable of str
+            The paths to the folders containing the backup data.
+        workers : int, optional
+            The amount of threads. Defaults to the amount of CPUs.
+
+        Yields
+        ------
+        BackupLoadResult
+            The result of loading each folder, in completion order.
+
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+
+        with ThreadPoolExecutor(workers) as threads:
+            pending = {}
+            for folder_path in folder_paths:
+                chat_file_path = os.path.join(folder_path, cls.CHAT_FILE_NAME)
+                futures = [threads.submit(cls.scan_directories, folder_path)]
+                if os.path.isfile(chat_file_path):
+                    futures.append(threads.submit(read_record_slices, chat_file_path))
+
+                for future in futures:
+                    pending[future] = (folder_path, futures)
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    folder_path, futures = pending.pop(future)
+                    if not all(other.done() for other in futures):
+                        continue
+
+                    try:
+                        media = futures[0].result()
+                        chat = None
+                        if len(futures) > 1:
+                            chat = Chat._from_record_slices(
+                                *futures[1].result(), SymbolTable()
+                            )
+                    except Exception as error:
+                        yield BackupLoadResult(folder_path, None, error)
+                    else:
+                        yield BackupLoadResult(
+                            folder_path, cls(*media, chat, folder_path), None
+                        )
+
+    @classmethod
+    def scan_directories(cls, folder_path, threads=SCAN_THREADS):
+        """
+        Lists the files of the media directories of a backup folder.
+
+        Parameters
+        ----------
+        folder_path : str
+            The path to the folder containing the backup data.
+        threads : int, optional
+            The amount of threads to scan the directories with concurrently, 1 to
+            scan them one after the other.
+
+        Returns
+        -------
+        tuple of (List[File], List[File], List[File], List[File])
+            The files, photos, video files and voice messages of the backup.
+
+        """
+        if threads > 1:
+            with ThreadPoolExecutor(threads) as executor:
+                futures = cls._submit_scans(executor, folder_path)
+                return tuple(future.result() for future in futures)
+
+        return tuple(
+            File.from_folder(os.path.join(folder_path, directory))
+            for directory in cls.DIRECTORIES
+        )
+
+    @classmethod
+    def _submit_scans(cls, executor, folder_path):
+        """Submits the scan of every media directory, returning the futures."""
+        return [
+            executor.submit(File.from_folder, os.path.join(folder_path, directory))
+            for directory in cls.DIRECTORIES
+        ]
+
+    @classmethod
+    def _read_chat(cls, folder_path, indexed, workers, symbols):
+        """Reads the chat of a backup folder, None if it has no chat file."""
+        chat_file_path = os.path.join(folder_path, cls.CHAT_FILE_NAME)
+        if not os.path.isfile(chat_file_path):
+            return None
+
+        if indexed:
+            return Chat.open(chat_file_path, symbols)
+
+        return Chat.from_file(chat_file_path, workers, symbols)
+
+    def iter_messages(self):
+        """
+        Streams the messages of the backup's chat from its `result.json` file.
+
+        Returns
+        -------
+        ChatStream
+            An iterable yielding the messages one at a time.
+
+        Raises
+        ------
+        ValueError
+            If the backup was not loaded from a folder.
+
+        """
+        if self.folder_path is None:
+            raise ValueError("Backup has no folder_path to stream from")
+
+        return Chat.iter_messages(
+            os.path.join(self.folder_path, self.CHAT_FILE_NAME), self.symbols
+        )
+
+    def to_ndjson(self, path, compression=None):
+        """
+        Writes the backup's chat into a newline-delimited JSON file.
+
+        Parameters
+        ----------
+        path : str
+            The path to the file.
+        compression : str, optional
+            `"gzip"`, `"bz2"` or `"xz"`. Defaults to the one matching the file's
+            suffix, or no compression.
+
+        Returns
+        -------
+        int
+            The amount of written messages.
+
+        Raises
+        ------
+        ValueError
+            If the backup has no chat.
+
+        """
+        if self.chat is None:
+            raise ValueError("Backup has no chat to write")
+
+        return self.chat.to_ndjson(path, compression)
+
+    def aiter_messages(self, batch_size=ASYNC_BATCH_SIZE, executor=None):
+        """
+        Streams the messages of the backup's chat from its `result.json` file
+        without blocking the event loop.
+
+        Parameters
+        ----------
+        batch_size : int, optional
+            The amount of messages read by each executor call.
+        executor : Executor, optional
+            The executor to read with. Defaults to the event loop's default
+            executor.
+
+        Returns
+        -------
+        AsyncChatStream
+            An asynchronous iterable yielding the messages one at a time.
+
+        Raises
+        ------
+        ValueError
+            If the backup was not loaded from a folder.
+
+        """
+        if self.folder_path is None:
+            raise ValueError("Backup has no folder_path to stream from")
+
+        return Chat.aiter_messages(
+            os.path.join(self.folder_path, self.CHAT_FILE_NAME),
+            self.symbols,
+            batch_size,
+            executor,
+        )
+
+    def load_search_index(self):
+        """
+        Loads the persisted search index of the backup's chat, bringing it up to
+        date.
 
-        return cls(files, photos, video_files, voice_messages, chat)
+        Messages newer than the saved index are indexed and the index is saved
+        again. A corrupt index, or one saved for another version of `result.json`,
+        is built from scratch. Edited messages are not detected here, index the
+        edited messages of a `ChatDelta` with `SearchIndex.add_messages` for that.
+
+        Returns
+        -------
+        SearchIndex
+            The search index, also set as the chat's `search_index`.
+
+        Raises
+        ------
+        ValueError
+            If the backup was not loaded from a folder or has no chat.
+
+        """
+        if self.folder_path is None or self.chat is None:
+            raise ValueError("Backup has no chat file to index")
+
+        chat_file_path = os.path.join(self.folder_path, self.CHAT_FILE_NAME)
+        path = SearchIndex.get_index_path(chat_file_path)
+        search_index = SearchIndex.load(path, chat_file_path)
+        if search_index is None:
+            search_index = SearchIndex()
+
+        messages = self.chat.messages
+        start = 0
+        if search_index.last_id is not None:
+            end = len(messages)
+            while start < end:
+                middle = (start + end) // 2
+                if messages[middle].id_ <= search_index.last_id:
+                    start = middle + 1
+                else:
+                    end = middle
+
+        if start < len(messages) or search_index.last_id is None:
+            search_index.add_messages(messages[start:])
+            search_index.save(path, chat_file_path)
+
+        self.chat.search_index = search_index
+        return search_index
+
+    def media_for(self, message):
+        """
+        Returns the file attached to a message.
+
+        The files are keyed by their paths once, afterwards every lookup is a
+        dictionary access.
+
+        Parameters
+        ----------
+        message : Message
+            The message.
+
+        Returns
+        -------
+        File or None
+            The file of the message's photo or file, falling back to the file of
+            its thumbnail, or None if the message has no media in the backup.
+
+        """
+        return self._get_media_index().media_for(message)
+
+    def check_media(self):
+        """
+        Finds the media references without files and the files without
+        references.
+
+        Returns
+        -------
+        MediaReport
+            The dangling references of the chat's messages and the orphan files.
+
+        """
+        messages = () if self.chat is None else self.chat.messages
+        return self._get_media_index().check(messages)
+
+    def _get_media_index(self):
+        """Returns the media index of the backup, building it if needed."""
+        media_index = self.media_index
+        if media_index is None:
+            media_index = MediaIndex.from_backup(self)
+            self.media_index = media_index
+
+        return media_index
+
+
+class BackupLoadResult:
+    """
+    A class representing the outcome of loading a backup folder.
+
+    Attributes
+    ----------
+    folder_path : str
+        The path to the folder containing the backup data.
+    backup : Backup
+        The loaded backup, or None if loading failed.
+    error : Exception
+        The error loading the folder failed with, or None on success.
+
+    Methods
+    -------
+    __init__(folder_path, backup, error)
+        Initializes a new instance of BackupLoadResult.
+
+    """
+
+    __slots__ = ("folder_path", "backup", "error")
+
+    def __init__(self, folder_path, backup, error):
+        """
+        Initializes a new instance of the BackupLoadResult class.
+
+        Parameters
+        ----------
+        folder_path : str
+            The path to the folder containing the backup data.
+        backup : Backup
+            The loaded backup, or None if loading failed.
+        error : Exception
+            The error loading the folder failed with, or None on success.
+
+        """
+        self.folder_path = folder_path
+        self.backup = backup
+        self.error = error
+
+    def __repr__(self):
+        """
+        Returns a string representation of the BackupLoadResult instance.
+
+        Returns
+        -------
+        str
+            A string representation of the BackupLoadResult instance.
+
+        """
+        return (
+            f"BackupLoadResult(folder_path='{self.folder_path}', "
+            f"backup={self.backup!r}, error={self.error!r})"
+        )
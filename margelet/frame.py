@@ -0,0 +1,461 @@
+__all__ = ("ChatFrame",)
+
+from array import array
+from functools import partial
+
+from .entity import Message, TextEntity
+from .reader import ResultReader
+from .text import flatten_text
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+MISSING = -1
+
+INTEGER_COLUMNS = (
+    "id_",
+    "date_unixtime",
+    "edited_unixtime",
+    "reply_to_message_id",
+    "duration_seconds",
+    "width",
+    "height",
+    "message_id",
+)
+CATEGORY_COLUMNS = (
+    "type_",
+    "from_",
+    "from_id",
+    "media_type",
+    "mime_type",
+    "actor",
+    "actor_id",
+    "action",
+)
+STRING_COLUMNS = ("date", "text")
+EXTRA_FIELDS = (
+    "edited",
+    "photo",
+    "file",
+    "thumbnail",
+    "emoticon",
+    "discard_reason",
+)
+
+RECORD_KEYS = {"id_": "id", "type_": "type", "from_": "from"}
+
+
+def get_record_field(data, name):
+    """
+    Returns the value of a message field from a raw message record.
+
+    Parameters
+    ----------
+    data : dict
+        The raw message record.
+    name : str
+        The attribute name of the field.
+
+    Returns
+    -------
+    object
+        The value, or None if the record does not have the field.
+
+    """
+    return data.get(RECORD_KEYS.get(name, name))
+
+
+class ChatFrame:
+    """
+    A class storing the messages of a chat column by column.
+
+    Numeric fields are kept in typed arrays, with `MISSING` marking absent
+    values, low cardinality string fields are dictionary encoded, while the dates
+    and the flattened texts are kept in contiguous UTF-8 buffers. Text entities are
+    stored as type code and length runs over the flattened text. Rarely present
+    fields are kept in a sparse mapping.
+
+    Attributes
+    ----------
+    name : str
+        The name of the chat.
+    type_ : str
+        The type of the chat.
+    id_ : int
+        The ID of the chat.
+    columns : dict of (str, array)
+        The integer columns, and the codes of the dictionary encoded columns.
+    categories : dict of (str, list)
+        The distinct values of each dictionary encoded column.
+
+    Methods
+    -------
+    __init__(name, type_, id_)
+        Initializes a new, empty instance of ChatFrame.
+    __len__()
+        Returns the amount of messages.
+    __getitem__(position)
+        Creates the message at the given position.
+    __iter__()
+        Yields the messages, creating them one at a time.
+    from_chat(chat)
+        Creates a new ChatFrame from a chat.
+    from_file(path)
+        Creates a new ChatFrame straight from a `result.json` file.
+    append(get_field)
+        Adds a message to the frame.
+    get_value(name, position)
+        Returns the value of a column at the given position.
+    get_text(position)
+        Returns the flattened text at the given position.
+    get_text_entities(position)
+        Returns the text entities at the given position.
+    to_numpy(name)
+        Returns an integer or code column as a NumPy array.
+
+    """
+
+    __slots__ = (
+        "name",
+        "type_",
+        "id_",
+        "columns",
+        "categories",
+        "_category_codes",
+        "_entity_lengths",
+        "_entity_offsets",
+        "_entity_types",
+        "_extras",
+        "_strings",
+    )
+
+    def __init__(self, name, type_, id_):
+        """
+        Initializes a new, empty instance of the ChatFrame class.
+
+        Parameters
+        ----------
+        name : str
+            The name of the chat.
+        type_ : str
+            The type of the chat.
+        id_ : int
+            The ID of the chat.
+
+        """
+        self.name = name
+        self.type_ = type_
+        self.id_ = id_
+        self.columns = {name: array("q") for name in (*INTEGER_COLUMNS, *CATEGORY_COLUMNS)}
+        self.categories = {name: [] for name in (*CATEGORY_COLUMNS, "text_entities")}
+        self._category_codes = {name: {} for name in self.categories}
+        self._strings = {name: (bytearray(), array("q", [0])) for name in STRING_COLUMNS}
+        self._entity_offsets = array("q", [0])
+        self._entity_types = array("q")
+        self._entity_lengths = array("q")
+        self._extras = {}
+
+    def __repr__(self):
+        """
+        Returns a string representation of the ChatFrame instance.
+
+        Returns
+        -------
+        str
+            A string representation of the ChatFrame instance.
+
+        """
+        return (
+            f"ChatFrame(name='{self.name}', type_='{self.type_}', id_={self.id_}, "
+            f"length={len(self)})"
+        )
+
+    def __len__(self):
+        """
+        Returns the amount of messages.
+
+        Returns
+        -------
+        int
+            The amount of messages.
+
+        """
+        return len(self.columns["id_"])
+
+    def __getitem__(self, position):
+        """
+        Creates the message at the given position.
+
+        Parameters
+        ----------
+        position : int
+            The position of the message.
+
+        Returns
+        -------
+        Message
+            The message, with its text flattened.
+
+        """
+        if position < 0:
+            position += len(self)
+
+        if not 0 <= position < len(self):
+            raise IndexError("ChatFrame index out of range")
+
+        fields = {name: self.get_value(name, position) for name in INTEGER_COLUMNS}
+        for name in CATEGORY_COLUMNS:
+            fields[name] = self.get_value(name, position)
+
+        fields["date"] = self._get_string("date", position)
+        fields["text"] = self.get_text(position)
+        fields["text_entities"] = self.get_text_entities(position)
+
+        extras = self._extras.get(position)
+        if extras is not None:
+            fields.update(extras)
+
+        return Message(**fields)
+
+    def __iter__(self):
+        """
+        Yields the messages, creating them one at a time.
+
+        Yields
+        ------
+        Message
+            The next message.
+
+        """
+        for position in range(len(self)):
+            yield self[position]
+
+    @classmethod
+    def from_chat(cls, chat):
+        """
+        Creates a new ChatFrame from a chat.
+
+        Parameters
+        ----------
+        chat : Chat
+            The chat to store.
+
+        Returns
+        -------
+        ChatFrame
+            A new ChatFrame instance.
+
+        """
+        frame = cls(chat.name, chat.type_, chat.id_)
+
+        for message in chat.messages:
+            frame.append(partial(getattr, message))
+
+        return frame
+
+    @classmethod
+    def from_file(cls, path):
+        """
+        Creates a new ChatFrame straight from a `result.json` file.
+
+        The messages are streamed into the frame without creating a message
+        object for any of them.
+
+        Parameters
+        ----------
+        path : str
+            The path to the `result.json` file.
+
+        Returns
+        -------
+        ChatFrame
+            A new ChatFrame instance.
+
+        """
+        with open(path, "rb") as file:
+            reader = ResultReader(file)
+            header = reader.header
+            frame = cls(header.get("name"), header.get("type"), header.get("id"))
+
+            for _, _, data in reader.iter_records():
+                frame.append(partial(get_record_field, data))
+
+        return frame
+
+    def append(self, get_field):
+        """
+        Adds a message to the frame.
+
+        Parameters
+        ----------
+        get_field : callable
+            Returns the value of a message field by its attribute name. Text
+            entities can be either `TextEntity` instances or raw dictionaries.
+
+        """
+        position = len(self)
+
+        for name in INTEGER_COLUMNS:
+            value = get_field(name)
+            self.columns[name].append(MISSING if value is None else int(value))
+
+        for name in CATEGORY_COLUMNS:
+            self.columns[name].append(self._encode(name, get_field(name)))
+
+        self._append_string("date", get_field("date"))
+
+        text = flatten_text(get_field("text"))
+        self._append_string("text", text)
+
+        text_entities = [
+            (text_entity["type"], text_entity["text"])
+            if isinstance(text_entity, dict)
+            else (text_entity.type_, text_entity.text)
+            for text_entity in get_field("text_entities")
+        ]
+        extras = {}
+        for field in EXTRA_FIELDS:
+            value = get_field(field)
+            if value is not None:
+                extras[field] = value
+
+        if "".join(entity_text for _, entity_text in text_entities) == text:
+            for type_, entity_text in text_entities:
+                self._entity_types.append(self._encode("text_entities", type_))
+                self._entity_lengths.append(len(entity_text))
+        else:
+            extras["text_entities"] = [
+                TextEntity(type_, entity_text) for type_, entity_text in text_entities
+            ]
+
+        self._entity_offsets.append(len(self._entity_types))
+
+        if extras:
+            self._extras[position] = extras
+
+    def get_value(self, name, position):
+        """
+        Returns the value of a column at the given position.
+
+        Parameters
+        ----------
+        name : str
+            The attribute name of the column.
+        position : int
+            The position of the message.
+
+        Returns
+        -------
+        object
+            The value, or None if it is missing.
+
+        """
+        value = self.columns[name][position]
+
+        if name in self.categories:
+            return self.categories[name][value]
+
+        if value == MISSING:
+            return None
+
+        return value
+
+    def get_text(self, position):
+        """
+        Returns the flattened text at the given position.
+
+        Parameters
+        ----------
+        position : int
+            The position of the message.
+
+        Returns
+        -------
+        str
+            The flattened text.
+
+        """
+        return self._get_string("text", position)
+
+    def get_text_entities(self, position):
+        """
+        Returns the text entities at the given position.
+
+        Parameters
+        ----------
+        position : int
+            The position of the message.
+
+        Returns
+        -------
+        List[TextEntity]
+            The text entities of the message.
+
+        """
+        extras = self._extras.get(position)
+        if extras is not None and "text_entities" in extras:
+            return extras["text_entities"]
+
+        text = self.get_text(position)
+        types = self.categories["text_entities"]
+        text_entities = []
+        start = 0
+
+        for index in range(
+            self._entity_offsets[position], self._entity_offsets[position + 1]
+        ):
+            end = start + self._entity_lengths[index]
+            text_entities.append(TextEntity(types[self._entity_types[index]], text[start:end]))
+            start = end
+
+        return text_entities
+
+    def to_numpy(self, name):
+        """
+        Returns an integer or code column as a NumPy array sharing its memory.
+
+        Parameters
+        ----------
+        name : str
+            The attribute name of the column.
+
+        Returns
+        -------
+        numpy.ndarray
+            The column.
+
+        Raises
+        ------
+        RuntimeError
+            If NumPy is not installed.
+
+        """
+        if numpy is None:
+            raise RuntimeError("NumPy is not installed")
+
+        return numpy.frombuffer(self.columns[name], dtype=numpy.int64)
+
+    def _encode(self, name, value):
+        """Returns the code of a dictionary encoded value, adding it if new."""
+        codes = self._category_codes[name]
+        code = codes.get(value)
+        if code is None:
+            code = len(codes)
+            codes[value] = code
+            self.categories[name].append(value)
+
+        return code
+
+    def _append_string(self, name, value):
+        """Adds a value to a string column."""
+        buffer, offsets = self._strings[name]
+        buffer += value.encode("utf-8")
+        offsets.append(len(buffer))
+
+    def _get_string(self, name, position):
+        """Returns the value of a string column at the given position."""
+        buffer, offsets = self._strings[name]
+        return buffer[offsets[position] : offsets[position + 1]].decode("utf-8")
@@ -0,0 +1,358 @@
+__all__ = ("HashCache", "find_duplicates", "hash_backups", "hash_file")
+
+import hashlib
+import marshal
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from .cache import DEFAULT_CACHE_DIRECTORY, CacheStats
+
+
+HASH_CACHE_FILE_NAME = "media.hashes"
+HASH_CACHE_MAGIC = b"MRGLHSH\x01"
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def hash_file(path, chunk_size=HASH_CHUNK_SIZE):
+    """
+    Returns the SHA-256 digest of a file's content.
+
+    The file is read in large chunks into a reused buffer. Hashing releases the
+    GIL, so many files can be hashed on threads concurrently.
+
+    Parameters
+    ----------
+    path : str
+        The path to the file.
+    chunk_size : int, optional
+        The amount of bytes to read at once.
+
+    Returns
+    -------
+    str
+        The hexadecimal digest.
+
+    """
+    digest = hashlib.sha256()
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+
+    with open(path, "rb", buffering=0) as file:
+        while True:
+            size = file.readinto(buffer)
+            if not size:
+                break
+
+            digest.update(view[:size])
+
+    return digest.hexdigest()
+
+
+class HashCache:
+    """
+    A class persisting the content digests of files.
+
+    Digests are keyed by the device, inode, size and modification time of the
+    file, so an unchanged file is identified by a stat call alone, while a
+    changed or replaced file gets a new key. Digests can be looked up from many
+    threads at once.
+
+    Attributes
+    ----------
+    path : str
+        The path the cache is saved at.
+    digests : dict of (tuple of (int, int, int, int), str)
+        The digests keyed by the device, inode, size and modification time in
+        nanoseconds of the files.
+    stats : CacheStats
+        The outcomes of the lookups and saves.
+
+    Methods
+    -------
+    __init__(path=None)
+        Initializes a new instance of HashCache, loading the saved digests.
+    __len__()
+        Returns the amount of cached digests.
+    get_key(stat)
+        Returns the key of a file's digest.
+    get_digest(path)
+        Returns the digest of a file, hashing it only if it is not cached.
+    save()
+        Saves the cache if it has new digests.
+
+    """
+
+    __slots__ = ("path", "digests", "stats", "_changed", "_lock")
+
+    def __init__(self, path=None):
+        """
+        Initializes a new instance of the HashCache class, loading the saved
+        digests.
+
+        Parameters
+        ----------
+        path : str, optional
+            The path the cache is saved at. Defaults to
+            `~/.cache/margelet/media.hashes`.
+
+        """
+        if path is None:
+            path = os.path.join(DEFAULT_CACHE_DIRECTORY, HASH_CACHE_FILE_NAME)
+
+        self.path = path
+        self.digests = {}
+        self.stats = CacheStats()
+        self._changed = False
+        self._lock = threading.Lock()
+
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            return
+
+        if data[: len(HASH_CACHE_MAGIC)] == HASH_CACHE_MAGIC:
+            try:
+                self.digests = marshal.loads(data[len(HASH_CACHE_MAGIC) :])
+            except (EOFError, ValueError, TypeError):
+                pass
+
+    def __repr__(self):
+        """
+        Returns a string representation of the HashCache instance.
+
+        Returns
+        -------
+        str
+            A string representation of the HashCache instance.
+
+        """
+        return (
+            f"HashCache(path='{self.path}', digests={len(self.digests)}, "
+            f"stats={self.stats})"
+        )
+
+    def __len__(self):
+        """
+        Returns the amount of cached digests.
+
+        Returns
+        -------
+        int
+            The amount of cached digests.
+
+        """
+        return len(self.digests)
+
+    @staticmethod
+    def get_key(stat):
+        """
+        Returns the key of a file's digest.
+
+        Parameters
+        ----------
+        stat : os.stat_result
+            The status of the file.
+
+        Returns
+        -------
+        tuple of (int, int, int, int)
+            The device, inode, size and modification time in nanoseconds.
+
+        """
+        return stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    def get_digest(self, path):
+        """
+        Returns the digest of a file, hashing it only if it is not cached.
+
+        Parameters
+        ----------
+        path : str
+            The path to the file.
+
+        Returns
+        -------
+        str
+            The hexadecimal SHA-256 digest.
+
+        Raises
+        ------
+        FileNotFoundError
+            If the file does not exist.
+
+        """
+        key = self.get_key(os.stat(path))
+        with self._lock:
+            digest = self.digests.get(key)
+            if digest is not None:
+                self.stats.hits += 1
+                return digest
+
+            self.stats.misses += 1
+
+        # Files are hashed outside of the lock, so they are read concurrently.
+        digest = hash_file(path)
+        with self._lock:
+            self.digests[key] = digest
+            self._changed = True
+
+        return digest
+
+    def save(self):
+        """
+        Saves the cache if it has new digests.
+        """
+        if not self._changed:
+            return
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._lock:
+            data = marshal.dumps(self.digests)
+
+        temporary_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary_path, "wb") as file:
+            file.write(HASH_CACHE_MAGIC)
+            file.write(data)
+
+        os.replace(temporary_path, self.path)
+        self._changed = False
+        self.stats.stores += 1
+
+
+def iter_media_files(backup):
+    """
+    Yields the media files of a backup with their paths, including their
+    thumbnails.
+
+    Parameters
+    ----------
+    backup : Backup
+        The backup loaded from its folder.
+
+    Yields
+    ------
+    tuple of (str, File)
+        The path relative to the backup folder and the file, the file a thumbnail
+        belongs to for thumbnails.
+
+    Raises
+    ------
+    ValueError
+        If the backup was not loaded from a folder.
+
+    """
+    if backup.folder_path is None:
+        raise ValueError("Backup has no folder_path to hash the media of")
+
+    for directory in backup.DIRECTORIES:
+        for file in getattr(backup, directory):
+            yield f"{directory}/{file.name}", file
+            if file.thumbnail_name is not None:
+                yield f"{directory}/{file.thumbnail_name}", file
+
+
+def get_digest_if_exists(get_digest, path):
+    """
+    Returns the digest of a file, or None if it does not exist anymore.
+
+    Parameters
+    ----------
+    get_digest : callable
+        The function returning the digest of a file.
+    path : str
+        The path to the file.
+
+    Returns
+    -------
+    str or None
+        The hexadecimal digest.
+
+    """
+    try:
+        return get_digest(path)
+    except FileNotFoundError:
+        return None
+
+
+def hash_backups(backups, workers=None, cache=None):
+    """
+    Hashes the media files of backups on a thread pool.
+
+    The files and their thumbnails are hashed. Files removed since their backups
+    were loaded are skipped.
+
+    Parameters
+    ----------
+    backups : iterable of Backup
+        The backups loaded from their folders.
+    workers : int, optional
+        The amount of threads. Defaults to the executor's default.
+    cache : HashCache, optional
+        The cache to look the digests up in and to store new ones in. It is
+        saved afterwards. Without a cache every file is read.
+
+    Returns
+    -------
+    dict of (str, List[tuple of (Backup, str)])
+        The backups and the paths relative to their folders of the files with the
+        same content, keyed by the digest of the content.
+
+    """
+    entries = [
+        (backup, path)
+        for backup in backups
+        for path, _ in iter_media_files(backup)
+    ]
+
+    if cache is None:
+        get_digest = hash_file
+    else:
+        get_digest = cache.get_digest
+
+    with ThreadPoolExecutor(workers) as executor:
+        digests = executor.map(
+            partial(get_digest_if_exists, get_digest),
+            [os.path.join(backup.folder_path, path) for backup, path in entries],
+        )
+        groups = {}
+        for entry, digest in zip(entries, digests):
+            if digest is not None:
+                groups.setdefault(digest, []).append(entry)
+
+    if cache is not None:
+        cache.save()
+
+    return groups
+
+
+def find_duplicates(backups, workers=None, cache=None):
+    """
+    Finds the media files stored more than once within and across backups.
+
+    Parameters
+    ----------
+    backups : iterable of Backup
+        The backups loaded from their folders.
+    workers : int, optional
+        The amount of threads to hash with.
+    cache : HashCache, optional
+        The cache of the digests.
+
+    Returns
+    -------
+    List[List[tuple of (Backup, str)]]
+        The groups of files with the same content, each a list of the backups and
+        the paths relative to their folders.
+
+    """
+    return [
+        group
+        for group in hash_backups(backups, workers, cache).values()
+        if len(group) > 1
+    ]
@@ -0,0 +1,377 @@
+__all__ = ("ChatDelta", "Checkpoint", "read_delta")
+
+import codecs
+import json
+import mmap
+import os
+from functools import partial
+
+from .entity import Message
+from .index import MessageIndex
+from .parallel import decode_chunk
+from .reader import ResultReader, find_record_marker
+
+
+DEFAULT_TAIL_SIZE = 1000
+DECODE_WINDOW = 1 << 12
+
+_DECODER = json.JSONDecoder()
+
+
+class Checkpoint:
+    """
+    A class representing how far a chat was already ingested.
+
+    Attributes
+    ----------
+    last_id : int
+        The ID of the last ingested message.
+    last_date_unixtime : str
+        The UNIX timestamp of the last ingested message, telling a rewritten
+        export reusing its ID apart.
+    tail : dict of (int, str)
+        The last edit timestamps, None for unedited messages, of the most recent
+        ingested messages. Newer exports are checked for edits of these.
+
+    Methods
+    -------
+    __init__(last_id, last_date_unixtime, tail)
+        Initializes a new instance of Checkpoint.
+    from_messages(messages, tail_size=DEFAULT_TAIL_SIZE)
+        Creates a new Checkpoint after the given messages.
+    from_dict(data)
+        Creates a new Checkpoint instance from a dictionary.
+    to_dict()
+        Converts the checkpoint to a json serializable dictionary.
+
+    """
+
+    __slots__ = ("last_id", "last_date_unixtime", "tail")
+
+    def __init__(self, last_id, last_date_unixtime, tail):
+        """
+        Initializes a new instance of the Checkpoint class.
+
+        Parameters
+        ----------
+        last_id : int
+            The ID of the last ingested message.
+        last_date_unixtime : str
+            The UNIX timestamp of the last ingested message.
+        tail : dict of (int, str)
+            The last edit timestamps of the most recent ingested messages.
+
+        """
+        self.last_id = last_id
+        self.last_date_unixtime = last_date_unixtime
+        self.tail = tail
+
+    def __repr__(self):
+        """
+        Returns a string representation of the Checkpoint instance.
+
+        Returns
+        -------
+        str
+            A string representation of the Checkpoint instance.
+
+        """
+        return (
+            f"Checkpoint(last_id={self.last_id}, "
+            f"last_date_unixtime='{self.last_date_unixtime}', tail_size={len(self.tail)})"
+        )
+
+    @classmethod
+    def from_messages(cls, messages, tail_size=DEFAULT_TAIL_SIZE):
+        """
+        Creates a new Checkpoint after the given messages.
+
+        Parameters
+        ----------
+        messages : Sequence[Message]
+            The ingested messages in file order, like `Chat.messages`.
+        tail_size : int, optional
+            The amount of most recent messages to check for edits later.
+
+        Returns
+        -------
+        Checkpoint or None
+            A new Checkpoint instance, or None if there are no messages.
+
+        """
+        if not len(messages):
+            return None
+
+        tail = {
+            message.id_: message.edited_unixtime
+            for message in messages[max(len(messages) - tail_size, 0) :]
+        }
+        last = messages[-1]
+        return cls(last.id_, last.date_unixtime, tail)
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Creates a new Checkpoint instance from a dictionary.
+
+        Parameters
+        ----------
+        data : dict
+            The dictionary created by `to_dict`.
+
+        Returns
+        -------
+        Checkpoint
+            A new Checkpoint instance.
+
+        """
+        return cls(
+            last_id=data["last_id"],
+            last_date_unixtime=data["last_date_unixtime"],
+            tail={id_: edited_unixtime for id_, edited_unixtime in data["tail"]},
+        )
+
+    def to_dict(self):
+        """
+        Converts the checkpoint to a json serializable dictionary.
+
+        Returns
+        -------
+        dict
+            The checkpoint's fields.
+
+        """
+        return {
+            "last_id": self.last_id,
+            "last_date_unixtime": self.last_date_unixtime,
+            "tail": [[id_, edited_unixtime] for id_, edited_unixtime in self.tail.items()],
+        }
+
+
+class ChatDelta:
+    """
+    A class representing the changes of a newer export since a checkpoint.
+
+    Attributes
+    ----------
+    new_messages : List[Message]
+        The messages newer than the checkpoint.
+    edited_messages : List[Message]
+        The messages of the checkpoint's tail edited since.
+    deleted_ids : List[int]
+        The IDs of the checkpoint's tail missing from the newer export.
+    checkpoint : Checkpoint
+        The checkpoint after applying the delta.
+
+    Methods
+    -------
+    __init__(new_messages, edited_messages, deleted_ids, checkpoint)
+        Initializes a new instance of ChatDelta.
+
+    """
+
+    __slots__ = ("new_messages", "edited_messages", "deleted_ids", "checkpoint")
+
+    def __init__(self, new_messages, edited_messages, deleted_ids, checkpoint):
+        """
+        Initializes a new instance of the ChatDelta class.
+
+        Parameters
+        ----------
+        new_messages : List[Message]
+            The messages newer than the checkpoint.
+        edited_messages : List[Message]
+            The messages of the checkpoint's tail edited since.
+        deleted_ids : List[int]
+            The IDs of the checkpoint's tail missing from the newer export.
+        checkpoint : Checkpoint
+            The checkpoint after applying the delta.
+
+        """
+        self.new_messages = new_messages
+        self.edited_messages = edited_messages
+        self.deleted_ids = deleted_ids
+        self.checkpoint = checkpoint
+
+    def __repr__(self):
+        """
+        Returns a string representation of the ChatDelta instance.
+
+        Returns
+        -------
+        str
+            A string representation of the ChatDelta instance.
+
+        """
+        return (
+            f"ChatDelta(new_messages={len(self.new_messages)}, "
+            f"edited_messages={len(self.edited_messages)}, "
+            f"deleted_ids={self.deleted_ids!r}, checkpoint={self.checkpoint!r})"
+        )
+
+
+def read_delta(path, checkpoint, tail_size=DEFAULT_TAIL_SIZE, symbols=None):
+    """
+    Reads the changes of a `result.json` file since a checkpoint.
+
+    Message IDs grow in file order, so the first record of the checkpoint's tail
+    is located without decoding what precedes it: through the persisted
+    `MessageIndex` when it is valid, otherwise by bisecting the byte offsets of an
+    indented file, decoding a single record per step. Only unindented files
+    without an index are scanned from the start, and even then messages are only
+    created from the records at or after the tail.
+
+    Parameters
+    ----------
+    path : str
+        The path to the newer `result.json` file.
+    checkpoint : Checkpoint or None
+        The checkpoint of the previous ingest, None to read everything.
+    tail_size : int, optional
+        The amount of most recent messages the returned checkpoint tracks.
+    symbols : SymbolTable, optional
+        The table to intern the repeated fields of the messages with, like the
+        `symbols` of the chat the delta is applied to.
+
+    Returns
+    -------
+    ChatDelta
+        The changes since the checkpoint.
+
+    Raises
+    ------
+    ValueError
+        If the file does not continue the checkpoint: its message with the
+        checkpoint's last ID has another date, so the export was reset or
+        rewritten and has to be read without a checkpoint.
+
+    """
+    if checkpoint is None:
+        first_id = None
+        last_id = None
+        tail = {}
+    else:
+        last_id = checkpoint.last_id
+        tail = checkpoint.tail
+        first_id = min(tail) if tail else last_id
+
+    messages = _read_messages_from(path, first_id, symbols)
+
+    new_messages = []
+    edited_messages = []
+    seen_ids = set()
+
+    for message in messages:
+        id_ = message.id_
+        if last_id is None or id_ > last_id:
+            new_messages.append(message)
+            continue
+
+        if id_ == last_id and message.date_unixtime != checkpoint.last_date_unixtime:
+            raise ValueError(
+                f"Message {id_} is dated {message.date_unixtime}, not "
+                f"{checkpoint.last_date_unixtime} as at the checkpoint"
+            )
+
+        if id_ in tail:
+            seen_ids.add(id_)
+            if message.edited_unixtime != tail[id_]:
+                edited_messages.append(message)
+
+    deleted_ids = [id_ for id_ in tail if id_ not in seen_ids]
+    new_checkpoint = Checkpoint.from_messages(messages, tail_size) or checkpoint
+    return ChatDelta(new_messages, edited_messages, deleted_ids, new_checkpoint)
+
+
+def _read_messages_from(path, first_id, symbols):
+    """
+    Creates the messages of the file starting at the first with at least the
+    given ID.
+    """
+    if first_id is None:
+        start = None
+    else:
+        index = MessageIndex.load(path)
+        if index is not None:
+            position = _bisect_ids(index.ids, first_id)
+            if position == len(index):
+                return []
+
+            start = index.starts[position]
+        else:
+            start = _bisect_file(path, first_id)
+
+    factory = partial(Message.from_dict, symbols=symbols)
+    if start is not None:
+        return decode_chunk(path, start, os.path.getsize(path), factory)
+
+    with open(path, "rb") as file:
+        return [
+            factory(data)
+            for _, _, data in ResultReader(file).iter_records()
+            if first_id is None or data["id"] >= first_id
+        ]
+
+
+def _bisect_ids(ids, target):
+    """Returns the position of the first ID at least the target."""
+    low = 0
+    high = len(ids)
+    while low < high:
+        middle = (low + high) // 2
+        if ids[middle] < target:
+            low = middle + 1
+        else:
+            high = middle
+
+    return low
+
+
+def _bisect_file(path, target):
+    """
+    Returns the offset of the first record with an ID at least the target, the end
+    of the file if there is none, or None if the file is not indented.
+    """
+    with open(path, "rb") as file:
+        array_start = ResultReader(file).position
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            layout = find_record_marker(data, array_start)
+            if layout is None:
+                return None
+
+            first, marker = layout
+            size = len(data)
+            found = size
+            low = first
+            high = size
+
+            while low < high:
+                middle = (low + high) // 2
+                start = first if middle <= first else data.find(marker, middle)
+                if start == -1:
+                    high = middle
+                    continue
+
+                if _decode_record_at(data, start)["id"] >= target:
+                    found = start
+                    high = middle
+                else:
+                    low = start + 1
+
+    return found
+
+
+def _decode_record_at(data, offset):
+    """Decodes the record starting at the given offset, reading a growing window."""
+    window = DECODE_WINDOW
+    while True:
+        text = codecs.getincrementaldecoder("utf-8")().decode(data[offset : offset + window])
+        position = len(text) - len(text.lstrip())
+        try:
+            return _DECODER.raw_decode(text, position)[0]
+        except json.JSONDecodeError:
+            if offset + window >= len(data):
+                raise
+
+            window *= 2
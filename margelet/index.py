@@ -0,0 +1,381 @@
+__all__ = ("MessageIndex",)
+
+import json
+import os
+import struct
+import sys
+import threading
+from array import array
+
+from .reader import ResultReader
+
+
+INDEX_FILE_SUFFIX = ".index"
+INDEX_MAGIC = b"MRGLIDX\x01"
+INDEX_HEADER = struct.Struct("<8sQqQQ")
+INDEX_ITEM_SIZE = array("q").itemsize
+
+
+class MessageIndex:
+    """
+    A class recording the byte span of every message of a `result.json` file.
+
+    The index is built with a single streaming pass and persisted next to the
+    file. It is invalidated when the size or modification time of the file
+    changes. Records can be read from many threads at once.
+
+    Attributes
+    ----------
+    path : str
+        The path to the `result.json` file.
+    size : int
+        The size of the file when the index was built.
+    mtime_ns : int
+        The modification time of the file when the index was built.
+    header : dict
+        The top-level fields of the chat, excluding the messages.
+    ids : array
+        The message IDs in file order.
+    starts : array
+        The start offsets of the messages.
+    ends : array
+        The end offsets of the messages.
+
+    Methods
+    -------
+    __init__(path, size, mtime_ns, header, ids, starts, ends)
+        Initializes a new instance of MessageIndex.
+    __len__()
+        Returns the amount of indexed messages.
+    get_index_path(path)
+        Returns the path the index of the given file is persisted at.
+    build(path)
+        Creates a new MessageIndex by scanning the file.
+    load(path)
+        Loads the persisted index of the file if it is still valid.
+    for_file(path)
+        Loads the persisted index of the file, or builds and persists it.
+    save()
+        Persists the index next to the file.
+    is_valid()
+        Returns whether the file did not change since the index was built.
+    find(id_)
+        Returns the position of the message with the given ID.
+    read_record(position)
+        Reads and decodes the message record at the given position.
+    close()
+        Closes the file opened for reading records.
+
+    """
+
+    __slots__ = (
+        "path",
+        "size",
+        "mtime_ns",
+        "header",
+        "ids",
+        "starts",
+        "ends",
+        "_file",
+        "_lock",
+        "_positions",
+    )
+
+    def __init__(self, path, size, mtime_ns, header, ids, starts, ends):
+        """
+        Initializes a new instance of the MessageIndex class.
+
+        Parameters
+        ----------
+        path : str
+            The path to the `result.json` file.
+        size : int
+            The size of the file when the index was built.
+        mtime_ns : int
+            The modification time of the file when the index was built.
+        header : dict
+            The top-level fields of the chat, excluding the messages.
+        ids : array
+            The message IDs in file order.
+        starts : array
+            The start offsets of the messages.
+        ends : array
+            The end offsets of the messages.
+
+        """
+        self.path = path
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.header = header
+        self.ids = ids
+        self.starts = starts
+        self.ends = ends
+        self._file = None
+        self._lock = threading.Lock()
+        self._positions = None
+
+    def __repr__(self):
+        """
+        Returns a string representation of the MessageIndex instance.
+
+        Returns
+        -------
+        str
+            A string representation of the MessageIndex instance.
+
+        """
+        return f"MessageIndex(path='{self.path}', length={len(self.ids)})"
+
+    def __len__(self):
+        """
+        Returns the amount of indexed messages.
+
+        Returns
+        -------
+        int
+            The amount of indexed messages.
+
+        """
+        return len(self.ids)
+
+    @staticmethod
+    def get_index_path(path):
+        """
+        Returns the path the index of the given file is persisted at.
+
+        Parameters
+        ----------
+        path : str
+            The path to the `result.json` file.
+
+        Returns
+        -------
+        str
+            The path to the index file.
+
+        """
+        return path + INDEX_FILE_SUFFIX
+
+    @classmethod
+    def build(cls, path):
+        """
+        Creates a new MessageIndex by scanning the file.
+
+        Parameters
+        ----------
+        path : str
+            The path to the `result.json` file.
+
+        Returns
+        -------
+        MessageIndex
+            A new MessageIndex instance.
+
+        """
+        ids = array("q")
+        starts = array("q")
+        ends = array("q")
+
+        with open(path, "rb") as file:
+            stat = os.fstat(file.fileno())
+            reader = ResultReader(file)
+
+            for start, end, data in reader.iter_records():
+                ids.append(data["id"])
+                starts.append(start)
+                ends.append(end)
+
+        return cls(path, stat.st_size, stat.st_mtime_ns, reader.header, ids, starts, ends)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loads the persisted index of the file if it is still valid.
+
+        Parameters
+        ----------
+        path : str
+            The path to the `result.json` file.
+
+        Returns
+        -------
+        MessageIndex or None
+            The loaded index, or None if it is missing, outdated or corrupt.
+
+        """
+        try:
+            with open(cls.get_index_path(path), "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            return None
+
+        if len(data) < INDEX_HEADER.size:
+            return None
+
+        magic, size, mtime_ns, count, header_length = INDEX_HEADER.unpack_from(data)
+        if magic != INDEX_MAGIC:
+            return None
+
+        # A truncated or partially written index is rebuilt.
+        offset = INDEX_HEADER.size
+        if len(data) != offset + header_length + 3 * count * INDEX_ITEM_SIZE:
+            return None
+
+        try:
+            header = json.loads(data[offset : offset + header_length])
+        except ValueError:
+            return None
+
+        offset += header_length
+
+        columns = []
+        for _ in range(3):
+            column = array("q")
+            column.frombytes(data[offset : offset + count * column.itemsize])
+            if sys.byteorder != "little":
+                column.byteswap()
+
+            offset += count * column.itemsize
+            columns.append(column)
+
+        index = cls(path, size, mtime_ns, header, *columns)
+        if not index.is_valid():
+            return None
+
+        return index
+
+    @classmethod
+    def for_file(cls, path):
+        """
+        Loads the persisted index of the file, or builds and persists it.
+
+        Parameters
+        ----------
+        path : str
+            The path to the `result.json` file.
+
+        Returns
+        -------
+        MessageIndex
+            The index of the file.
+
+        """
+        index = cls.load(path)
+        if index is None:
+            index = cls.build(path)
+            try:
+                index.save()
+            except OSError:
+                pass
+
+        return index
+
+    def save(self):
+        """
+        Persists the index next to the file.
+
+        Raises
+        ------
+        OSError
+            If the index could not be written.
+
+        """
+        header = json.dumps(self.header).encode("utf-8")
+
+        index_path = self.get_index_path(self.path)
+        temporary_path = f"{index_path}.{os.getpid()}.tmp"
+
+        with open(temporary_path, "wb") as file:
+            file.write(
+                INDEX_HEADER.pack(
+                    INDEX_MAGIC, self.size, self.mtime_ns, len(self.ids), len(header)
+                )
+            )
+            file.write(header)
+
+            for column in (self.ids, self.starts, self.ends):
+                if sys.byteorder != "little":
+                    column = array("q", column)
+                    column.byteswap()
+
+                file.write(column.tobytes())
+
+        os.replace(temporary_path, index_path)
+
+    def is_valid(self):
+        """
+        Returns whether the file did not change since the index was built.
+
+        Returns
+        -------
+        bool
+            Whether the index is still valid.
+
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+
+        return stat.st_size == self.size and stat.st_mtime_ns == self.mtime_ns
+
+    def find(self, id_):
+        """
+        Returns the position of the message with the given ID.
+
+        Parameters
+        ----------
+        id_ : int
+            The ID of the message.
+
+        Returns
+        -------
+        int or None
+            The position of the message, or None if it is not indexed.
+
+        """
+        positions = self._positions
+        if positions is None:
+            positions = {id_: position for position, id_ in enumerate(self.ids)}
+            self._positions = positions
+
+        return positions.get(id_)
+
+    def read_record(self, position):
+        """
+        Reads and decodes the message record at the given position.
+
+        Parameters
+        ----------
+        position : int
+            The position of the message in the file.
+
+        Returns
+        -------
+        dict
+            The decoded message record.
+
+        """
+        file = self._file
+        if file is None:
+            with self._lock:
+                file = self._file
+                if file is None:
+                    file = open(self.path, "rb")
+                    self._file = file
+
+        start = self.starts[position]
+        length = self.ends[position] - start
+        if hasattr(os, "pread"):
+            return json.loads(os.pread(file.fileno(), length, start))
+
+        with self._lock:
+            file.seek(start)
+            return json.loads(file.read(length))
+
+    def close(self):
+        """Closes the file opened for reading records."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
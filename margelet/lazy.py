@@ -0,0 +1,195 @@
+__all__ = ("LazyMessageList",)
+
+from collections.abc import Sequence
+
+
+class LazyMessageList(Sequence):
+    """
+    A sequence of messages decoded on demand.
+
+    The raw message records are kept as they were read and each one is turned into
+    a message only the first time it is accessed. Taking the length or slicing
+    the sequence never decodes anything. A slice is a view of the positions it
+    covers, sharing the records and the decoded messages with the sequence it
+    was taken from, so a message decoded through either is decoded for both.
+
+    Attributes
+    ----------
+    factory : callable
+        The function creating a message from a raw record.
+
+    Methods
+    -------
+    __init__(records, factory)
+        Initializes a new instance of LazyMessageList.
+    from_messages(messages)
+        Creates a new LazyMessageList of already decoded messages.
+    __getitem__(index)
+        Returns the message at the given index or a lazy slice.
+    __len__()
+        Returns the amount of messages.
+    __iter__()
+        Yields the messages, decoding them one at a time.
+    decoded_count()
+        Returns the amount of messages decoded so far.
+
+    """
+
+    __slots__ = ("factory", "_messages", "_positions", "_records")
+
+    def __init__(self, records, factory):
+        """
+        Initializes a new instance of the LazyMessageList class.
+
+        Parameters
+        ----------
+        records : list
+            The raw message records.
+        factory : callable
+            The function creating a message from a raw record.
+
+        """
+        self.factory = factory
+        self._records = records
+        self._messages = [None] * len(records)
+        self._positions = range(len(records))
+
+    @classmethod
+    def from_messages(cls, messages):
+        """
+        Creates a new LazyMessageList of already decoded messages.
+
+        Parameters
+        ----------
+        messages : List[Message]
+            The messages.
+
+        Returns
+        -------
+        LazyMessageList
+            A new LazyMessageList instance.
+
+        """
+        sequence = cls(messages, _get_message)
+        sequence._messages = list(messages)
+        return sequence
+
+    def __repr__(self):
+        """
+        Returns a string representation of the LazyMessageList instance.
+
+        Returns
+        -------
+        str
+            A string representation of the LazyMessageList instance.
+
+        """
+        return (
+            f"LazyMessageList(length={len(self._positions)}, "
+            f"decoded={self.decoded_count()})"
+        )
+
+    def __len__(self):
+        """
+        Returns the amount of messages.
+
+        Returns
+        -------
+        int
+            The amount of messages.
+
+        """
+        return len(self._positions)
+
+    def __getitem__(self, index):
+        """
+        Returns the message at the given index or a lazy slice.
+
+        Parameters
+        ----------
+        index : int or slice
+            The index or slice to access.
+
+        Returns
+        -------
+        Message or LazyMessageList
+            The message at the index, or a view of the slice sharing the decoded
+            messages.
+
+        """
+        if isinstance(index, slice):
+            sliced = object.__new__(type(self))
+            sliced.factory = self.factory
+            sliced._records = self._records
+            sliced._messages = self._messages
+            sliced._positions = self._positions[index]
+            return sliced
+
+        position = self._positions[index]
+        message = self._messages[position]
+        if message is None:
+            message = self.factory(self._records[position])
+            self._messages[position] = message
+
+        return message
+
+    def __iter__(self):
+        """
+        Yields the messages, decoding them one at a time.
+
+        Yields
+        ------
+        Message
+            The next message.
+
+        """
+        messages = self._messages
+        records = self._records
+        factory = self.factory
+
+        for position in self._positions:
+            message = messages[position]
+            if message is None:
+                message = factory(records[position])
+                messages[position] = message
+
+            yield message
+
+    def __eq__(self, other):
+        """
+        Returns whether the two sequences contain the same messages.
+
+        Returns
+        -------
+        bool
+            Whether the two sequences are equal.
+
+        """
+        if not isinstance(other, Sequence):
+            return NotImplemented
+
+        if len(self) != len(other):
+            return False
+
+        return all(message == other_message for message, other_message in zip(self, other))
+
+    def decoded_count(self):
+        """
+        Returns the amount of messages decoded so far.
+
+        Returns
+        -------
+        int
+            The amount of decoded messages.
+
+        """
+        messages = self._messages
+        if len(self._positions) == len(messages):
+            return len(messages) - messages.count(None)
+
+        return sum(messages[position] is not None for position in self._positions)
+
+
+def _get_message(record):
+    """Returns a record that is already a message."""
+    return record
@@ -0,0 +1,262 @@
+__all__ = ("MediaIndex", "MediaReport")
+
+
+MEDIA_FIELDS = ("photo", "file", "thumbnail")
+
+
+def get_media_paths(message):
+    """
+    Returns the media paths a message refers to.
+
+    Telegram writes a note in parentheses instead of the path of media that was
+    not exported, those are skipped.
+
+    Parameters
+    ----------
+    message : Message
+        The message.
+
+    Returns
+    -------
+    List[str]
+        The paths relative to the backup folder.
+
+    """
+    paths = []
+    for name in MEDIA_FIELDS:
+        path = getattr(message, name)
+        if path is not None and not path.startswith("("):
+            paths.append(path)
+
+    return paths
+
+
+class MediaReport:
+    """
+    A class listing the inconsistencies between the messages and the media of a
+    backup.
+
+    Attributes
+    ----------
+    dangling : List[tuple of (int, str)]
+        The ID of the message and the path of every media reference without a
+        file.
+    orphans : List[tuple of (str, File)]
+        The path and the file of every media file no message refers to.
+
+    Methods
+    -------
+    __init__(dangling, orphans)
+        Initializes a new instance of MediaReport.
+
+    """
+
+    __slots__ = ("dangling", "orphans")
+
+    def __init__(self, dangling, orphans):
+        """
+        Initializes a new instance of the MediaReport class.
+
+        Parameters
+        ----------
+        dangling : List[tuple of (int, str)]
+            The ID of the message and the path of every media reference without a
+            file.
+        orphans : List[tuple of (str, File)]
+            The path and the file of every media file no message refers to.
+
+        """
+        self.dangling = dangling
+        self.orphans = orphans
+
+    def __repr__(self):
+        """
+        Returns a string representation of the MediaReport instance.
+
+        Returns
+        -------
+        str
+            A string representation of the MediaReport instance.
+
+        """
+        return f"MediaReport(dangling={len(self.dangling)}, orphans={len(self.orphans)})"
+
+
+class MediaIndex:
+    """
+    A class mapping the media paths messages refer to to the files of a backup.
+
+    Both the files and their thumbnails are keyed by their path relative to the
+    backup folder, like `photos/photo_1@27-02-2023_10-00-00.jpg`, the form used
+    by the `photo`, `file` and `thumbnail` fields of messages.
+
+    Attributes
+    ----------
+    files : dict of (str, File)
+        The files keyed by their own and by their thumbnail's path.
+    paths : dict of (str, None)
+        The paths of the files, without the thumbnails, in scanning order.
+
+    Methods
+    -------
+    __init__(files, paths)
+        Initializes a new instance of MediaIndex.
+    __len__()
+        Returns the amount of indexed files.
+    from_backup(backup)
+        Creates a new MediaIndex of the media of a backup.
+    get(path)
+        Returns the file at a path.
+    media_for(message)
+        Returns the file attached to a message.
+    check(messages)
+        Finds the references without files and the files without references.
+
+    """
+
+    __slots__ = ("files", "paths")
+
+    def __init__(self, files, paths):
+        """
+        Initializes a new instance of the MediaIndex class.
+
+        Parameters
+        ----------
+        files : dict of (str, File)
+            The files keyed by their own and by their thumbnail's path.
+        paths : dict of (str, None)
+            The paths of the files, without the thumbnails.
+
+        """
+        self.files = files
+        self.paths = paths
+
+    def __repr__(self):
+        """
+        Returns a string representation of the MediaIndex instance.
+
+        Returns
+        -------
+        str
+            A string representation of the MediaIndex instance.
+
+        """
+        return f"MediaIndex(files={len(self.paths)})"
+
+    def __len__(self):
+        """
+        Returns the amount of indexed files.
+
+        Returns
+        -------
+        int
+            The amount of indexed files.
+
+        """
+        return len(self.paths)
+
+    @classmethod
+    def from_backup(cls, backup):
+        """
+        Creates a new MediaIndex of the media of a backup.
+
+        Parameters
+        ----------
+        backup : Backup
+            The backup.
+
+        Returns
+        -------
+        MediaIndex
+            A new MediaIndex instance.
+
+        """
+        files = {}
+        paths = {}
+
+        for directory in backup.DIRECTORIES:
+            for file in getattr(backup, directory):
+                path = f"{directory}/{file.name}"
+                files[path] = file
+                paths[path] = None
+
+                if file.thumbnail_name is not None:
+                    files[f"{directory}/{file.thumbnail_name}"] = file
+
+        return cls(files, paths)
+
+    def get(self, path):
+        """
+        Returns the file at a path.
+
+        Parameters
+        ----------
+        path : str
+            The path relative to the backup folder.
+
+        Returns
+        -------
+        File or None
+            The file, the file the thumbnail belongs to for thumbnail paths, or
+            None if there is no file at the path.
+
+        """
+        return self.files.get(path)
+
+    def media_for(self, message):
+        """
+        Returns the file attached to a message.
+
+        Parameters
+        ----------
+        message : Message
+            The message.
+
+        Returns
+        -------
+        File or None
+            The file of the message's photo or file, falling back to the file of
+            its thumbnail, or None if the message has no media in the backup.
+
+        """
+        files = self.files
+        for path in get_media_paths(message):
+            file = files.get(path)
+            if file is not None:
+                return file
+
+        return None
+
+    def check(self, messages):
+        """
+        Finds the references without files and the files without references.
+
+        Parameters
+        ----------
+        messages : iterable of Message
+            The messages of the backup.
+
+        Returns
+        -------
+        MediaReport
+            The dangling references and the orphan files.
+
+        """
+        files = self.files
+        dangling = []
+        referenced = set()
+
+        for message in messages:
+            for path in get_media_paths(message):
+                file = files.get(path)
+                if file is None:
+                    dangling.append((message.id_, path))
+                else:
+                    referenced.add(id(file))
+
+        orphans = [
+            (path, files[path])
+            for path in self.paths
+            if id(files[path]) not in referenced
+        ]
+        return MediaReport(dangling, orphans)
@@ -0,0 +1,121 @@
+__all__ = ("merge_messages",)
+
+from heapq import merge
+
+from .entity import Chat
+
+
+def get_date_key(message):
+    """
+    Returns the key the dates of messages are compared by when merging.
+
+    Parameters
+    ----------
+    message : Message
+        The message to order.
+
+    Returns
+    -------
+    tuple of (bool, int)
+        Whether the message has a date and its UNIX timestamp, or 0 if it has no
+        date, so messages without a date come first.
+
+    """
+    timestamp = message.timestamp
+    return timestamp is not None, timestamp or 0
+
+
+def get_merge_key(message):
+    """
+    Returns the key messages are ordered by when merging.
+
+    Parameters
+    ----------
+    message : Message
+        The message to order.
+
+    Returns
+    -------
+    tuple of (bool, int, int)
+        The date key of the message, see `get_date_key`, and its ID.
+
+    """
+    return (*get_date_key(message), message.id_)
+
+
+def get_edit_time(message):
+    """
+    Returns the UNIX timestamp of the last edit of a message.
+
+    Parameters
+    ----------
+    message : Message
+        The message to check.
+
+    Returns
+    -------
+    int
+        The timestamp of the last edit, or 0 if it was never edited.
+
+    """
+    edited_timestamp = message.edited_timestamp
+    if edited_timestamp is None:
+        return 0
+
+    return edited_timestamp
+
+
+def merge_messages(sources):
+    """
+    Merges overlapping exports of a chat into one deduplicated timeline.
+
+    The sources are merged lazily by date and ID, keeping a single pending message
+    per source, so memory grows with the amount of sources and the amount of
+    messages sharing a date instead of the amount of messages. A message's date
+    does not change when it is edited, so copies of the same message from
+    different exports are recognized by their ID among the messages of the same
+    date, and only the most recently edited copy is kept; between equally edited
+    copies the one from the later source wins.
+
+    Parameters
+    ----------
+    sources : iterable of (Chat, ChatStream or iterable of Message)
+        The exports to merge, oldest export first. Each must be ordered by date,
+        the messages of the same date may come in any order. Messages without a
+        date are grouped together and must come first.
+
+    Yields
+    ------
+    Message
+        The messages of the merged timeline in order.
+
+    Raises
+    ------
+    ValueError
+        If a source is not ordered by date.
+
+    """
+    iterators = [
+        iter(source.messages) if isinstance(source, Chat) else iter(source)
+        for source in sources
+    ]
+
+    group = {}
+    group_key = None
+
+    for message in merge(*iterators, key=get_merge_key):
+        date_key = get_date_key(message)
+        if date_key != group_key:
+            if group and date_key < group_key:
+                raise ValueError("Sources must be ordered by date")
+
+            yield from group.values()
+            group = {}
+            group_key = date_key
+
+        id_ = message.id_
+        pending = group.get(id_)
+        if pending is None or get_edit_time(message) >= get_edit_time(pending):
+            group[id_] = message
+
+    yield from group.values()
@@ -0,0 +1,232 @@
+__all__ = (
+    "iter_ndjson",
+    "message_to_record",
+    "open_ndjson",
+    "read_ndjson",
+    "write_ndjson",
+)
+
+import bz2
+import gzip
+import json
+import lzma
+
+
+NDJSON_OPENERS = {"gzip": gzip.open, "bz2": bz2.open, "xz": lzma.open}
+NDJSON_SUFFIXES = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz"}
+
+RECORD_FIELDS = (
+    "duration_seconds",
+    "actor",
+    "actor_id",
+    "action",
+    "emoticon",
+    "discard_reason",
+    "message_id",
+    "from_",
+    "from_id",
+    "photo",
+    "width",
+    "height",
+    "reply_to_message_id",
+    "edited",
+    "edited_unixtime",
+    "file",
+    "mime_type",
+    "media_type",
+    "thumbnail",
+)
+RECORD_KEYS = {"from_": "from"}
+
+_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def open_ndjson(path, mode, compression=None):
+    """
+    Opens an NDJSON file for reading or writing text.
+
+    Parameters
+    ----------
+    path : str
+        The path to the file.
+    mode : str
+        `"r"` to read, `"w"` to write or `"a"` to append.
+    compression : str, optional
+        `"gzip"`, `"bz2"` or `"xz"`. Defaults to the one matching the file's
+        suffix, or no compression.
+
+    Returns
+    -------
+    file object
+        The text file.
+
+    Raises
+    ------
+    ValueError
+        If the compression is unknown.
+
+    """
+    if compression is None:
+        for suffix, name in NDJSON_SUFFIXES.items():
+            if path.endswith(suffix):
+                compression = name
+                break
+
+    if compression is None:
+        return open(path, mode, encoding="utf-8", newline="\n")
+
+    opener = NDJSON_OPENERS.get(compression)
+    if opener is None:
+        raise ValueError(f"Unknown compression: {compression!r}")
+
+    return opener(path, mode + "t", encoding="utf-8", newline="\n")
+
+
+def message_to_record(message):
+    """
+    Returns the raw record of a message as written to an NDJSON file.
+
+    The record uses the keys of `result.json`, with the text flattened into a
+    single string next to the list of its entities, and without the fields the
+    message does not have.
+
+    Parameters
+    ----------
+    message : Message
+        The message.
+
+    Returns
+    -------
+    dict
+        The raw message record.
+
+    """
+    record = {
+        "id": message.id_,
+        "type": message.type_,
+        "date": message.date,
+        "date_unixtime": message.date_unixtime,
+        "text": message.plain_text,
+        "text_entities": [
+            {"type": text_entity.type_, "text": text_entity.text}
+            for text_entity in message.text_entities
+        ],
+    }
+    for name in RECORD_FIELDS:
+        value = getattr(message, name)
+        if value is not None:
+            record[RECORD_KEYS.get(name, name)] = value
+
+    return record
+
+
+def write_ndjson(file, header, messages):
+    """
+    Writes a chat into a file as newline-delimited JSON.
+
+    The first line holds the chat's header under the `"chat"` key, every further
+    line a message record.
+
+    Parameters
+    ----------
+    file : file object
+        The text file to write to.
+    header : dict
+        The name, type and ID of the chat.
+    messages : iterable of Message
+        The messages to write.
+
+    Returns
+    -------
+    int
+        The amount of written messages.
+
+    """
+    encode = _ENCODER.encode
+    file.write(encode({"chat": header}))
+    file.write("\n")
+
+    count = 0
+    for message in messages:
+        file.write(encode(message_to_record(message)))
+        file.write("\n")
+        count += 1
+
+    return count
+
+
+def read_ndjson(file):
+    """
+    Reads the header and the message lines of an NDJSON file.
+
+    The message lines are not decoded. Files without a header, like the parts of
+    a split file, are accepted as well.
+
+    Parameters
+    ----------
+    file : file object
+        The text file to read.
+
+    Returns
+    -------
+    tuple of (dict, List[str])
+        The header of the chat, empty if the file has none, and the message lines.
+
+    """
+    lines = [line for line in file if not line.isspace()]
+    header = {}
+    if lines:
+        record = json.loads(lines[0])
+        if "chat" in record:
+            header = record["chat"]
+            del lines[0]
+
+    return header, lines
+
+
+def iter_ndjson(file, factory):
+    """
+    Yields the messages of an NDJSON file one line at a time.
+
+    Parameters
+    ----------
+    file : file object
+        The text file to read.
+    factory : callable
+        The function creating a message from a raw record.
+
+    Yields
+    ------
+    Message
+        The next message.
+
+    """
+    for index, line in enumerate(file):
+        if line.isspace():
+            continue
+
+        record = json.loads(line)
+        if index == 0 and "chat" in record:
+            continue
+
+        yield factory(record)
+
+
+def load_line(factory, line):
+    """
+    Creates a message from a line of an NDJSON file.
+
+    Parameters
+    ----------
+    factory : callable
+        The function creating a message from a raw record.
+    line : str
+        The line holding the message record.
+
+    Returns
+    -------
+    Message
+        The message.
+
+    """
+    return factory(json.loads(line))
@@ -0,0 +1,161 @@
+__all__ = ("read_records_parallel",)
+
+import json
+import mmap
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from .reader import ResultReader, find_record_marker
+
+
+PARALLEL_MIN_SIZE = 16 << 20
+CHUNKS_PER_WORKER = 4
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+def split_records(path, chunk_count):
+    """
+    Splits the messages array of a `result.json` file into byte ranges starting at
+    record boundaries.
+
+    Files that are not indented can not be split, see `find_record_marker`.
+
+    Parameters
+    ----------
+    path : str
+        The path to the `result.json` file.
+    chunk_count : int
+        The amount of ranges to aim for.
+
+    Returns
+    -------
+    tuple of (dict, list of tuple of (int, int)) or None
+        The header fields and the ranges, the last one ending at the end of file,
+        or None if the file can not be split.
+
+    """
+    with open(path, "rb") as file:
+        reader = ResultReader(file)
+        header = reader.header
+        array_start = reader.position
+
+        size = os.fstat(file.fileno()).st_size
+        if size == 0:
+            return None
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            layout = find_record_marker(data, array_start)
+            if layout is None:
+                return None
+
+            first, marker = layout
+            starts = [first]
+            step = (size - first) // chunk_count
+
+            for chunk_index in range(1, chunk_count):
+                target = max(first + chunk_index * step, starts[-1] + 1)
+                position = data.find(marker, target)
+                if position == -1:
+                    break
+
+                if position > starts[-1]:
+                    starts.append(position)
+
+    ranges = [(start, end) for start, end in zip(starts, starts[1:])]
+    ranges.append((starts[-1], size))
+    return header, ranges
+
+
+def decode_chunk(path, start, end, factory):
+    """
+    Decodes the records of a byte range of the messages array.
+
+    Parameters
+    ----------
+    path : str
+        The path to the `result.json` file.
+    start : int
+        The offset of the first record of the range.
+    end : int
+        The offset the range ends at.
+    factory : callable
+        The function creating an object from a raw record.
+
+    Returns
+    -------
+    list
+        The created objects, in file order.
+
+    """
+    with open(path, "rb") as file:
+        file.seek(start)
+        text = file.read(end - start).decode("utf-8")
+
+    results = []
+    position = 0
+    length = len(text)
+
+    while True:
+        position = _WHITESPACE.match(text, position).end()
+        if position >= length or text[position] == "]":
+            break
+
+        data, position = _DECODER.raw_decode(text, position)
+        results.append(factory(data))
+
+        position = _WHITESPACE.match(text, position).end()
+        if position < length and text[position] == ",":
+            position += 1
+
+    return results
+
+
+def read_records_parallel(path, workers, factory):
+    """
+    Decodes the messages of a `result.json` file on a process pool.
+
+    The messages array is split into byte ranges at record boundaries, each range
+    is decoded and turned into objects by `factory` in a worker process, and the
+    results are reassembled in file order.
+
+    Parameters
+    ----------
+    path : str
+        The path to the `result.json` file.
+    workers : int
+        The amount of worker processes.
+    factory : callable
+        A picklable function creating an object from a raw record.
+
+    Returns
+    -------
+    tuple of (dict, list) or None
+        The header fields and the created objects, or None if the file is too
+        small to be worth splitting or can not be split, in which case it should
+        be read serially.
+
+    """
+    if workers < 2 or os.path.getsize(path) < PARALLEL_MIN_SIZE:
+        return None
+
+    split = split_records(path, workers * CHUNKS_PER_WORKER)
+    if split is None:
+        return None
+
+    header, ranges = split
+    results = []
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunk in executor.map(
+            decode_chunk,
+            [path] * len(ranges),
+            [start for start, _ in ranges],
+            [end for _, end in ranges],
+            [factory] * len(ranges),
+        ):
+            results.extend(chunk)
+
+    return header, results
@@ -0,0 +1,425 @@
+__all__ = ("ResultReader", "find_record_marker", "read_record_slices")
+
+import codecs
+import json
+import mmap
+import re
+
+
+CHUNK_SIZE = 1 << 20
+MESSAGES_KEY = "messages"
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+def find_record_marker(data, array_start):
+    """
+    Finds the bytes every message record of an indented `result.json` starts with.
+
+    Raw newlines can not appear inside json strings, so in an indented file a new
+    line holding only the indentation of the first record followed by `{` always
+    starts a record.
+
+    Parameters
+    ----------
+    data : bytes-like
+        The contents of the file, usually memory mapped.
+    array_start : int
+        The offset right after the opening bracket of the messages array.
+
+    Returns
+    -------
+    tuple of (int, bytes) or None
+        The offset of the first record and the marker, or None if the array is
+        empty or the file is not indented.
+
+    """
+    first = array_start
+    size = len(data)
+    while first < size and data[first] in b" \t\r\n":
+        first += 1
+
+    if first >= size or data[first] != ord("{"):
+        return None
+
+    line_start = data.rfind(b"\n", array_start, first)
+    if line_start == -1:
+        return None
+
+    return first, data[line_start:first] + b"{"
+
+
+def read_record_slices(path):
+    """
+    Reads the raw bytes of every message record of a `result.json` file without
+    keeping them decoded.
+
+    Indented files are split at the record markers found by `find_record_marker`
+    without decoding the records, as long as every record closes on its own line
+    at the indentation it opened with, and only there. Other files are walked with a
+    `ResultReader`.
+
+    Parameters
+    ----------
+    path : str
+        The path to the `result.json` file.
+
+    Returns
+    -------
+    tuple of (dict, List[bytes])
+        The header fields and the json text of each record, in file order.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a json object.
+
+    """
+    with open(path, "rb") as file:
+        reader = ResultReader(file)
+        array_start = reader.position
+        if not reader._in_messages:
+            return reader.header, []
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            layout = find_record_marker(data, array_start)
+            split = None if layout is None else split_at_markers(data, *layout)
+            if split is None:
+                records = [data[start:end] for start, end, _ in reader.iter_records()]
+                return reader.header, records
+
+    records, rest = split
+    header = reader.header
+    rest = rest[1:].lstrip()
+    if rest.startswith(","):
+        header.update(json.loads("{" + rest[1:]))
+
+    return header, records
+
+
+def split_at_markers(data, start, marker):
+    """
+    Splits the messages array of an indented `result.json` file into the json
+    text of its records at the record markers.
+
+    Parameters
+    ----------
+    data : bytes-like
+        The contents of the file, usually memory mapped.
+    start : int
+        The offset of the first record.
+    marker : bytes
+        The bytes every record starts with, see `find_record_marker`.
+
+    Returns
+    -------
+    tuple of (List[bytes], str) or None
+        The json text of each record and the text following the last one,
+        starting with the end of the array, or None if the records do not each
+        close on their own line, like when a line holds more than one record.
+
+    """
+    closing = marker[:-1] + b"}"
+    records = []
+    while True:
+        end = data.find(marker, start)
+        if end == -1:
+            break
+
+        # Nested values are indented deeper, so the closing line of the record
+        # is the only one at its indentation.
+        record = data[start:end].rstrip(b" \t\r\n,")
+        if record.find(closing) != len(record) - len(closing):
+            return None
+
+        records.append(record)
+        start = end + len(marker) - 1
+
+    # The last record is followed by the end of the array instead, and maybe by
+    # more header fields.
+    text = data[start:].decode("utf-8")
+    try:
+        _, end = _DECODER.raw_decode(text)
+    except ValueError:
+        return None
+
+    record = text[:end].encode("utf-8")
+    rest = text[end:].lstrip()
+    if record.find(closing) != len(record) - len(closing) or not rest.startswith("]"):
+        return None
+
+    records.append(record)
+    return records, rest
+
+
+def load_record(factory, data):
+    """
+    Creates an object from the json text of a record.
+
+    Parameters
+    ----------
+    factory : callable
+        The function creating an object from a raw record.
+    data : bytes
+        The json text of the record.
+
+    Returns
+    -------
+    object
+        The created object.
+
+    """
+    return factory(json.loads(data))
+
+
+class ResultReader:
+    """
+    A class incrementally tokenizing a `result.json` file.
+
+    Only the chunk around the record currently being decoded is kept in memory, so
+    the messages array can be walked with bounded memory no matter how big the
+    export is. Each record is decoded by the C json scanner, while the reader
+    keeps track of the byte offsets of the records in the file.
+
+    Attributes
+    ----------
+    file : file object
+        The file opened in binary mode.
+    chunk_size : int
+        The amount of bytes read from the file at once.
+    header : dict
+        The top-level fields of the chat, excluding the messages. Fields placed
+        after the messages array are only available after iterating it.
+
+    Methods
+    -------
+    __init__(file, chunk_size=CHUNK_SIZE)
+        Initializes a new instance of ResultReader.
+    position
+        Returns the byte offset of the next unread byte.
+    iter_records()
+        Yields the byte span and the decoded data of each message record.
+
+    """
+
+    __slots__ = (
+        "file",
+        "chunk_size",
+        "header",
+        "_buffer",
+        "_byte_position",
+        "_decoder",
+        "_eof",
+        "_in_messages",
+        "_is_ascii",
+        "_position",
+    )
+
+    def __init__(self, file, chunk_size=CHUNK_SIZE):
+        """
+        Initializes a new instance of the ResultReader class and reads the header.
+
+        Parameters
+        ----------
+        file : file object
+            The file opened in binary mode.
+        chunk_size : int, optional
+            The amount of bytes read from the file at once.
+
+        Raises
+        ------
+        ValueError
+            If the file is not a json object.
+
+        """
+        self.file = file
+        self.chunk_size = chunk_size
+        self.header = {}
+        self._buffer = ""
+        self._byte_position = file.tell()
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._eof = False
+        self._in_messages = False
+        self._is_ascii = True
+        self._position = 0
+
+        if self._read_char() != "{":
+            raise ValueError("Expected a json object")
+
+        self._read_members()
+
+    def __repr__(self):
+        """
+        Returns a string representation of the ResultReader instance.
+
+        Returns
+        -------
+        str
+            A string representation of the ResultReader instance.
+
+        """
+        return f"ResultReader(file={self.file!r}, position={self._byte_position})"
+
+    @property
+    def position(self):
+        """
+        Returns the byte offset of the next unread byte.
+
+        Returns
+        -------
+        int
+            The byte offset in the file.
+
+        """
+        return self._byte_position
+
+    def iter_records(self):
+        """
+        Yields the message records of the messages array.
+
+        Yields
+        ------
+        tuple of (int, int, dict)
+            The start offset, the end offset and the decoded data of the record.
+
+        Raises
+        ------
+        ValueError
+            If the data is not valid json.
+
+        """
+        if not self._in_messages:
+            return
+
+        if self._peek_char() == "]":
+            self._read_char()
+        else:
+            while True:
+                start = self._byte_position
+                data = self._decode_value()
+                yield start, self._byte_position, data
+
+                char = self._read_char()
+                if char == "]":
+                    break
+
+                if char != ",":
+                    raise ValueError(f"Unexpected {char!r} at {self._byte_position - 1}")
+
+        self._in_messages = False
+        self._read_members()
+
+    def _read_members(self):
+        """
+        Reads object members into the header until the messages array or the end
+        of the object is reached.
+        """
+        while True:
+            char = self._peek_char()
+            if char == "}":
+                self._read_char()
+                return
+
+            if char == ",":
+                self._read_char()
+                continue
+
+            key = self._decode_value()
+            if self._read_char() != ":":
+                raise ValueError(f"Expected ':' at {self._byte_position - 1}")
+
+            if key == MESSAGES_KEY:
+                if self._read_char() != "[":
+                    raise ValueError(f"Expected '[' at {self._byte_position - 1}")
+
+                self._in_messages = True
+                return
+
+            self.header[key] = self._decode_value()
+
+    def _fill(self):
+        """
+        Reads the next chunk into the buffer, dropping the consumed characters.
+
+        Returns
+        -------
+        bool
+            Whether anything was read.
+
+        """
+        if self._eof:
+            return False
+
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            self._eof = True
+            text = self._decoder.decode(b"", final=True)
+        else:
+            text = self._decoder.decode(chunk)
+
+        self._buffer = self._buffer[self._position :] + text
+        self._position = 0
+        self._is_ascii = self._buffer.isascii()
+        return True
+
+    def _advance(self, end):
+        """Moves the position to the given buffer index, counting the bytes."""
+        if self._is_ascii:
+            self._byte_position += end - self._position
+        else:
+            self._byte_position += len(
+                self._buffer[self._position : end].encode("utf-8")
+            )
+
+        self._position = end
+
+    def _skip_whitespace(self):
+        """Moves the position past any whitespace."""
+        while True:
+            end = _WHITESPACE.match(self._buffer, self._position).end()
+            self._advance(end)
+            if end < len(self._buffer) or not self._fill():
+                return
+
+    def _peek_char(self):
+        """Returns the next non-whitespace character without consuming it."""
+        self._skip_whitespace()
+        if self._position >= len(self._buffer):
+            raise ValueError("Unexpected end of data")
+
+        return self._buffer[self._position]
+
+    def _read_char(self):
+        """Returns the next non-whitespace character and consumes it."""
+        char = self._peek_char()
+        self._advance(self._position + 1)
+        return char
+
+    def _decode_value(self):
+        """
+        Decodes the next json value, reading more chunks while it is incomplete.
+
+        A value ending exactly at the end of the buffer might be a truncated
+        number, so it is only accepted once more data or the end of file follows.
+
+        Returns
+        -------
+        object
+            The decoded value.
+
+        """
+        self._skip_whitespace()
+
+        while True:
+            try:
+                data, end = _DECODER.raw_decode(self._buffer, self._position)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+            else:
+                if end < len(self._buffer) or not self._fill():
+                    break
+
+        self._advance(end)
+        return data
@@ -0,0 +1,549 @@
+__all__ = ("SearchIndex",)
+
+import marshal
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+
+
+SEARCH_FILE_SUFFIX = ".search"
+SEARCH_MAGIC = b"MRGLSRC\x02"
+SEARCH_HEADER = struct.Struct("<8sQQ")
+
+ENTITY_TOKEN_TYPES = frozenset(
+    (
+        "bot_command",
+        "cashtag",
+        "email",
+        "hashtag",
+        "link",
+        "mention",
+        "mention_name",
+        "phone",
+        "text_link",
+    )
+)
+
+_WORD = re.compile(r"\w+")
+_QUERY_PART = re.compile(r'"([^"]*)"|(\S+)')
+_ENTITY_LIKE = re.compile(r"^(?:[#@$/]\w|\w+://)")
+
+
+def tokenize_words(text):
+    """
+    Splits a text into lower case words.
+
+    Parameters
+    ----------
+    text : str
+        The text to split.
+
+    Returns
+    -------
+    List[str]
+        The words in order.
+
+    """
+    return _WORD.findall(text.lower())
+
+
+def tokenize_message(message):
+    """
+    Returns the tokens of a message.
+
+    Parameters
+    ----------
+    message : Message
+        The message to tokenize.
+
+    Returns
+    -------
+    tuple of (List[str], set of str)
+        The words of the message's text in order, and the whole texts of its
+        links, mentions, hashtags and similar entities, including the targets of
+        text links.
+
+    """
+    words = tokenize_words(message.plain_text)
+    entity_tokens = set()
+
+    # A text with entities other than plain ones is always a list.
+    if not isinstance(message.text, str):
+        for text_entity in message.text_entities:
+            if text_entity.type_ in ENTITY_TOKEN_TYPES:
+                entity_tokens.add(text_entity.text.lower())
+
+        for part in message.text:
+            if isinstance(part, dict) and "href" in part:
+                entity_tokens.add(part["href"].lower())
+
+    return words, entity_tokens
+
+
+def intersect(left, right):
+    """Returns the common IDs of two sorted ID lists."""
+    if len(left) > len(right):
+        left, right = right, left
+
+    right_ids = set(right)
+    return [id_ for id_ in left if id_ in right_ids]
+
+
+def get_chat_file_stat(chat_file_path):
+    """Returns the size and modification time of a `result.json` file, if any."""
+    if chat_file_path is None:
+        return None
+
+    try:
+        stat = os.stat(chat_file_path)
+    except FileNotFoundError:
+        return None
+
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+def load_index_table(data, chat_file_stat):
+    """
+    Decodes the header of a saved search index.
+
+    Parameters
+    ----------
+    data : bytes-like
+        The contents of the saved index.
+    chat_file_stat : tuple of (int, int) or None
+        The size and modification time the index has to be saved for, or None to
+        accept any.
+
+    Returns
+    -------
+    tuple of (int, dict, int) or None
+        The highest indexed message ID, the offsets and lengths of the tokens'
+        postings and where the postings start, or None if the index is invalid.
+
+    """
+    if len(data) < SEARCH_HEADER.size:
+        return None
+
+    magic, table_length, postings_length = SEARCH_HEADER.unpack_from(data)
+    if magic != SEARCH_MAGIC:
+        return None
+
+    # A truncated or partially written index is rebuilt.
+    start = SEARCH_HEADER.size + table_length
+    if start + postings_length != len(data):
+        return None
+
+    try:
+        saved_stat, last_id, table = marshal.loads(data[SEARCH_HEADER.size : start])
+    except (EOFError, ValueError, TypeError):
+        return None
+
+    if chat_file_stat is not None and saved_stat != chat_file_stat:
+        return None
+
+    return last_id, table, start
+
+
+class SearchIndex:
+    """
+    A class mapping the tokens of a chat's messages to the messages containing
+    them.
+
+    Every token has a postings array holding, for each message in ascending ID
+    order, the message's ID, the amount of occurrences and the word positions of
+    the occurrences. Entity tokens, like whole links and hashtags, have no
+    positions. A saved index is memory mapped and only the postings of the tokens
+    being searched are decoded, so query time depends on the matching messages
+    instead of on the size of the chat.
+
+    Attributes
+    ----------
+    last_id : int
+        The highest indexed message ID, or None if nothing was indexed.
+
+    Methods
+    -------
+    __init__()
+        Initializes a new, empty instance of SearchIndex.
+    __len__()
+        Returns the amount of indexed tokens.
+    get_index_path(path)
+        Returns the path the search index of a `result.json` file is saved at.
+    from_messages(messages)
+        Creates a new SearchIndex of the given messages.
+    load(path)
+        Loads a saved search index.
+    save(path)
+        Saves the search index.
+    add_messages(messages)
+        Indexes new or edited messages.
+    get_postings(token)
+        Returns the decoded postings of a token.
+    search(query)
+        Returns the IDs of the messages matching a query.
+
+    """
+
+    __slots__ = ("last_id", "_data", "_postings", "_removed_ids", "_table")
+
+    def __init__(self):
+        """
+        Initializes a new, empty instance of the SearchIndex class.
+        """
+        self.last_id = None
+        self._data = None
+        self._postings = {}
+        self._removed_ids = set()
+        self._table = {}
+
+    def __repr__(self):
+        """
+        Returns a string representation of the SearchIndex instance.
+
+        Returns
+        -------
+        str
+            A string representation of the SearchIndex instance.
+
+        """
+        return f"SearchIndex(tokens={len(self)}, last_id={self.last_id})"
+
+    def __len__(self):
+        """
+        Returns the amount of indexed tokens.
+
+        Returns
+        -------
+        int
+            The amount of indexed tokens.
+
+        """
+        return len(self._table.keys() | self._postings.keys())
+
+    @staticmethod
+    def get_index_path(path):
+        """
+        Returns the path the search index of a `result.json` file is saved at.
+
+        Parameters
+        ----------
+        path : str
+            The path to the `result.json` file.
+
+        Returns
+        -------
+        str
+            The path to the search index.
+
+        """
+        return path + SEARCH_FILE_SUFFIX
+
+    @classmethod
+    def from_messages(cls, messages):
+        """
+        Creates a new SearchIndex of the given messages.
+
+        Parameters
+        ----------
+        messages : iterable of Message
+            The messages to index.
+
+        Returns
+        -------
+        SearchIndex
+            A new SearchIndex instance.
+
+        """
+        index = cls()
+        index.add_messages(messages)
+        return index
+
+    @classmethod
+    def load(cls, path, chat_file_path=None):
+        """
+        Loads a saved search index.
+
+        Truncated or otherwise corrupt indexes are treated as missing, so they are
+        built and saved again.
+
+        Parameters
+        ----------
+        path : str
+            The path the index was saved at.
+        chat_file_path : str, optional
+            The path to the `result.json` file the index was built from. If given,
+            an index saved for another size or modification time of the file is
+            treated as missing.
+
+        Returns
+        -------
+        SearchIndex or None
+            The loaded index, or None if there is no valid index at the path.
+
+        """
+        try:
+            with open(path, "rb") as file:
+                data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            return None
+
+        loaded = load_index_table(data, get_chat_file_stat(chat_file_path))
+        if loaded is None:
+            data.close()
+            return None
+
+        index = cls()
+        index.last_id, index._table, start = loaded
+        index._data = (data, start)
+        return index
+
+    def save(self, path, chat_file_path=None):
+        """
+        Saves the search index.
+
+        Parameters
+        ----------
+        path : str
+            The path to save the index at.
+        chat_file_path : str, optional
+            The path to the `result.json` file the index was built from. Its size
+            and modification time are stored to be checked by `load`.
+
+        """
+        table = {}
+        blobs = []
+        offset = 0
+
+        for token in sorted(self._table.keys() | self._postings.keys()):
+            blob = self._get_postings_array(token)
+            if sys.byteorder != "little":
+                blob = array("q", blob)
+                blob.byteswap()
+
+            blob = blob.tobytes()
+            table[token] = (offset, len(blob))
+            blobs.append(blob)
+            offset += len(blob)
+
+        header = marshal.dumps(
+            (get_chat_file_stat(chat_file_path), self.last_id, table)
+        )
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+
+        with open(temporary_path, "wb") as file:
+            file.write(SEARCH_HEADER.pack(SEARCH_MAGIC, len(header), offset))
+            file.write(header)
+            for blob in blobs:
+                file.write(blob)
+
+        os.replace(temporary_path, path)
+
+    def add_messages(self, messages):
+        """
+        Indexes new or edited messages.
+
+        Messages newer than every indexed one are appended to the postings. An
+        already indexed ID replaces the old postings of that message, which
+        requires a pass over every posting.
+
+        Parameters
+        ----------
+        messages : iterable of Message
+            The messages to index.
+
+        """
+        appended = []
+        replaced = []
+        last_id = self.last_id
+
+        for message in messages:
+            if last_id is None or message.id_ > last_id:
+                appended.append(message)
+                last_id = message.id_
+            else:
+                replaced.append(message)
+
+        if replaced:
+            self._remove_ids({message.id_ for message in replaced})
+
+        for message in sorted(replaced, key=lambda message: message.id_):
+            self._add_message(message, True)
+
+        for message in appended:
+            self._add_message(message, False)
+
+        self.last_id = last_id
+
+    def get_postings(self, token):
+        """
+        Returns the decoded postings of a token.
+
+        Parameters
+        ----------
+        token : str
+            The token, as produced by the tokenizer.
+
+        Returns
+        -------
+        dict of (int, tuple of int)
+            The word positions of the token keyed by the IDs of the messages
+            containing it, in ascending ID order.
+
+        """
+        postings = self._get_postings_array(token)
+        result = {}
+        index = 0
+        length = len(postings)
+
+        while index < length:
+            count = postings[index + 1]
+            result[postings[index]] = tuple(postings[index + 2 : index + 2 + count])
+            index += 2 + count
+
+        return result
+
+    def search(self, query):
+        """
+        Returns the IDs of the messages matching a query.
+
+        Every word of the query must be present, while quoted parts must be present
+        as a phrase. Words starting like a hashtag, mention, command or link are
+        matched against whole entities.
+
+        Parameters
+        ----------
+        query : str
+            The query.
+
+        Returns
+        -------
+        List[int]
+            The IDs of the matching messages in ascending order.
+
+        """
+        tokens = []
+        phrases = []
+
+        for match in _QUERY_PART.finditer(query):
+            phrase, word = match.groups()
+            if phrase is not None:
+                words = tokenize_words(phrase)
+                tokens.extend(words)
+                if len(words) > 1:
+                    phrases.append(words)
+
+            elif _ENTITY_LIKE.match(word):
+                tokens.append(word.lower())
+
+            else:
+                tokens.extend(tokenize_words(word))
+
+        if not tokens:
+            return []
+
+        postings = {token: self.get_postings(token) for token in set(tokens)}
+        ids = None
+        for token_postings in sorted(postings.values(), key=len):
+            ids = list(token_postings) if ids is None else intersect(ids, token_postings)
+            if not ids:
+                return []
+
+        for words in phrases:
+            ids = [id_ for id_ in ids if self._contains_phrase(postings, words, id_)]
+
+        return sorted(ids)
+
+    def _contains_phrase(self, postings, words, id_):
+        """Returns whether the words follow each other in the given message."""
+        starts = set(postings[words[0]][id_])
+        for offset, word in enumerate(words[1:], 1):
+            starts &= {position - offset for position in postings[word][id_]}
+            if not starts:
+                return False
+
+        return True
+
+    def _get_postings_array(self, token):
+        """Returns the encoded postings of a token, loading them if needed."""
+        postings = self._postings.get(token)
+        if postings is not None:
+            return postings
+
+        postings = array("q")
+        location = self._table.get(token)
+        if location is not None:
+            data, start = self._data
+            offset, length = location
+            postings.frombytes(data[start + offset : start + offset + length])
+            if sys.byteorder != "little":
+                postings.byteswap()
+
+            if self._removed_ids:
+                postings = self._filter_postings(postings, self._removed_ids)
+
+        return postings
+
+    def _add_message(self, message, insert):
+        """Adds the postings of a message, keeping every postings array sorted."""
+        words, entity_tokens = tokenize_message(message)
+        occurrences = {}
+
+        for position, word in enumerate(words):
+            occurrences.setdefault(word, []).append(position)
+
+        for token in entity_tokens:
+            occurrences.setdefault(token, [])
+
+        all_postings = self._postings
+        id_ = message.id_
+
+        for token, positions in occurrences.items():
+            postings = all_postings.get(token)
+            if postings is None:
+                postings = self._get_postings_array(token)
+                all_postings[token] = postings
+
+            if insert:
+                entry = array("q", (id_, len(positions), *positions))
+                all_postings[token] = self._insert_entry(postings, entry)
+            else:
+                postings.append(id_)
+                postings.append(len(positions))
+                postings.extend(positions)
+
+    def _remove_ids(self, ids):
+        """Removes the postings of the given messages."""
+        for token in list(self._postings):
+            self._postings[token] = self._filter_postings(self._postings[token], ids)
+
+        self._removed_ids |= ids
+
+    @staticmethod
+    def _filter_postings(postings, ids):
+        """Returns the postings without the entries of the given messages."""
+        filtered = array("q")
+        index = 0
+        length = len(postings)
+
+        while index < length:
+            end = index + 2 + postings[index + 1]
+            if postings[index] not in ids:
+                filtered.extend(postings[index:end])
+
+            index = end
+
+        return filtered
+
+    @staticmethod
+    def _insert_entry(postings, entry):
+        """Returns the postings with an entry inserted at its ID's place."""
+        index = 0
+        length = len(postings)
+
+        while index < length and postings[index] < entry[0]:
+            index += 2 + postings[index + 1]
+
+        return postings[:index] + entry + postings[index:]
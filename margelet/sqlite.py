@@ -0,0 +1,410 @@
+__all__ = ("export_sqlite",)
+
+import os
+import sqlite3
+from itertools import islice
+
+from .entity import Backup
+
+
+SQLITE_BATCH_SIZE = 10000
+
+# New databases are loaded into a temporary file without journaling or syncing,
+# then synced once and moved into place when done, so a crash, even of the
+# system, only leaves the temporary file behind.
+BULK_LOAD_PRAGMAS = (
+    "PRAGMA journal_mode = MEMORY",
+    "PRAGMA synchronous = OFF",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -65536",
+)
+# Existing databases are appended to in place through the rollback journal, so a
+# crash during the transaction or the commit rolls the database back to its state
+# before the export.
+APPEND_PRAGMAS = (
+    "PRAGMA synchronous = FULL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -65536",
+)
+
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS chats (
+        id INTEGER PRIMARY KEY,
+        name TEXT,
+        type TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS senders (
+        id TEXT PRIMARY KEY,
+        name TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS messages (
+        chat_id INTEGER NOT NULL REFERENCES chats (id),
+        id INTEGER NOT NULL,
+        type TEXT,
+        date TEXT,
+        timestamp INTEGER,
+        edited TEXT,
+        edited_timestamp INTEGER,
+        from_id TEXT REFERENCES senders (id),
+        actor_id TEXT REFERENCES senders (id),
+        action TEXT,
+        reply_to_message_id INTEGER,
+        message_id INTEGER,
+        text TEXT,
+        duration_seconds INTEGER,
+        emoticon TEXT,
+        discard_reason TEXT,
+        media_type TEXT,
+        mime_type TEXT,
+        photo TEXT,
+        file TEXT,
+        thumbnail TEXT,
+        width INTEGER,
+        height INTEGER,
+        UNIQUE (chat_id, id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS text_entities (
+        chat_id INTEGER NOT NULL,
+        message_id INTEGER NOT NULL,
+        position INTEGER NOT NULL,
+        type TEXT,
+        text TEXT,
+        PRIMARY KEY (chat_id, message_id, position)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS files (
+        chat_id INTEGER NOT NULL,
+        directory TEXT NOT NULL,
+        name TEXT NOT NULL,
+        thumbnail_name TEXT,
+        size INTEGER,
+        mtime_ns INTEGER,
+        PRIMARY KEY (chat_id, directory, name)
+    ) WITHOUT ROWID
+    """,
+)
+
+INDEXES = {
+    "messages_timestamp": "messages (chat_id, timestamp)",
+    "messages_from_id": "messages (chat_id, from_id)",
+    "messages_reply_to": "messages (chat_id, reply_to_message_id)",
+}
+
+FULL_TEXT_SCHEMA = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5("
+    "text, content='messages', content_rowid='rowid')"
+)
+
+INSERT_MESSAGE = "INSERT INTO messages VALUES ({})".format(", ".join("?" * 23))
+INSERT_TEXT_ENTITY = "INSERT OR REPLACE INTO text_entities VALUES (?, ?, ?, ?, ?)"
+INSERT_SENDER = "INSERT OR REPLACE INTO senders VALUES (?, ?)"
+INSERT_FILE = "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)"
+INSERT_CHAT = "INSERT OR REPLACE INTO chats VALUES (?, ?, ?)"
+
+
+def get_message_row(chat_id, message):
+    """
+    Returns the row of a message in the `messages` table.
+
+    Parameters
+    ----------
+    chat_id : int
+        The ID of the chat of the message.
+    message : Message
+        The message.
+
+    Returns
+    -------
+    tuple
+        The values of the row.
+
+    """
+    return (
+        chat_id,
+        message.id_,
+        message.type_,
+        message.date,
+        message.timestamp,
+        message.edited,
+        message.edited_timestamp,
+        message.from_id,
+        message.actor_id,
+        message.action,
+        message.reply_to_message_id,
+        message.message_id,
+        message.plain_text,
+        message.duration_seconds,
+        message.emoticon,
+        message.discard_reason,
+        message.media_type,
+        message.mime_type,
+        message.photo,
+        message.file,
+        message.thumbnail,
+        message.width,
+        message.height,
+    )
+
+
+def insert_messages(cursor, chat_id, messages, batch_size):
+    """
+    Inserts the messages of a chat missing from the database in batches.
+
+    Parameters
+    ----------
+    cursor : sqlite3.Cursor
+        The cursor of the exporting connection.
+    chat_id : int
+        The ID of the chat.
+    messages : iterable of Message
+        The messages of the chat.
+    batch_size : int
+        The amount of messages to insert at once.
+
+    Returns
+    -------
+    int
+        The amount of inserted messages.
+
+    """
+    existing_ids = {
+        id_
+        for id_, in cursor.execute(
+            "SELECT id FROM messages WHERE chat_id = ?", (chat_id,)
+        )
+    }
+    new_messages = (message for message in messages if message.id_ not in existing_ids)
+
+    count = 0
+    while True:
+        batch = list(islice(new_messages, batch_size))
+        if not batch:
+            break
+
+        senders = {}
+        text_entity_rows = []
+        for message in batch:
+            if message.from_id is not None:
+                senders[message.from_id] = message.from_
+            if message.actor_id is not None:
+                senders[message.actor_id] = message.actor
+
+            for position, text_entity in enumerate(message.text_entities):
+                text_entity_rows.append(
+                    (
+                        chat_id,
+                        message.id_,
+                        position,
+                        text_entity.type_,
+                        text_entity.text,
+                    )
+                )
+
+        cursor.executemany(INSERT_SENDER, senders.items())
+        cursor.executemany(
+            INSERT_MESSAGE, [get_message_row(chat_id, message) for message in batch]
+        )
+        cursor.executemany(INSERT_TEXT_ENTITY, text_entity_rows)
+        count += len(batch)
+
+    return count
+
+
+def load_database(cursor, chat, media, batch_size, full_text):
+    """
+    Writes a chat and its media files into the database within a transaction.
+
+    Parameters
+    ----------
+    cursor : sqlite3.Cursor
+        The cursor of the exporting connection.
+    chat : Chat
+        The chat, or None if there is none.
+    media : List[tuple of (str, List[File])]
+        The media directories with their files.
+    batch_size : int
+        The amount of messages to insert at once.
+    full_text : bool
+        Whether to create the full-text index if the database has none.
+
+    Returns
+    -------
+    int
+        The amount of inserted messages.
+
+    Raises
+    ------
+    ValueError
+        If full-text indexing is requested, but SQLite was built without FTS5.
+
+    """
+    cursor.execute("BEGIN")
+    try:
+        for statement in SCHEMA:
+            cursor.execute(statement)
+
+        (last_rowid,) = cursor.execute(
+            "SELECT COALESCE(MAX(rowid), 0) FROM messages"
+        ).fetchone()
+
+        has_full_text = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'messages_fts'"
+        ).fetchone() is not None
+        if full_text and not has_full_text:
+            try:
+                cursor.execute(FULL_TEXT_SCHEMA)
+            except sqlite3.OperationalError as exception:
+                raise ValueError("SQLite was built without FTS5") from exception
+
+            # The messages already in the database are indexed as well.
+            has_full_text = True
+            last_rowid = 0
+
+        # Indexes are built after the load. Appends at most as large as the
+        # database update the existing indexes instead of rebuilding them.
+        (message_count,) = cursor.execute("SELECT COUNT(*) FROM messages").fetchone()
+        if chat is not None and len(chat.messages) > message_count:
+            for name in INDEXES:
+                cursor.execute(f"DROP INDEX IF EXISTS {name}")
+
+        count = 0
+        if chat is not None:
+            cursor.execute(INSERT_CHAT, (chat.id_, chat.name, chat.type_))
+            count = insert_messages(cursor, chat.id_, chat.messages, batch_size)
+
+            cursor.executemany(
+                INSERT_FILE,
+                (
+                    (
+                        chat.id_,
+                        directory,
+                        file.name,
+                        file.thumbnail_name,
+                        file.size,
+                        file.mtime_ns,
+                    )
+                    for directory, files in media
+                    for file in files
+                ),
+            )
+
+        for name, columns in INDEXES.items():
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {columns}")
+
+        if has_full_text:
+            cursor.execute(
+                "INSERT INTO messages_fts (rowid, text) "
+                "SELECT rowid, text FROM messages WHERE rowid > ?",
+                (last_rowid,),
+            )
+
+        cursor.execute("COMMIT")
+    except BaseException:
+        cursor.execute("ROLLBACK")
+        raise
+
+    return count
+
+
+def sync_path(path):
+    """
+    Flushes a file or a directory listing to the disk.
+
+    Parameters
+    ----------
+    path : str
+        The path to the file or directory.
+
+    """
+    # Files have to be writable to be synced on Windows.
+    file_descriptor = os.open(path, os.O_RDONLY if os.path.isdir(path) else os.O_RDWR)
+    try:
+        os.fsync(file_descriptor)
+    finally:
+        os.close(file_descriptor)
+
+
+def export_sqlite(source, path, batch_size=SQLITE_BATCH_SIZE, full_text=False):
+    """
+    Exports a backup or a chat into an SQLite database.
+
+    The messages are streamed into the database in large batches within a single
+    transaction. A new database is loaded into a temporary file without
+    journaling, with its indexes created after the messages, and synced to the
+    disk and moved into place when done.
+
+    Exporting into an existing database appends the messages whose IDs it does
+    not have yet, updating the chat, the senders and the files. It is written in
+    place through the rollback journal, so a failed export leaves it unchanged.
+    Appends larger than the database rebuild the indexes after the load, smaller
+    ones update them with every insert.
+
+    Parameters
+    ----------
+    source : Backup or Chat
+        The backup with its chat and media files, or just a chat.
+    path : str
+        The path to the database file, created if it does not exist.
+    batch_size : int, optional
+        The amount of messages to insert at once.
+    full_text : bool, optional
+        Whether to index the texts of the messages in the `messages_fts` FTS5
+        table. Once the table exists, new messages are always indexed.
+
+    Returns
+    -------
+    int
+        The amount of inserted messages.
+
+    Raises
+    ------
+    ValueError
+        If full-text indexing is requested, but SQLite was built without FTS5.
+
+    """
+    if isinstance(source, Backup):
+        chat = source.chat
+        media = [
+            (directory, getattr(source, directory)) for directory in Backup.DIRECTORIES
+        ]
+    else:
+        chat = source
+        media = []
+
+    if os.path.exists(path):
+        database_path = path
+        pragmas = APPEND_PRAGMAS
+    else:
+        database_path = f"{path}.{os.getpid()}.tmp"
+        pragmas = BULK_LOAD_PRAGMAS
+
+    try:
+        connection = sqlite3.connect(database_path, isolation_level=None)
+        try:
+            cursor = connection.cursor()
+            for pragma in pragmas:
+                cursor.execute(pragma)
+
+            count = load_database(cursor, chat, media, batch_size, full_text)
+        finally:
+            connection.close()
+
+        if database_path != path:
+            sync_path(database_path)
+            os.replace(database_path, path)
+            # Directories cannot be opened on Windows, where renames need no sync.
+            if os.name == "posix":
+                sync_path(os.path.dirname(os.path.abspath(path)))
+    finally:
+        if database_path != path and os.path.exists(database_path):
+            os.remove(database_path)
+
+    return count
@@ -0,0 +1,224 @@
+__all__ = ("SymbolTable",)
+
+
+MESSAGE_SYMBOL_FIELDS = (
+    "type_",
+    "from_",
+    "from_id",
+    "actor",
+    "actor_id",
+    "action",
+    "media_type",
+    "mime_type",
+)
+
+
+class SymbolTable:
+    """
+    A class sharing the repeated string values of the loaded messages.
+
+    Fields like the type, the sender and the media type of a message only have a
+    handful of distinct values, but the json decoder creates a new string for
+    every occurrence. Interning them keeps a single copy of each value, so equal
+    values can be compared by identity, and assigns every value a small integer
+    code in the order they were first seen.
+
+    Attributes
+    ----------
+    symbols : List[str]
+        The distinct values, indexed by their code.
+
+    Methods
+    -------
+    __init__()
+        Initializes a new, empty instance of SymbolTable.
+    __len__()
+        Returns the amount of distinct values.
+    __contains__(value)
+        Returns whether the value was interned.
+    intern(value)
+        Returns the shared copy of a value.
+    intern_message(message)
+        Replaces the repeated fields of a message with their shared copies.
+    intern_code(value)
+        Returns the code of a value, interning it if needed.
+    get_code(value)
+        Returns the code of a value.
+    get_symbol(code)
+        Returns the value of a code.
+
+    """
+
+    __slots__ = ("symbols", "_codes", "_strings")
+
+    def __init__(self):
+        """
+        Initializes a new, empty instance of the SymbolTable class.
+        """
+        self.symbols = []
+        self._codes = {}
+        self._strings = {None: None}
+
+    def __repr__(self):
+        """
+        Returns a string representation of the SymbolTable instance.
+
+        Returns
+        -------
+        str
+            A string representation of the SymbolTable instance.
+
+        """
+        return f"SymbolTable(symbols={len(self.symbols)})"
+
+    def __len__(self):
+        """
+        Returns the amount of distinct values.
+
+        Returns
+        -------
+        int
+            The amount of distinct values.
+
+        """
+        return len(self.symbols)
+
+    def __contains__(self, value):
+        """
+        Returns whether the value was interned.
+
+        Returns
+        -------
+        bool
+            Whether the value was interned.
+
+        """
+        return value in self._codes
+
+    def __reduce__(self):
+        """
+        Returns the arguments to recreate the SymbolTable instance when unpickling.
+
+        Returns
+        -------
+        tuple
+            The function recreating the table and its values.
+
+        """
+        return _rebuild_symbol_table, (self.symbols,)
+
+    def intern(self, value):
+        """
+        Returns the shared copy of a value.
+
+        Parameters
+        ----------
+        value : str
+            The value to intern. None is returned as is.
+
+        Returns
+        -------
+        str
+            The first interned value equal to the given one.
+
+        """
+        string = self._strings.get(value)
+        if string is None and value is not None:
+            self._codes[value] = len(self.symbols)
+            self.symbols.append(value)
+            self._strings[value] = value
+            string = value
+
+        return string
+
+    def intern_message(self, message):
+        """
+        Replaces the repeated fields of a message with their shared copies.
+
+        Messages decoded in another process are interned with that process's
+        table, this brings them back to this one.
+
+        Parameters
+        ----------
+        message : Message
+            The message to intern.
+
+        """
+        intern = self.intern
+        for name in MESSAGE_SYMBOL_FIELDS:
+            setattr(message, name, intern(getattr(message, name)))
+
+        text_entities = message.text_entities
+        if isinstance(text_entities, list):
+            for text_entity in text_entities:
+                text_entity.type_ = intern(text_entity.type_)
+        else:
+            # `TextEntityRuns` store codes of the table they were decoded with.
+            intern_types = getattr(text_entities, "intern_types", None)
+            if intern_types is not None:
+                intern_types(self)
+
+    def intern_code(self, value):
+        """
+        Returns the code of a value, interning it if needed.
+
+        Parameters
+        ----------
+        value : str
+            The value to intern.
+
+        Returns
+        -------
+        int
+            The code of the value.
+
+        """
+        code = self._codes.get(value)
+        if code is None:
+            self.intern(value)
+            code = self._codes[value]
+
+        return code
+
+    def get_code(self, value):
+        """
+        Returns the code of a value.
+
+        Parameters
+        ----------
+        value : str
+            The interned value.
+
+        Returns
+        -------
+        int
+            The code of the value, or -1 if it was not interned.
+
+        """
+        return self._codes.get(value, -1)
+
+    def get_symbol(self, code):
+        """
+        Returns the value of a code.
+
+        Parameters
+        ----------
+        code : int
+            The code of the value.
+
+        Returns
+        -------
+        str
+            The interned value.
+
+        """
+        return self.symbols[code]
+
+
+def _rebuild_symbol_table(symbols):
+    """Recreates a pickled symbol table, keeping the codes of its values."""
+    symbol_table = SymbolTable()
+    for value in symbols:
+        symbol_table.intern(value)
+
+    return symbol_table
@@ -0,0 +1,25 @@
+__all__ = ("flatten_text",)
+
+
+def flatten_text(text):
+    """
+    Flattens the text of a message into a single string.
+
+    Telegram stores formatted text as a list of plain strings and entity
+    dictionaries.
+
+    Parameters
+    ----------
+    text : str or list
+        The text of the message.
+
+    Returns
+    -------
+    str
+        The flattened text.
+
+    """
+    if isinstance(text, str):
+        return text
+
+    return "".join(part if isinstance(part, str) else part["text"] for part in text)
@@ -0,0 +1,255 @@
+__all__ = ("ReplyGraph",)
+
+from array import array
+
+from .lazy import LazyMessageList
+
+
+class ReplyGraph:
+    """
+    A class linking the messages of a chat to the messages they reply to.
+
+    The graph is built with a single pass over the messages, afterwards the
+    parent, the replies, the root and the depth of a message are dictionary
+    lookups, and a whole thread is collected in time proportional to its size.
+    Replies to messages missing from the chat keep their parent's ID, but start
+    their own thread.
+
+    Attributes
+    ----------
+    positions : dict of (int, int)
+        The positions of the messages in the chat keyed by their ID.
+    parents : dict of (int, int)
+        The IDs of the replied messages keyed by the IDs of the replies.
+    children : dict of (int, array)
+        The IDs of the direct replies in chat order keyed by the ID of the
+        replied message.
+    roots : dict of (int, int)
+        The IDs of the first messages of the threads keyed by the IDs of the
+        replies within them.
+    depths : dict of (int, int)
+        The amount of replies leading to a message keyed by its ID.
+
+    Methods
+    -------
+    __init__(positions, parents, children)
+        Initializes a new instance of ReplyGraph.
+    __len__()
+        Returns the amount of replies.
+    from_messages(messages)
+        Creates a new ReplyGraph of the given messages.
+    get_root(id_)
+        Returns the ID of the first message of a message's thread.
+    get_depth(id_)
+        Returns the amount of replies leading to a message.
+    get_thread(id_)
+        Returns the IDs of the messages in a message's thread.
+    select(messages, ids)
+        Returns the messages with the given IDs as a lazy sequence.
+
+    """
+
+    __slots__ = ("positions", "parents", "children", "roots", "depths")
+
+    def __init__(self, positions, parents, children):
+        """
+        Initializes a new instance of the ReplyGraph class.
+
+        Parameters
+        ----------
+        positions : dict of (int, int)
+            The positions of the messages in the chat keyed by their ID.
+        parents : dict of (int, int)
+            The IDs of the replied messages keyed by the IDs of the replies.
+        children : dict of (int, array)
+            The IDs of the direct replies keyed by the ID of the replied message.
+
+        """
+        self.positions = positions
+        self.parents = parents
+        self.children = children
+        self.roots = {}
+        self.depths = {}
+
+        for id_ in parents:
+            self._resolve(id_)
+
+    def __repr__(self):
+        """
+        Returns a string representation of the ReplyGraph instance.
+
+        Returns
+        -------
+        str
+            A string representation of the ReplyGraph instance.
+
+        """
+        return f"ReplyGraph(messages={len(self.positions)}, replies={len(self.parents)})"
+
+    def __len__(self):
+        """
+        Returns the amount of replies.
+
+        Returns
+        -------
+        int
+            The amount of replies.
+
+        """
+        return len(self.parents)
+
+    @classmethod
+    def from_messages(cls, messages):
+        """
+        Creates a new ReplyGraph of the given messages.
+
+        Parameters
+        ----------
+        messages : Sequence[Message]
+            The messages of the chat.
+
+        Returns
+        -------
+        ReplyGraph
+            A new ReplyGraph instance.
+
+        """
+        positions = {}
+        parents = {}
+        children = {}
+
+        for position, message in enumerate(messages):
+            id_ = message.id_
+            positions[id_] = position
+
+            parent_id = message.reply_to_message_id
+            if parent_id is None:
+                continue
+
+            parents[id_] = parent_id
+            replies = children.get(parent_id)
+            if replies is None:
+                children[parent_id] = array("q", (id_,))
+            else:
+                replies.append(id_)
+
+        return cls(positions, parents, children)
+
+    def get_root(self, id_):
+        """
+        Returns the ID of the first message of a message's thread.
+
+        Parameters
+        ----------
+        id_ : int
+            The ID of the message.
+
+        Returns
+        -------
+        int
+            The ID of the root message, the message's own ID if it is not a reply.
+
+        """
+        return self.roots.get(id_, id_)
+
+    def get_depth(self, id_):
+        """
+        Returns the amount of replies leading to a message.
+
+        Parameters
+        ----------
+        id_ : int
+            The ID of the message.
+
+        Returns
+        -------
+        int
+            The depth of the message, 0 for the root of a thread.
+
+        """
+        return self.depths.get(id_, 0)
+
+    def get_thread(self, id_):
+        """
+        Returns the IDs of the messages in a message's thread.
+
+        Parameters
+        ----------
+        id_ : int
+            The ID of any message of the thread.
+
+        Returns
+        -------
+        List[int]
+            The IDs of the root and all its direct and indirect replies in chat
+            order, or an empty list if the chat has no message with the given ID.
+
+        """
+        if id_ not in self.positions:
+            return []
+
+        ids = [self.get_root(id_)]
+        children = self.children
+        depths = self.depths
+        index = 0
+
+        while index < len(ids):
+            parent_id = ids[index]
+            replies = children.get(parent_id)
+            if replies is not None:
+                depth = depths.get(parent_id, 0) + 1
+                ids.extend(reply for reply in replies if depths[reply] == depth)
+
+            index += 1
+
+        ids.sort(key=self.positions.__getitem__)
+        return ids
+
+    def select(self, messages, ids):
+        """
+        Returns the messages with the given IDs as a lazy sequence.
+
+        Parameters
+        ----------
+        messages : Sequence[Message]
+            The messages the graph was built from.
+        ids : iterable of int
+            The IDs of the messages. IDs missing from the chat are skipped.
+
+        Returns
+        -------
+        Sequence[Message]
+            A `LazyMessageList` accessing the messages in the order of the IDs.
+
+        """
+        positions = self.positions
+        return LazyMessageList(
+            array("q", (positions[id_] for id_ in ids if id_ in positions)),
+            messages.__getitem__,
+        )
+
+    def _resolve(self, id_):
+        """Stores the root and the depth of a reply and of its unresolved parents."""
+        chain = []
+        seen = set()
+        roots = self.roots
+        parents = self.parents
+        positions = self.positions
+
+        while id_ not in roots:
+            parent_id = parents.get(id_)
+            if parent_id is None or parent_id not in positions or parent_id in seen:
+                roots[id_] = id_
+                self.depths[id_] = 0
+                break
+
+            chain.append(id_)
+            seen.add(id_)
+            id_ = parent_id
+
+        root = roots[id_]
+        depth = self.depths[id_]
+        for id_ in reversed(chain):
+            depth += 1
+            roots[id_] = root
+            self.depths[id_] = depth
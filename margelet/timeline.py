@@ -0,0 +1,352 @@
+__all__ = ("TimeIndex",)
+
+from array import array
+from bisect import bisect_left
+from calendar import timegm
+from datetime import datetime, time, timedelta, timezone
+
+from .lazy import LazyMessageList
+
+
+DAY_TIMESTAMP_CACHE_SIZE = 4096
+DAY_TIMESTAMPS = {}
+
+
+def get_day_timestamp(day):
+    """
+    Returns the UNIX timestamp of the start of a day.
+
+    Messages of a chat are dated within few distinct days, so the timestamps of
+    the recently seen days are kept.
+
+    Parameters
+    ----------
+    day : str
+        The day in `YYYY-MM-DD` format.
+
+    Returns
+    -------
+    int
+        The UNIX timestamp of the day's midnight in UTC.
+
+    Raises
+    ------
+    ValueError
+        If the day is malformed.
+
+    """
+    timestamp = DAY_TIMESTAMPS.get(day)
+    if timestamp is None:
+        if len(day) != 10 or day[4] != "-" or day[7] != "-":
+            raise ValueError(f"Malformed day: {day!r}")
+
+        timestamp = timegm(
+            datetime(int(day[:4]), int(day[5:7]), int(day[8:])).timetuple()
+        )
+        if len(DAY_TIMESTAMPS) >= DAY_TIMESTAMP_CACHE_SIZE:
+            DAY_TIMESTAMPS.clear()
+
+        DAY_TIMESTAMPS[day] = timestamp
+
+    return timestamp
+
+
+def parse_date(date, tzinfo=None):
+    """
+    Converts a message date to a UNIX timestamp.
+
+    Telegram writes the dates in the fixed `YYYY-MM-DDTHH:MM:SS` format, so it is
+    sliced directly instead of going through `datetime.strptime`.
+
+    Parameters
+    ----------
+    date : str
+        The date of the message. It has no time zone, Telegram writes it in the
+        local time of the exporting machine.
+    tzinfo : tzinfo, optional
+        The time zone of the date. Defaults to the local time zone of this
+        machine, which is the exporter's when the export was made here.
+
+    Returns
+    -------
+    int
+        The UNIX timestamp.
+
+    Raises
+    ------
+    ValueError
+        If the date is malformed.
+
+    """
+    if (
+        len(date) != 19
+        or date[4] != "-"
+        or date[7] != "-"
+        or date[10] != "T"
+        or date[13] != ":"
+        or date[16] != ":"
+    ):
+        raise ValueError(f"Malformed date: {date!r}")
+
+    hours = int(date[11:13])
+    minutes = int(date[14:16])
+    seconds = int(date[17:])
+    if hours > 23 or minutes > 59 or seconds > 59:
+        raise ValueError(f"Malformed date: {date!r}")
+
+    if isinstance(tzinfo, timezone):
+        # A fixed offset applies to the whole day, so the day's start is reused.
+        offset = int(tzinfo.utcoffset(None).total_seconds())
+        return (
+            get_day_timestamp(date[:10])
+            + hours * 3600
+            + minutes * 60
+            + seconds
+            - offset
+        )
+
+    # Other time zones may change their offset within a day.
+    return int(
+        datetime(
+            int(date[:4]),
+            int(date[5:7]),
+            int(date[8:10]),
+            hours,
+            minutes,
+            seconds,
+            tzinfo=tzinfo,
+        ).timestamp()
+    )
+
+
+def to_timestamp(unixtime, date):
+    """
+    Returns the UNIX timestamp of a message date.
+
+    Parameters
+    ----------
+    unixtime : int or str
+        The UNIX timestamp as exported, if any.
+    date : str
+        The date, parsed as local time if there is no timestamp, like in older
+        exports.
+
+    Returns
+    -------
+    int or None
+        The UNIX timestamp, or None if neither is given.
+
+    """
+    if unixtime is not None:
+        return int(unixtime)
+
+    if date is not None:
+        return parse_date(date)
+
+    return None
+
+
+def to_unixtime(value):
+    """
+    Converts a point in time to a UNIX timestamp.
+
+    Parameters
+    ----------
+    value : int, str or datetime
+        The UNIX timestamp, or the datetime to convert. Naive datetimes are
+        treated as UTC.
+
+    Returns
+    -------
+    int
+        The UNIX timestamp.
+
+    """
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+
+        return int(value.timestamp())
+
+    return int(value)
+
+
+class TimeIndex:
+    """
+    A class ordering the messages of a chat by their date.
+
+    Attributes
+    ----------
+    timestamps : array
+        The UNIX timestamps of the messages in ascending order.
+    positions : array
+        The positions of the messages in the chat in the order of `timestamps`,
+        or None if the chat is already ordered by date.
+
+    Methods
+    -------
+    __init__(timestamps, positions)
+        Initializes a new instance of TimeIndex.
+    __len__()
+        Returns the amount of indexed messages.
+    from_messages(messages)
+        Creates a new TimeIndex of the given messages.
+    find_range(start, end)
+        Returns the sorted positions of the messages within a time range.
+    select(messages, start, end)
+        Returns the messages within a time range as a lazy sequence.
+
+    """
+
+    __slots__ = ("timestamps", "positions")
+
+    def __init__(self, timestamps, positions):
+        """
+        Initializes a new instance of the TimeIndex class.
+
+        Parameters
+        ----------
+        timestamps : array
+            The UNIX timestamps of the messages in ascending order.
+        positions : array
+            The positions of the messages in the order of `timestamps`, or None if
+            they are already ordered.
+
+        """
+        self.timestamps = timestamps
+        self.positions = positions
+
+    def __repr__(self):
+        """
+        Returns a string representation of the TimeIndex instance.
+
+        Returns
+        -------
+        str
+            A string representation of the TimeIndex instance.
+
+        """
+        return f"TimeIndex(length={len(self.timestamps)}, sorted={self.positions is None})"
+
+    def __len__(self):
+        """
+        Returns the amount of indexed messages.
+
+        Returns
+        -------
+        int
+            The amount of indexed messages.
+
+        """
+        return len(self.timestamps)
+
+    @classmethod
+    def from_messages(cls, messages):
+        """
+        Creates a new TimeIndex of the given messages.
+
+        Messages without a date are not indexed.
+
+        Parameters
+        ----------
+        messages : Sequence[Message]
+            The messages of the chat.
+
+        Returns
+        -------
+        TimeIndex
+            A new TimeIndex instance.
+
+        """
+        timestamps = [message.timestamp for message in messages]
+
+        if None in timestamps:
+            order = [
+                index
+                for index, timestamp in enumerate(timestamps)
+                if timestamp is not None
+            ]
+        else:
+            is_sorted = all(
+                previous <= current
+                for previous, current in zip(timestamps, timestamps[1:])
+            )
+            if is_sorted:
+                return cls(array("q", timestamps), None)
+
+            order = range(len(timestamps))
+
+        order = sorted(order, key=timestamps.__getitem__)
+        return cls(array("q", (timestamps[index] for index in order)), array("q", order))
+
+    def find_range(self, start, end):
+        """
+        Returns the sorted positions of the messages within a time range.
+
+        Parameters
+        ----------
+        start : int
+            The inclusive start UNIX timestamp.
+        end : int
+            The exclusive end UNIX timestamp.
+
+        Returns
+        -------
+        tuple of (int, int)
+            The start and end positions in `timestamps`.
+
+        """
+        low = bisect_left(self.timestamps, start)
+        high = bisect_left(self.timestamps, end, low)
+        return low, high
+
+    def select(self, messages, start, end):
+        """
+        Returns the messages within a time range as a lazy sequence.
+
+        Parameters
+        ----------
+        messages : Sequence[Message]
+            The messages the index was built from.
+        start : int
+            The inclusive start UNIX timestamp.
+        end : int
+            The exclusive end UNIX timestamp.
+
+        Returns
+        -------
+        Sequence[Message]
+            A slice of the messages if they are ordered by date, otherwise a
+            `LazyMessageList` accessing them in date order.
+
+        """
+        low, high = self.find_range(start, end)
+
+        if self.positions is None:
+            return messages[low:high]
+
+        return LazyMessageList(self.positions[low:high], messages.__getitem__)
+
+
+def get_day_range(day, tzinfo=timezone.utc):
+    """
+    Returns the UNIX timestamps a day starts and ends at.
+
+    Parameters
+    ----------
+    day : date
+        The day.
+    tzinfo : tzinfo, optional
+        The time zone of the day. Defaults to UTC.
+
+    Returns
+    -------
+    tuple of (int, int)
+        The inclusive start and exclusive end UNIX timestamps.
+
+    """
+    if isinstance(day, datetime):
+        day = day.date()
+
+    start = datetime.combine(day, time(), tzinfo)
+    return int(start.timestamp()), int((start + timedelta(days=1)).timestamp())
@@ -0,0 +1,72 @@
+import json
+import os
+
+from margelet import Backup, Message
+
+
+def make_record(id_, **fields):
+    record = {
+        "id": id_,
+        "type": "message",
+        "date": "2023-02-27T10:00:00",
+        "date_unixtime": str(1677492000 + id_),
+        "from": "someone",
+        "from_id": "user1",
+        "text": f"message {id_}",
+        "text_entities": [{"type": "plain", "text": f"message {id_}"}],
+    }
+    if "from_" in fields:
+        fields["from"] = fields.pop("from_")
+
+    record.update(fields)
+    return record
+
+
+def make_message(id_, text="", **fields):
+    fields.setdefault("date_unixtime", str(1677492000 + id_))
+    fields.setdefault("from_", "someone")
+    fields.setdefault("from_id", "user1")
+    return Message(
+        id_=id_,
+        type_="message",
+        date="2023-02-27T10:00:00",
+        text=text,
+        text_entities=fields.pop("text_entities", None),
+        **fields,
+    )
+
+
+def make_chat_data(messages, **header):
+    return {
+        "name": "chat",
+        "type": "personal_chat",
+        "id": 1,
+        **header,
+        "messages": messages,
+    }
+
+
+def write_result(path, data, indent=1):
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file, ensure_ascii=False, indent=indent)
+
+    return path
+
+
+def make_backup_folder(folder_path, messages=None, contents=None, **header):
+    os.makedirs(folder_path, exist_ok=True)
+    for name in Backup.DIRECTORIES:
+        os.mkdir(os.path.join(folder_path, name))
+
+    if contents is not None:
+        for path, content in contents.items():
+            with open(os.path.join(folder_path, path), "wb") as file:
+                file.write(content)
+
+    if messages is not None:
+        write_result(
+            os.path.join(folder_path, Backup.CHAT_FILE_NAME),
+            make_chat_data(messages, **header),
+        )
+
+    return folder_path
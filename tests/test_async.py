@@ -0,0 +1,74 @@
+import asyncio
+import os
+import tempfile
+
+import vampytest
+from helpers import make_backup_folder, make_record
+from margelet import AsyncChatStream, Backup, Chat
+
+
+def test_aload():
+    with tempfile.TemporaryDirectory() as directory:
+        folder_path = os.path.join(directory, "ChatExport")
+        make_backup_folder(
+            folder_path,
+            [make_record(id_) for id_ in range(25)],
+            {"photos/photo.jpg": b""},
+            id=7,
+        )
+
+        backup = asyncio.run(Backup.aload(folder_path, batch_size=10))
+
+        vampytest.assert_eq(backup.chat.id_, 7)
+        vampytest.assert_eq(len(backup.chat.messages), 25)
+        vampytest.assert_eq(backup.chat.messages[24].text, "message 24")
+        vampytest.assert_eq([file.name for file in backup.photos], ["photo.jpg"])
+        vampytest.assert_is(backup.symbols, backup.chat.symbols)
+
+
+def test_aiter_messages():
+    async def collect(backup):
+        return [message.id_ async for message in backup.aiter_messages(batch_size=4)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        folder_path = os.path.join(directory, "ChatExport")
+        make_backup_folder(
+            folder_path,
+            [make_record(id_) for id_ in range(10)],
+            {"photos/photo.jpg": b""},
+            id=7,
+        )
+
+        backup = Backup.from_folder_path(folder_path)
+        vampytest.assert_eq(asyncio.run(collect(backup)), list(range(10)))
+
+
+def test_aiter_messages_cancel():
+    async def read_until_cancelled(stream):
+        async def consume():
+            async for _ in stream:
+                await asyncio.sleep(0)
+
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with vampytest.assert_raises(asyncio.CancelledError):
+            await task
+
+    with tempfile.TemporaryDirectory() as directory:
+        folder_path = os.path.join(directory, "ChatExport")
+        make_backup_folder(
+            folder_path,
+            [make_record(id_) for id_ in range(20000)],
+            {"photos/photo.jpg": b""},
+            id=7,
+        )
+
+        stream = Chat.aiter_messages(
+            os.path.join(folder_path, Backup.CHAT_FILE_NAME), batch_size=10
+        )
+        vampytest.assert_instance(stream, AsyncChatStream)
+        asyncio.run(read_until_cancelled(stream))
+
+        vampytest.assert_eq(stream.id_, 7)
+        vampytest.assert_true(stream._stream._file.closed)
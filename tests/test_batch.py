@@ -0,0 +1,60 @@
+import os
+import tempfile
+
+import vampytest
+from helpers import make_backup_folder, make_record
+from margelet import Backup, BackupLoadResult
+
+
+def test_from_folder_paths():
+    with tempfile.TemporaryDirectory() as directory:
+        folder_paths = [os.path.join(directory, f"ChatExport_{index}") for index in range(3)]
+        for index, folder_path in enumerate(folder_paths):
+            make_backup_folder(folder_path, [make_record(1, text="hello")], id=index)
+
+        missing_path = os.path.join(directory, "missing")
+
+        results = {
+            result.folder_path: result
+            for result in Backup.from_folder_paths([*folder_paths, missing_path], workers=2)
+        }
+
+    vampytest.assert_eq(len(results), 4)
+
+    for index, folder_path in enumerate(folder_paths):
+        result = results[folder_path]
+        vampytest.assert_instance(result, BackupLoadResult)
+        vampytest.assert_is(result.error, None)
+        vampytest.assert_eq(result.backup.chat.id_, index)
+        vampytest.assert_eq(result.backup.chat.messages.decoded_count(), 0)
+        vampytest.assert_eq(result.backup.chat.messages[0].text, "hello")
+
+    vampytest.assert_is(results[missing_path].backup, None)
+    vampytest.assert_instance(results[missing_path].error, FileNotFoundError)
+
+
+def test_from_folder_path_threads():
+    with tempfile.TemporaryDirectory() as directory:
+        folder_path = os.path.join(directory, "ChatExport")
+        make_backup_folder(folder_path, [make_record(1, text="hello")])
+        for name in Backup.DIRECTORIES:
+            for index in range(3):
+                open(os.path.join(folder_path, name, f"{name}_{index}"), "w").close()
+
+        sequential = Backup.from_folder_path(folder_path, threads=1)
+        concurrent = Backup.from_folder_path(folder_path, threads=4)
+
+        for name in Backup.DIRECTORIES:
+            vampytest.assert_eq(
+                [file.name for file in getattr(concurrent, name)],
+                [f"{name}_{index}" for index in range(3)],
+            )
+            vampytest.assert_eq(
+                [file.name for file in getattr(sequential, name)],
+                [file.name for file in getattr(concurrent, name)],
+            )
+
+        vampytest.assert_eq(concurrent.chat.messages[0].text, "hello")
+
+        with vampytest.assert_raises(FileNotFoundError):
+            Backup.scan_directories(os.path.join(directory, "missing"), threads=2)
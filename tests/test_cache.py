@@ -0,0 +1,102 @@
+import os
+import tempfile
+
+import vampytest
+from helpers import make_backup_folder, make_record
+from margelet import Backup, BackupCache, SymbolTable
+
+
+example_messages = [
+    make_record(
+        1,
+        photo="photos/photo_1.jpg",
+        width=10,
+        height=20,
+        text=["see ", {"type": "link", "text": "https://example.org"}],
+        text_entities=[
+            {"type": "plain", "text": "see "},
+            {"type": "link", "text": "https://example.org"},
+        ],
+    ),
+]
+example_contents = {"photos/photo_1.jpg": b"jpg"}
+
+
+def test_backup_cache_round_trip():
+    with tempfile.TemporaryDirectory() as directory:
+        folder_path = os.path.join(directory, "ChatExport_2023-02-27")
+        make_backup_folder(folder_path, example_messages, example_contents)
+
+        cache = BackupCache(os.path.join(directory, "cache"))
+        cold = Backup.from_folder_path(folder_path, cache=cache)
+        warm = Backup.from_folder_path(folder_path, cache=cache)
+
+        vampytest.assert_eq(cache.stats.misses, 1)
+        vampytest.assert_eq(cache.stats.stores, 1)
+        vampytest.assert_eq(cache.stats.hits, 1)
+
+        vampytest.assert_eq(warm.chat.name, "chat")
+        vampytest.assert_eq([file.name for file in warm.photos], ["photo_1.jpg"])
+
+        cold_message = cold.chat.messages[0]
+        warm_message = warm.chat.messages[0]
+        vampytest.assert_eq(warm_message.text, cold_message.text)
+        vampytest.assert_eq(warm_message.text_entities, cold_message.text_entities)
+        vampytest.assert_eq(warm_message.width, 10)
+
+        os.remove(os.path.join(folder_path, "photos", "photo_1.jpg"))
+        stale = Backup.from_folder_path(folder_path, cache=cache)
+        vampytest.assert_eq(cache.stats.stale, 1)
+        vampytest.assert_eq(stale.photos, [])
+
+
+def test_backup_cache_nested_files():
+    with tempfile.TemporaryDirectory() as directory:
+        make_backup_folder(directory, example_messages, example_contents)
+        os.mkdir(os.path.join(directory, "files", "nested"))
+
+        fingerprint = BackupCache.get_fingerprint(directory)
+        vampytest.assert_eq(BackupCache.get_fingerprint(directory), fingerprint)
+
+        path = os.path.join(directory, "files", "nested", "document.pdf")
+        with open(path, "wb") as file:
+            file.write(b"pdf")
+
+        nested_fingerprint = BackupCache.get_fingerprint(directory)
+        vampytest.assert_ne(nested_fingerprint, fingerprint)
+
+        with open(path, "wb") as file:
+            file.write(b"rewritten")
+
+        vampytest.assert_ne(BackupCache.get_fingerprint(directory), nested_fingerprint)
+
+
+def test_backup_cache_corrupt_snapshot():
+    with tempfile.TemporaryDirectory() as directory:
+        folder_path = os.path.join(directory, "ChatExport_2023-02-27")
+        make_backup_folder(folder_path, example_messages, example_contents)
+
+        cache = BackupCache(os.path.join(directory, "cache"))
+        Backup.from_folder_path(folder_path, cache=cache)
+        path = cache.get_cache_path(folder_path)
+
+        with open(path, "rb") as file:
+            data = file.read()
+
+        corruptions = (
+            data[: len(data) // 2],
+            data[:8] + b"cpython-2.7-0".ljust(24, b"\0") + data[32:],
+            data[:-1] + bytes([data[-1] ^ 0xFF]),
+        )
+        for corrupt_data in corruptions:
+            with open(path, "wb") as file:
+                file.write(corrupt_data)
+
+            misses = cache.stats.misses
+            backup = Backup.from_folder_path(folder_path, cache=cache)
+            vampytest.assert_eq(cache.stats.misses, misses + 1)
+            vampytest.assert_eq(backup.chat.messages[0].width, 10)
+
+        symbols = SymbolTable()
+        warm = Backup.from_folder_path(folder_path, cache=cache, symbols=symbols)
+        vampytest.assert_is(warm.symbols, symbols)
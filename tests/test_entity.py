@@ -1,5 +1,11 @@
+import os
+import pickle
+import tempfile
+from datetime import datetime, timezone
+
 import vampytest
-from margelet import TextEntity
+from helpers import make_record
+from margelet import File, Message, TextEntity, TextEntityRuns
 
 
 example_test_entity_type = "plain"
@@ -13,4 +19,135 @@ example_text_entity = {
 def test_text_entity():
     entity_init = TextEntity(example_test_entity_type, example_test_entity_text)
     entity_from_dict = TextEntity.from_dict(example_text_entity)
-    vampytest.assert_eq = (entity_init, entity_from_dict)
+    vampytest.assert_eq(entity_init, entity_from_dict)
+
+
+def test_message_plain_text_entities():
+    message = Message.from_dict(
+        make_record(0, text="hello", text_entities=[{"type": "plain", "text": "hello"}])
+    )
+    vampytest.assert_is(message._text_entities, None)
+    vampytest.assert_eq(message.text_entities, [TextEntity("plain", "hello")])
+    vampytest.assert_eq(message.plain_text, "hello")
+
+    message = Message.from_dict(make_record(0, text="", text_entities=[]))
+    vampytest.assert_eq(message.text_entities, [])
+
+
+def test_message_timestamps():
+    data = make_record(
+        0, text="hello", text_entities=[{"type": "plain", "text": "hello"}]
+    )
+    data["edited"] = "2023-02-27T10:05:00"
+    data["edited_unixtime"] = "1677492300"
+    message = Message.from_dict(data)
+
+    vampytest.assert_eq(message.timestamp, 1677492000)
+    vampytest.assert_eq(message.date_unixtime, "1677492000")
+    vampytest.assert_eq(
+        message.datetime, datetime(2023, 2, 27, 10, tzinfo=timezone.utc)
+    )
+    vampytest.assert_eq(message.edited_timestamp, 1677492300)
+    vampytest.assert_eq(message.edited_unixtime, "1677492300")
+    vampytest.assert_eq(
+        message.edited_datetime, datetime(2023, 2, 27, 10, 5, tzinfo=timezone.utc)
+    )
+
+    copy = pickle.loads(pickle.dumps(message))
+    vampytest.assert_eq(copy.timestamp, 1677492000)
+    vampytest.assert_eq(copy.edited_timestamp, 1677492300)
+
+    # Older exports have no timestamps, the dates are parsed instead.
+    del data["date_unixtime"], data["edited_unixtime"]
+    message = Message.from_dict(data)
+    vampytest.assert_eq(
+        message.timestamp, int(datetime(2023, 2, 27, 10).timestamp())
+    )
+    vampytest.assert_eq(
+        message.edited_timestamp, int(datetime(2023, 2, 27, 10, 5).timestamp())
+    )
+
+    message = Message.from_dict(make_record(0, text="", text_entities=[]))
+    vampytest.assert_is(message.edited_timestamp, None)
+    vampytest.assert_is(message.edited_unixtime, None)
+    vampytest.assert_is(message.edited_datetime, None)
+
+    message = Message(1, "message", None, None, "", None)
+    vampytest.assert_is(message.timestamp, None)
+    vampytest.assert_is(message.date_unixtime, None)
+
+
+def test_message_text_entity_runs():
+    text = ["see ", {"type": "link", "text": "example.org"}, " now"]
+    message = Message.from_dict(
+        make_record(
+            0,
+            text=text,
+            text_entities=[
+                {"type": "plain", "text": "see "},
+                {"type": "link", "text": "example.org"},
+                {"type": "plain", "text": " now"},
+            ],
+        )
+    )
+
+    text_entities = message.text_entities
+    vampytest.assert_instance(text_entities, TextEntityRuns)
+    vampytest.assert_eq(len(text_entities), 3)
+    vampytest.assert_eq(text_entities[1], TextEntity("link", "example.org"))
+    vampytest.assert_eq(text_entities[-1], TextEntity("plain", " now"))
+    vampytest.assert_eq(
+        text_entities,
+        [
+            TextEntity("plain", "see "),
+            TextEntity("link", "example.org"),
+            TextEntity("plain", " now"),
+        ],
+    )
+    vampytest.assert_eq(message.plain_text, "see example.org now")
+    vampytest.assert_is(message.plain_text, text_entities.text)
+
+    unpickled = pickle.loads(pickle.dumps(message))
+    vampytest.assert_eq(unpickled.text_entities, text_entities)
+
+
+def test_message_text_entities_not_matching_text():
+    message = Message.from_dict(
+        make_record(0, text="hello", text_entities=[{"type": "bold", "text": "bye"}])
+    )
+    vampytest.assert_eq(message.text_entities, [TextEntity("bold", "bye")])
+
+
+def test_file_from_folder():
+    with tempfile.TemporaryDirectory() as directory:
+        os.mkdir(os.path.join(directory, "nested"))
+        for name, content in (
+            ("video.mp4", b"video"),
+            ("video.mp4_thumb.jpg", b"thumb"),
+            ("lonely_thumb.jpg", b"thumb"),
+            ("nested/document.pdf", b"document"),
+            ("nested/document.pdf_thumb.jpg", b"thumb"),
+        ):
+            with open(os.path.join(directory, name), "wb") as file:
+                file.write(content)
+
+        files = File.from_folder(directory)
+        by_name = {file.name: file for file in files}
+
+        vampytest.assert_eq(
+            sorted(by_name), ["lonely_thumb.jpg", "nested/document.pdf", "video.mp4"]
+        )
+        vampytest.assert_eq(by_name["video.mp4"].thumbnail_name, "video.mp4_thumb.jpg")
+        vampytest.assert_eq(
+            by_name["nested/document.pdf"].thumbnail_name,
+            "nested/document.pdf_thumb.jpg",
+        )
+        vampytest.assert_is(by_name["lonely_thumb.jpg"].thumbnail_name, None)
+        vampytest.assert_eq(by_name["nested/document.pdf"].size, 8)
+        vampytest.assert_eq(
+            by_name["video.mp4"].mtime_ns,
+            os.stat(os.path.join(directory, "video.mp4")).st_mtime_ns,
+        )
+
+        with vampytest.assert_raises(FileNotFoundError):
+            File.from_folder(os.path.join(directory, "missing"))
@@ -0,0 +1,84 @@
+import json
+import os
+import tempfile
+
+import vampytest
+from margelet import Chat, ChatFrame, TextEntity
+
+
+example_chat = {
+    "name": "chat",
+    "type": "private_group",
+    "id": 123,
+    "messages": [
+        {
+            "id": 1,
+            "type": "service",
+            "date": "2023-02-27T10:00:00",
+            "date_unixtime": "1677492000",
+            "actor": "someone",
+            "actor_id": "user1",
+            "action": "phone_call",
+            "duration_seconds": 12,
+            "text": "",
+            "text_entities": [],
+        },
+        {
+            "id": 2,
+            "type": "message",
+            "date": "2023-02-27T10:01:00",
+            "date_unixtime": "1677492060",
+            "edited": "2023-02-27T10:02:00",
+            "edited_unixtime": "1677492120",
+            "from": "sömeone",
+            "from_id": "user1",
+            "reply_to_message_id": 1,
+            "photo": "photos/photo_1.jpg",
+            "width": 10,
+            "height": 20,
+            "text": ["sée ", {"type": "link", "text": "https://example.org"}],
+            "text_entities": [
+                {"type": "plain", "text": "sée "},
+                {"type": "link", "text": "https://example.org"},
+            ],
+        },
+    ],
+}
+
+
+def test_chat_frame_from_chat():
+    frame = ChatFrame.from_chat(Chat.from_dict(example_chat))
+
+    vampytest.assert_eq(len(frame), 2)
+    vampytest.assert_eq(list(frame.columns["id_"]), [1, 2])
+    vampytest.assert_eq(list(frame.columns["reply_to_message_id"]), [-1, 1])
+    vampytest.assert_eq(frame.categories["from_id"], [None, "user1"])
+    vampytest.assert_eq(frame.get_text(1), "sée https://example.org")
+
+    message = frame[1]
+    vampytest.assert_eq(message.id_, 2)
+    vampytest.assert_eq(message.from_, "sömeone")
+    vampytest.assert_eq(message.edited_unixtime, "1677492120")
+    vampytest.assert_eq(message.photo, "photos/photo_1.jpg")
+    vampytest.assert_eq(
+        message.text_entities,
+        [TextEntity("plain", "sée "), TextEntity("link", "https://example.org")],
+    )
+
+    service = frame[0]
+    vampytest.assert_eq(service.action, "phone_call")
+    vampytest.assert_eq(service.duration_seconds, 12)
+    vampytest.assert_is(service.reply_to_message_id, None)
+
+
+def test_chat_frame_from_file():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "result.json")
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(example_chat, file, ensure_ascii=False)
+
+        frame = ChatFrame.from_file(path)
+
+    vampytest.assert_eq(frame.name, "chat")
+    vampytest.assert_eq([message.id_ for message in frame], [1, 2])
+    vampytest.assert_eq(frame[-1].width, 10)
@@ -0,0 +1,89 @@
+import hashlib
+import os
+import tempfile
+
+import vampytest
+from helpers import make_backup_folder
+from margelet import Backup, HashCache, find_duplicates, hash_file
+
+
+def test_hash_file():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "file")
+        content = os.urandom(10000)
+        with open(path, "wb") as file:
+            file.write(content)
+
+        vampytest.assert_eq(
+            hash_file(path, chunk_size=4096), hashlib.sha256(content).hexdigest()
+        )
+
+
+def test_find_duplicates():
+    with tempfile.TemporaryDirectory() as directory:
+        make_backup_folder(
+            os.path.join(directory, "first"),
+            contents={
+                "photos/a.jpg": b"same",
+                "files/b.pdf": b"other",
+                "files/c.pdf": b"same",
+            },
+        )
+        make_backup_folder(
+            os.path.join(directory, "second"),
+            contents={"photos/a.jpg": b"same", "video_files/d.mp4": b"unique"},
+        )
+        first = Backup.from_folder_path(os.path.join(directory, "first"))
+        second = Backup.from_folder_path(os.path.join(directory, "second"))
+
+        cache_path = os.path.join(directory, "cache", "media.hashes")
+        cache = HashCache(cache_path)
+        groups = find_duplicates([first, second], workers=2, cache=cache)
+
+        vampytest.assert_eq(len(groups), 1)
+        vampytest.assert_eq(
+            sorted((backup is second, path) for backup, path in groups[0]),
+            [(False, "files/c.pdf"), (False, "photos/a.jpg"), (True, "photos/a.jpg")],
+        )
+        vampytest.assert_eq(cache.stats.misses, 5)
+        vampytest.assert_eq(cache.stats.stores, 1)
+
+        cache = HashCache(cache_path)
+        vampytest.assert_eq(len(cache), 5)
+        groups = find_duplicates([first, second], cache=cache)
+
+        vampytest.assert_eq(len(groups), 1)
+        vampytest.assert_eq(cache.stats.hits, 5)
+        vampytest.assert_eq(cache.stats.misses, 0)
+        vampytest.assert_eq(cache.stats.stores, 0)
+
+        with open(os.path.join(directory, "second", "video_files", "d.mp4"), "wb") as file:
+            file.write(b"same, but longer")
+
+        find_duplicates([first, second], cache=cache)
+        vampytest.assert_eq(cache.stats.misses, 1)
+
+
+def test_find_duplicates_thumbnails_and_removed_files():
+    with tempfile.TemporaryDirectory() as directory:
+        folder_path = make_backup_folder(
+            os.path.join(directory, "backup"),
+            contents={
+                "photos/a.jpg": b"photo",
+                "photos/a.jpg_thumb.jpg": b"thumb",
+                "photos/b.jpg_thumb.jpg": b"thumb",
+                "files/c.pdf": b"removed",
+            },
+        )
+        backup = Backup.from_folder_path(folder_path)
+        os.remove(os.path.join(folder_path, "files", "c.pdf"))
+
+        cache = HashCache(os.path.join(directory, "media.hashes"))
+        groups = find_duplicates([backup], workers=2, cache=cache)
+
+        vampytest.assert_eq(
+            [sorted(path for _, path in group) for group in groups],
+            [["photos/a.jpg_thumb.jpg", "photos/b.jpg_thumb.jpg"]],
+        )
+        vampytest.assert_eq(cache.stats.misses, 3)
+        vampytest.assert_eq(cache.stats.stores, 1)
@@ -0,0 +1,61 @@
+import json
+import os
+import tempfile
+
+import vampytest
+from helpers import make_chat_data, make_record, write_result
+from margelet import Chat, Checkpoint, MessageIndex, read_delta
+
+
+def check_delta(indent, indexed):
+    with tempfile.TemporaryDirectory() as directory:
+        old_path = os.path.join(directory, "old.json")
+        new_path = os.path.join(directory, "new.json")
+
+        old_messages = [make_record(id_) for id_ in range(100)]
+        write_result(old_path, make_chat_data(old_messages), indent)
+        checkpoint = Checkpoint.from_messages(Chat.from_file(old_path).messages, 5)
+        checkpoint = Checkpoint.from_dict(json.loads(json.dumps(checkpoint.to_dict())))
+
+        new_messages = [make_record(id_) for id_ in range(120) if id_ != 97]
+        new_messages[96] = make_record(96, edited_unixtime="1677500000")
+        write_result(new_path, make_chat_data(new_messages), indent)
+        if indexed:
+            MessageIndex.for_file(new_path)
+
+        delta = read_delta(new_path, checkpoint, 5)
+
+    vampytest.assert_eq([message.id_ for message in delta.new_messages], list(range(100, 120)))
+    vampytest.assert_eq([message.id_ for message in delta.edited_messages], [96])
+    vampytest.assert_eq(delta.deleted_ids, [97])
+    vampytest.assert_eq(delta.checkpoint.last_id, 119)
+    vampytest.assert_eq(sorted(delta.checkpoint.tail), list(range(115, 120)))
+
+
+def test_read_delta_bisecting_file():
+    check_delta(1, False)
+
+
+def test_read_delta_through_index():
+    check_delta(None, True)
+
+
+def test_read_delta_scanning_file():
+    check_delta(None, False)
+
+
+def test_read_delta_rewritten_export():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "result.json")
+        write_result(path, make_chat_data([make_record(id_) for id_ in range(10)]))
+        checkpoint = Checkpoint.from_messages(Chat.from_file(path).messages, 0)
+
+        write_result(path, make_chat_data([make_record(id_) for id_ in range(12)]))
+        delta = read_delta(path, checkpoint, 0)
+        vampytest.assert_eq([message.id_ for message in delta.new_messages], [10, 11])
+
+        rewritten = [make_record(id_) for id_ in range(12)]
+        rewritten[9]["date_unixtime"] = "1600000000"
+        write_result(path, make_chat_data(rewritten))
+        with vampytest.assert_raises(ValueError):
+            read_delta(path, checkpoint)
@@ -0,0 +1,77 @@
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import vampytest
+from helpers import make_chat_data, make_record, write_result
+from margelet import Chat, MessageIndex
+
+
+def test_get_message_through_index():
+    with tempfile.TemporaryDirectory() as directory:
+        # Non-ASCII text shifts the byte offsets away from the character offsets.
+        messages = [
+            make_record(10, from_="sömeone"),
+            make_record(20, from_="sömeone", reply_to_message_id=10),
+        ]
+        path = os.path.join(directory, "result.json")
+        write_result(path, make_chat_data(messages))
+
+        chat = Chat.open(path)
+        vampytest.assert_true(os.path.isfile(MessageIndex.get_index_path(path)))
+        vampytest.assert_eq(chat.name, "chat")
+        vampytest.assert_eq(len(chat.messages), 2)
+        vampytest.assert_eq(chat.messages.decoded_count(), 0)
+
+        message = chat.get_message(20)
+        vampytest.assert_eq(message.from_, "sömeone")
+        vampytest.assert_eq(chat.get_message(message.reply_to_message_id).id_, 10)
+        vampytest.assert_is(chat.get_message(30), None)
+        chat.index.close()
+
+
+def test_index_invalidated_on_change():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "result.json")
+        write_result(path, make_chat_data([make_record(10)]))
+        MessageIndex.for_file(path)
+        vampytest.assert_is_not(MessageIndex.load(path), None)
+
+        write_result(path, make_chat_data([make_record(10), make_record(11)]))
+        vampytest.assert_is(MessageIndex.load(path), None)
+
+        index = MessageIndex.for_file(path)
+        vampytest.assert_eq(list(index.ids), [10, 11])
+        vampytest.assert_eq(index.read_record(index.find(11))["id"], 11)
+        index.close()
+
+
+def test_index_truncated():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "result.json")
+        write_result(path, make_chat_data([make_record(10), make_record(11)]))
+        index_path = MessageIndex.get_index_path(path)
+        MessageIndex.for_file(path)
+
+        with open(index_path, "rb") as file:
+            data = file.read()
+
+        with open(index_path, "wb") as file:
+            file.write(data[:-8])
+
+        vampytest.assert_is(MessageIndex.load(path), None)
+        vampytest.assert_eq(list(MessageIndex.for_file(path).ids), [10, 11])
+        vampytest.assert_is_not(MessageIndex.load(path), None)
+
+
+def test_index_read_record_threads():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "result.json")
+        write_result(path, make_chat_data([make_record(id_) for id_ in range(100)]))
+        index = MessageIndex.for_file(path)
+
+        with ThreadPoolExecutor(4) as executor:
+            records = list(executor.map(index.read_record, range(100)))
+
+        vampytest.assert_eq([record["id"] for record in records], list(range(100)))
+        index.close()
@@ -0,0 +1,55 @@
+import vampytest
+from helpers import make_record
+from margelet import Chat, LazyMessageList, Message
+
+
+example_chat = {
+    "name": "chat",
+    "type": "personal_chat",
+    "id": 123,
+    "messages": [make_record(id_) for id_ in range(10)],
+}
+
+
+def test_lazy_message_list_len_and_slice():
+    chat = Chat.from_dict(example_chat)
+    messages = chat.messages
+
+    vampytest.assert_instance(messages, LazyMessageList)
+    vampytest.assert_eq(len(messages), 10)
+
+    recent = messages[-3:]
+    vampytest.assert_instance(recent, LazyMessageList)
+    vampytest.assert_eq(len(recent), 3)
+    vampytest.assert_eq(messages.decoded_count(), 0)
+    vampytest.assert_eq(recent.decoded_count(), 0)
+
+
+def test_lazy_message_list_decodes_once():
+    messages = Chat.from_dict(example_chat).messages
+
+    message = messages[4]
+    vampytest.assert_instance(message, Message)
+    vampytest.assert_eq(message.id_, 4)
+    vampytest.assert_is(messages[4], message)
+    vampytest.assert_is(messages[4:6][0], message)
+    vampytest.assert_eq(messages.decoded_count(), 1)
+
+    vampytest.assert_eq([message.id_ for message in messages], list(range(10)))
+    vampytest.assert_eq(messages.decoded_count(), 10)
+
+
+def test_lazy_message_list_slice_is_view():
+    messages = Chat.from_dict(example_chat).messages
+
+    recent = messages[-4:]
+    message = recent[1]
+    vampytest.assert_eq(message.id_, 7)
+    vampytest.assert_is(messages[7], message)
+    vampytest.assert_eq(messages.decoded_count(), 1)
+
+    every_other = recent[::-2]
+    vampytest.assert_eq([message.id_ for message in every_other], [9, 7])
+    vampytest.assert_eq(recent.decoded_count(), 2)
+    vampytest.assert_eq(messages.decoded_count(), 2)
+    vampytest.assert_eq(messages[:5].decoded_count(), 0)
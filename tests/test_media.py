@@ -0,0 +1,53 @@
+import vampytest
+from helpers import make_message
+from margelet import Backup, Chat, File, MediaIndex
+
+
+def make_backup():
+    messages = [
+        make_message(1, photo="photos/photo_1.jpg"),
+        make_message(
+            2, file="video_files/video.mp4", thumbnail="video_files/video.mp4_thumb.jpg"
+        ),
+        make_message(3, file="files/missing.pdf"),
+        make_message(
+            4, file="(File not included. Change data exporting settings to download.)"
+        ),
+        make_message(5),
+    ]
+    return Backup(
+        files=[File("unused.pdf")],
+        photos=[File("photo_1.jpg")],
+        video_files=[File("video.mp4", "video.mp4_thumb.jpg")],
+        voice_messages=[],
+        chat=Chat("chat", "personal_chat", 1, messages),
+    )
+
+
+def test_media_for():
+    backup = make_backup()
+    messages = backup.chat.messages
+
+    vampytest.assert_is(backup.media_for(messages[0]), backup.photos[0])
+    vampytest.assert_is(backup.media_for(messages[1]), backup.video_files[0])
+    vampytest.assert_is(backup.media_for(messages[2]), None)
+    vampytest.assert_is(backup.media_for(messages[3]), None)
+    vampytest.assert_is(backup.media_for(messages[4]), None)
+
+    media_index = backup.media_index
+    vampytest.assert_instance(media_index, MediaIndex)
+    vampytest.assert_eq(len(media_index), 3)
+    vampytest.assert_is(
+        media_index.get("video_files/video.mp4_thumb.jpg"), backup.video_files[0]
+    )
+
+
+def test_check_media():
+    backup = make_backup()
+    report = backup.check_media()
+
+    vampytest.assert_eq(report.dangling, [(3, "files/missing.pdf")])
+    vampytest.assert_eq(
+        [(path, file.name) for path, file in report.orphans],
+        [("files/unused.pdf", "unused.pdf")],
+    )
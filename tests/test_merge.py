@@ -0,0 +1,86 @@
+import vampytest
+from helpers import make_chat_data, make_message, make_record
+from margelet import Chat, merge_messages
+
+
+def test_merge_messages():
+    old_export = Chat(
+        "chat",
+        "personal_chat",
+        1,
+        [
+            make_message(1, date_unixtime="100"),
+            make_message(2, "old", date_unixtime="110"),
+            make_message(3, date_unixtime="120"),
+        ],
+    )
+    new_export = iter(
+        [
+            make_message(2, "edited", date_unixtime="110", edited_unixtime="130"),
+            make_message(3, date_unixtime="120"),
+            make_message(4, date_unixtime="120"),
+            make_message(5, date_unixtime="140"),
+        ]
+    )
+    other_export = [
+        make_message(1, "other", date_unixtime="100"),
+        make_message(6, date_unixtime="150"),
+    ]
+
+    merged = list(merge_messages([old_export, new_export, other_export]))
+
+    vampytest.assert_eq([message.id_ for message in merged], [1, 2, 3, 4, 5, 6])
+    vampytest.assert_eq(merged[0].text, "other")
+    vampytest.assert_eq(merged[1].text, "edited")
+
+
+def test_merge_messages_same_date():
+    # The second export lists the messages of the same date in another order.
+    first_export = [
+        make_message(1, date_unixtime="100"),
+        make_message(2, "old", date_unixtime="100"),
+    ]
+    second_export = [
+        make_message(2, "edited", date_unixtime="100", edited_unixtime="110"),
+        make_message(1, date_unixtime="100"),
+    ]
+
+    merged = list(merge_messages([first_export, second_export]))
+
+    vampytest.assert_eq(sorted(message.id_ for message in merged), [1, 2])
+    vampytest.assert_eq(
+        [message.text for message in merged if message.id_ == 2], ["edited"]
+    )
+
+    unsorted_export = [
+        make_message(1, date_unixtime="100"),
+        make_message(2, date_unixtime="90"),
+    ]
+    with vampytest.assert_raises(ValueError):
+        list(merge_messages([unsorted_export]))
+
+
+def test_merge_messages_without_date():
+    first_export = Chat.from_dict(
+        make_chat_data(
+            [
+                make_record(1, date=None, date_unixtime=None),
+                make_record(2, date_unixtime="100"),
+            ]
+        )
+    )
+    second_export = Chat.from_dict(
+        make_chat_data(
+            [
+                make_record(1, date=None, date_unixtime=None, text="edited"),
+                make_record(3, date=None, date_unixtime=None),
+                make_record(4, date_unixtime="110"),
+            ]
+        )
+    )
+
+    merged = list(merge_messages([first_export, second_export]))
+
+    vampytest.assert_eq(sorted(message.id_ for message in merged[:2]), [1, 3])
+    vampytest.assert_eq([message.id_ for message in merged[2:]], [2, 4])
+    vampytest.assert_eq(merged[0].text, "edited")
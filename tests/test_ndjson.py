@@ -0,0 +1,112 @@
+import gzip
+import os
+import tempfile
+
+import vampytest
+from margelet import Backup, Chat, LazyMessageList, Message, TextEntity
+
+
+example_chat = {
+    "name": "chat",
+    "type": "personal_chat",
+    "id": 123,
+    "messages": [
+        {
+            "id": 1,
+            "type": "message",
+            "date": "2023-02-27T10:00:00",
+            "date_unixtime": "1677492000",
+            "from": "alice",
+            "from_id": "user1",
+            "text": "hello",
+            "text_entities": [{"type": "plain", "text": "hello"}],
+        },
+        {
+            "id": 2,
+            "type": "message",
+            "date": "2023-02-27T10:01:00",
+            "date_unixtime": "1677492060",
+            "edited": "2023-02-27T10:02:00",
+            "edited_unixtime": "1677492120",
+            "from": "bob",
+            "from_id": "user2",
+            "reply_to_message_id": 1,
+            "text": ["see ", {"type": "link", "text": "example.org"}],
+            "text_entities": [
+                {"type": "plain", "text": "see "},
+                {"type": "link", "text": "example.org"},
+            ],
+        },
+    ],
+}
+
+
+def test_ndjson_round_trip():
+    chat = Chat.from_dict(example_chat)
+
+    with tempfile.TemporaryDirectory() as directory:
+        for file_name in ("chat.ndjson", "chat.ndjson.gz"):
+            path = os.path.join(directory, file_name)
+            vampytest.assert_eq(chat.to_ndjson(path), 2)
+
+            copy = Chat.from_ndjson(path)
+            vampytest.assert_eq(
+                (copy.name, copy.type_, copy.id_), ("chat", "personal_chat", 123)
+            )
+            vampytest.assert_instance(copy.messages, LazyMessageList)
+            vampytest.assert_eq(copy.messages.decoded_count(), 0)
+
+            message = copy.messages[1]
+            vampytest.assert_eq(message.id_, 2)
+            vampytest.assert_eq(message.from_, "bob")
+            vampytest.assert_eq(message.reply_to_message_id, 1)
+            vampytest.assert_eq(message.edited_timestamp, 1677492120)
+            vampytest.assert_eq(message.plain_text, "see example.org")
+            vampytest.assert_eq(
+                list(message.text_entities),
+                [TextEntity("plain", "see "), TextEntity("link", "example.org")],
+            )
+
+            vampytest.assert_eq(
+                [message.id_ for message in Chat.iter_ndjson(path)], [1, 2]
+            )
+
+        with gzip.open(os.path.join(directory, "chat.ndjson.gz"), "rt") as file:
+            vampytest.assert_eq(len(file.read().splitlines()), 3)
+
+
+def test_ndjson_parts():
+    chat = Chat.from_dict(example_chat)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "chat.ndjson")
+        Backup([], [], [], [], chat).to_ndjson(path)
+
+        with open(path) as file:
+            lines = file.readlines()
+
+        # A part split off the file has no header line.
+        part_path = os.path.join(directory, "part.ndjson")
+        with open(part_path, "w") as file:
+            file.writelines(lines[2:])
+
+        part = Chat.from_ndjson(part_path)
+        vampytest.assert_is(part.id_, None)
+        vampytest.assert_eq([message.id_ for message in part.messages], [2])
+
+        with vampytest.assert_raises(ValueError):
+            Backup([], [], [], [], None).to_ndjson(path)
+
+
+def test_ndjson_message_without_date():
+    chat = Chat(
+        "chat", "personal_chat", 1, [Message(1, "message", None, None, "x", None)]
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "chat.ndjson")
+        chat.to_ndjson(path)
+
+        message = Chat.from_ndjson(path).messages[0]
+        vampytest.assert_is(message.timestamp, None)
+        vampytest.assert_eq(message.plain_text, "x")
@@ -0,0 +1,49 @@
+import os
+import pickle
+import tempfile
+
+import vampytest
+from helpers import make_chat_data, make_record, write_result
+from margelet import Message, TextEntity
+from margelet.parallel import decode_chunk, split_records
+
+
+# Text holding braces and escaped newlines must not be taken for record starts.
+example_records = [
+    make_record(
+        id_,
+        from_="sömeone",
+        text=["{\\n ", {"type": "bold", "text": f"message {id_}"}],
+        text_entities=[
+            {"type": "plain", "text": "{\\n "},
+            {"type": "bold", "text": f"message {id_}"},
+        ],
+    )
+    for id_ in range(50)
+]
+
+
+def test_split_and_decode_chunks():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "result.json")
+        write_result(path, make_chat_data(example_records))
+
+        header, ranges = split_records(path, 7)
+        vampytest.assert_eq(header, {"name": "chat", "type": "personal_chat", "id": 1})
+        vampytest.assert_eq(len(ranges), 7)
+
+        messages = []
+        for start, end in ranges:
+            messages.extend(decode_chunk(path, start, end, Message.from_dict))
+
+    vampytest.assert_eq([message.id_ for message in messages], list(range(50)))
+    vampytest.assert_eq(messages[3].text_entities[1], TextEntity("bold", "message 3"))
+
+
+def test_message_pickle_round_trip():
+    message = Message.from_dict(example_records[1])
+    unpickled = pickle.loads(pickle.dumps(message))
+
+    vampytest.assert_eq(unpickled.id_, 1)
+    vampytest.assert_eq(unpickled.from_, "sömeone")
+    vampytest.assert_eq(unpickled.text_entities, message.text_entities)
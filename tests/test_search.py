@@ -0,0 +1,84 @@
+import os
+import tempfile
+
+import vampytest
+from helpers import make_message
+from margelet import Chat, SearchIndex, TextEntity
+
+
+example_messages = [
+    make_message(1, "The quick brown fox"),
+    make_message(2, "brown quick dogs"),
+    make_message(
+        3,
+        ["see ", {"type": "hashtag", "text": "#Python"}, " quick"],
+        text_entities=[
+            TextEntity("plain", "see "),
+            TextEntity("hashtag", "#Python"),
+            TextEntity("plain", " quick"),
+        ],
+    ),
+]
+
+
+def test_chat_search():
+    chat = Chat("chat", "personal_chat", 1, example_messages)
+
+    vampytest.assert_eq(chat.search("quick"), [1, 2, 3])
+    vampytest.assert_eq(chat.search("QUICK brown"), [1, 2])
+    vampytest.assert_eq(chat.search('"quick brown"'), [1])
+    vampytest.assert_eq(chat.search("#python"), [3])
+    vampytest.assert_eq(chat.search("python quick"), [3])
+    vampytest.assert_eq(chat.search("missing"), [])
+
+
+def test_search_index_save_and_update():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "result.json.search")
+        SearchIndex.from_messages(example_messages[:2]).save(path)
+
+        index = SearchIndex.load(path)
+        vampytest.assert_eq(index.last_id, 2)
+        vampytest.assert_eq(index.search("brown"), [1, 2])
+
+        index.add_messages([make_message(1, "slow red fox"), example_messages[2]])
+        vampytest.assert_eq(index.last_id, 3)
+        vampytest.assert_eq(index.search("brown"), [2])
+        vampytest.assert_eq(index.search("fox"), [1])
+        vampytest.assert_eq(index.search("quick"), [2, 3])
+
+        index.save(path)
+        reloaded = SearchIndex.load(path)
+
+    vampytest.assert_eq(reloaded.search("red fox"), [1])
+    vampytest.assert_eq(reloaded.search("brown"), [2])
+    vampytest.assert_eq(reloaded.get_postings("quick"), {2: (1,), 3: (2,)})
+
+
+def test_search_index_load_invalid():
+    with tempfile.TemporaryDirectory() as directory:
+        chat_file_path = os.path.join(directory, "result.json")
+        with open(chat_file_path, "w") as file:
+            file.write("{}")
+
+        path = SearchIndex.get_index_path(chat_file_path)
+        SearchIndex.from_messages(example_messages).save(path, chat_file_path)
+        vampytest.assert_eq(SearchIndex.load(path, chat_file_path).last_id, 3)
+
+        with open(path, "rb") as file:
+            data = file.read()
+
+        for corrupt in (data[:-1], data[:30] + b"\0" * (len(data) - 30)):
+            with open(path, "wb") as file:
+                file.write(corrupt)
+
+            vampytest.assert_is(SearchIndex.load(path, chat_file_path), None)
+
+        with open(path, "wb") as file:
+            file.write(data)
+
+        with open(chat_file_path, "w") as file:
+            file.write('{"messages": []}')
+
+        vampytest.assert_is(SearchIndex.load(path, chat_file_path), None)
+        vampytest.assert_eq(SearchIndex.load(path).last_id, 3)
@@ -0,0 +1,134 @@
+import os
+import sqlite3
+import tempfile
+
+import vampytest
+from helpers import make_message
+from margelet import Backup, Chat, File, export_sqlite
+
+
+def make_backup(messages):
+    return Backup(
+        files=[],
+        photos=[File("photo_1.jpg", "photo_1.jpg_thumb.jpg", 10, 20)],
+        video_files=[],
+        voice_messages=[],
+        chat=Chat("chat", "personal_chat", 123, messages),
+    )
+
+
+def test_export_sqlite():
+    messages = [
+        make_message(1, "hello world"),
+        make_message(2, "hi there", reply_to_message_id=1),
+        make_message(3, ""),
+    ]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "backup.db")
+        vampytest.assert_eq(export_sqlite(make_backup(messages), path, batch_size=2), 3)
+
+        connection = sqlite3.connect(path)
+        try:
+            vampytest.assert_eq(
+                connection.execute(
+                    "SELECT id, timestamp, text, reply_to_message_id FROM messages"
+                ).fetchall(),
+                [
+                    (1, 1677492001, "hello world", None),
+                    (2, 1677492002, "hi there", 1),
+                    (3, 1677492003, "", None),
+                ],
+            )
+            vampytest.assert_eq(
+                connection.execute("SELECT * FROM text_entities").fetchall(),
+                [(123, 1, 0, "plain", "hello world"), (123, 2, 0, "plain", "hi there")],
+            )
+            vampytest.assert_eq(
+                connection.execute("SELECT * FROM senders").fetchall(),
+                [("user1", "someone")],
+            )
+            vampytest.assert_eq(
+                connection.execute("SELECT * FROM files").fetchall(),
+                [(123, "photos", "photo_1.jpg", "photo_1.jpg_thumb.jpg", 10, 20)],
+            )
+            indexes = {
+                name
+                for name, in connection.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'index'"
+                )
+            }
+            vampytest.assert_in("messages_timestamp", indexes)
+            vampytest.assert_in("messages_reply_to", indexes)
+            vampytest.assert_eq(
+                [
+                    row[2]
+                    for row in connection.execute(
+                        "PRAGMA index_info(messages_timestamp)"
+                    )
+                ],
+                ["chat_id", "timestamp"],
+            )
+        finally:
+            connection.close()
+
+
+def test_export_sqlite_append():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "chat.db")
+        chat = Chat("chat", "personal_chat", 123, [make_message(1, "hello world")])
+        vampytest.assert_eq(export_sqlite(chat, path), 1)
+
+        chat = Chat(
+            "chat",
+            "personal_chat",
+            123,
+            [make_message(1, "hello world"), make_message(2, "goodbye world")],
+        )
+        vampytest.assert_eq(export_sqlite(chat, path, full_text=True), 1)
+        vampytest.assert_eq(export_sqlite(chat, path), 0)
+
+        connection = sqlite3.connect(path)
+        try:
+            vampytest.assert_eq(
+                connection.execute("SELECT COUNT(*) FROM messages").fetchone(), (2,)
+            )
+            vampytest.assert_eq(
+                connection.execute(
+                    "SELECT rowid FROM messages_fts WHERE messages_fts MATCH 'world' "
+                    "ORDER BY rowid"
+                ).fetchall(),
+                [(1,), (2,)],
+            )
+        finally:
+            connection.close()
+
+
+class FailingMessages(list):
+    def __iter__(self):
+        yield from list.__iter__(self)
+        raise RuntimeError("export interrupted")
+
+
+def test_export_sqlite_failure():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "chat.db")
+        messages = FailingMessages([make_message(1, "hello"), make_message(2, "bye")])
+
+        with vampytest.assert_raises(RuntimeError):
+            export_sqlite(Chat("chat", "personal_chat", 123, messages), path)
+
+        vampytest.assert_eq(os.listdir(directory), [])
+
+        export_sqlite(Chat("chat", "personal_chat", 123, [make_message(1, "hi")]), path)
+        with vampytest.assert_raises(RuntimeError):
+            export_sqlite(Chat("chat", "personal_chat", 123, messages), path)
+
+        connection = sqlite3.connect(path)
+        try:
+            vampytest.assert_eq(
+                connection.execute("SELECT id, text FROM messages").fetchall(),
+                [(1, "hi")],
+            )
+        finally:
+            connection.close()
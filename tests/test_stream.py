@@ -0,0 +1,143 @@
+import json
+import os
+import tempfile
+
+import vampytest
+from helpers import write_result
+from margelet import (
+    Chat, ChatStream, LazyMessageList, Message, read_record_slices
+)
+from margelet.reader import ResultReader
+
+
+example_messages = [
+    {
+        "id": 1,
+        "type": "service",
+        "date": "2023-02-27T10:00:00",
+        "date_unixtime": "1677492000",
+        "actor": "Önë",
+        "actor_id": "user1",
+        "action": "phone_call",
+        "duration_seconds": 12,
+        "text": "",
+        "text_entities": [],
+    },
+    {
+        "id": 2,
+        "type": "message",
+        "date": "2023-02-27T10:01:00",
+        "date_unixtime": "1677492060",
+        "from": "Two \"quoted\" ]}",
+        "from_id": "user2",
+        "reply_to_message_id": 1,
+        "text": ["hi ", {"type": "bold", "text": "\\there{"}],
+        "text_entities": [
+            {"type": "plain", "text": "hi "},
+            {"type": "bold", "text": "\\there{"},
+        ],
+    },
+]
+example_chat = {"name": "chat", "type": "personal_chat", "id": 123}
+
+
+def test_iter_messages():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "result.json")
+        write_result(path, {**example_chat, "messages": example_messages})
+
+        with Chat.iter_messages(path) as stream:
+            vampytest.assert_instance(stream, ChatStream)
+            vampytest.assert_eq(stream.name, "chat")
+            vampytest.assert_eq(stream.type_, "personal_chat")
+            vampytest.assert_eq(stream.id_, 123)
+            messages = list(stream)
+
+    vampytest.assert_eq(len(messages), 2)
+    vampytest.assert_instance(messages[0], Message)
+    vampytest.assert_eq(messages[0].actor, "Önë")
+    vampytest.assert_eq(messages[1].from_, "Two \"quoted\" ]}")
+    vampytest.assert_eq(messages[1].reply_to_message_id, 1)
+    vampytest.assert_eq(messages[1].text_entities[1].text, "\\there{")
+
+
+def test_reader_spans_small_chunks():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "result.json")
+        write_result(
+            path, {"name": "chat", "messages": example_messages, "id": 5}, None
+        )
+
+        with open(path, "rb") as file:
+            data = file.read()
+            file.seek(0)
+            reader = ResultReader(file, chunk_size=7)
+            vampytest.assert_eq(reader.header, {"name": "chat"})
+
+            records = list(reader.iter_records())
+
+        vampytest.assert_eq(reader.header, {"name": "chat", "id": 5})
+        vampytest.assert_eq([record for _, _, record in records], example_messages)
+
+        for start, end, record in records:
+            vampytest.assert_eq(json.loads(data[start:end]), record)
+
+
+def test_reader_empty_messages():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "result.json")
+        write_result(path, {**example_chat, "messages": []})
+
+        chat = Chat.from_file(path)
+
+    vampytest.assert_eq(chat.messages, [])
+    vampytest.assert_eq(chat.id_, 123)
+
+
+def test_from_file_keeps_record_text():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "result.json")
+        for indent in (1, None):
+            write_result(
+                path, {"name": "chat", "messages": example_messages, "id": 5}, indent
+            )
+
+            header, records = read_record_slices(path)
+            vampytest.assert_eq(header, {"name": "chat", "id": 5})
+            vampytest.assert_eq(
+                [json.loads(record) for record in records], example_messages
+            )
+
+            chat = Chat.from_file(path)
+            vampytest.assert_eq(chat.id_, 5)
+            vampytest.assert_instance(chat.messages, LazyMessageList)
+            vampytest.assert_eq(chat.messages.decoded_count(), 0)
+            vampytest.assert_eq(chat.messages[1].from_, "Two \"quoted\" ]}")
+
+        write_result(path, {"name": "chat", "messages": []})
+        vampytest.assert_eq(read_record_slices(path), ({"name": "chat"}, []))
+
+
+def test_from_file_records_sharing_lines():
+    records = [{**example_messages[1], "id": id_} for id_ in range(1, 4)]
+    text = json.dumps({**example_chat, "messages": records}, indent=1)
+    layouts = (
+        # The second record opens on the line closing the first one.
+        text.replace("\n  },\n  {", "\n  }, {", 1),
+        # All records on one line within the indented array.
+        text.replace(
+            json.dumps(records, indent=1)[1:-1].replace("\n", "\n "),
+            "\n  " + ", ".join(json.dumps(record) for record in records),
+        ),
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "result.json")
+        for layout in layouts:
+            vampytest.assert_ne(layout, text)
+            with open(path, "w") as file:
+                file.write(layout)
+
+            chat = Chat.from_file(path)
+            vampytest.assert_eq([message.id_ for message in chat.messages], [1, 2, 3])
+            vampytest.assert_eq(chat.id_, 123)
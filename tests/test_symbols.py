@@ -0,0 +1,114 @@
+import json
+import os
+import pickle
+import tempfile
+
+import vampytest
+from helpers import make_backup_folder, make_record
+from margelet import Backup, Chat, Message, SymbolTable, TextEntity, TextEntityRuns
+
+
+example_chat = {
+    "name": "chat",
+    "type": "personal_chat",
+    "id": 123,
+    "messages": [
+        make_record(id_, from_=sender, from_id="user" + sender)
+        for id_, sender in zip(range(10), ["alice", "bob"] * 5)
+    ],
+}
+
+
+def test_symbol_table():
+    symbols = SymbolTable()
+    first = "".join(["al", "ice"])
+    second = "".join(["ali", "ce"])
+
+    vampytest.assert_is(symbols.intern(first), first)
+    vampytest.assert_is(symbols.intern(second), first)
+    vampytest.assert_is(symbols.intern(None), None)
+    vampytest.assert_eq(symbols.intern("bob"), "bob")
+
+    vampytest.assert_eq(len(symbols), 2)
+    vampytest.assert_in("alice", symbols)
+    vampytest.assert_eq(symbols.get_code("alice"), 0)
+    vampytest.assert_eq(symbols.get_code("bob"), 1)
+    vampytest.assert_eq(symbols.get_code("carol"), -1)
+    vampytest.assert_eq(symbols.get_symbol(1), "bob")
+
+    copy = pickle.loads(pickle.dumps(symbols))
+    vampytest.assert_eq(copy.symbols, ["alice", "bob"])
+    vampytest.assert_eq(copy.get_code("bob"), 1)
+
+
+def test_chat_from_dict_interns():
+    chat = Chat.from_dict(json.loads(json.dumps(example_chat)))
+    messages = list(chat.messages)
+
+    vampytest.assert_is(messages[0].from_, messages[2].from_)
+    vampytest.assert_is(messages[0].type_, messages[1].type_)
+    vampytest.assert_is(
+        messages[0].text_entities[0].type_, messages[1].text_entities[0].type_
+    )
+    vampytest.assert_eq(
+        chat.symbols.get_code(messages[1].from_),
+        chat.symbols.get_code(messages[3].from_),
+    )
+    vampytest.assert_in("useralice", chat.symbols)
+
+
+def test_chat_from_file_interns():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "result.json")
+        with open(path, "w") as file:
+            json.dump(example_chat, file, indent=1)
+
+        symbols = SymbolTable()
+        first = Chat.from_file(path, symbols=symbols)
+        second = Chat.open(path, symbols=symbols)
+
+        vampytest.assert_is(first.symbols, symbols)
+        vampytest.assert_is(first.messages[4].from_, second.messages[8].from_)
+        vampytest.assert_is(first.messages[4].from_id, second.messages[6].from_id)
+
+        second.index.close()
+
+
+def test_text_entity_runs_use_chat_symbols():
+    record = make_record(
+        1,
+        text=["see ", {"type": "link", "text": "example.org"}],
+        text_entities=[
+            {"type": "plain", "text": "see "},
+            {"type": "link", "text": "example.org"},
+        ],
+    )
+    chat = Chat.from_dict({**example_chat, "messages": [record]})
+    text_entities = chat.messages[0].text_entities
+
+    vampytest.assert_instance(text_entities, TextEntityRuns)
+    vampytest.assert_is(text_entities.symbols, chat.symbols)
+    vampytest.assert_ne(chat.symbols.get_code(text_entities[1].type_), -1)
+
+    # Runs decoded with another table, like in a worker process, are moved over.
+    message = pickle.loads(pickle.dumps(Message.from_dict(record, SymbolTable())))
+    chat.symbols.intern_message(message)
+    vampytest.assert_is(message.text_entities.symbols, chat.symbols)
+    vampytest.assert_eq(
+        list(message.text_entities),
+        [TextEntity("plain", "see "), TextEntity("link", "example.org")],
+    )
+
+
+def test_backup_iter_messages_uses_chat_symbols():
+    with tempfile.TemporaryDirectory() as directory:
+        folder_path = make_backup_folder(
+            os.path.join(directory, "backup"), example_chat["messages"]
+        )
+        backup = Backup.from_folder_path(folder_path)
+
+        with backup.iter_messages() as stream:
+            messages = list(stream)
+
+    vampytest.assert_is(messages[3].from_, backup.chat.messages[1].from_)
+    vampytest.assert_is(messages[2].from_id, backup.chat.messages[0].from_id)
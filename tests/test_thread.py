@@ -0,0 +1,56 @@
+import vampytest
+from helpers import make_record
+from margelet import Chat, ReplyGraph
+
+
+def make_chat():
+    return Chat.from_dict(
+        {
+            "name": "chat",
+            "type": "public_supergroup",
+            "id": 1,
+            "messages": [
+                make_record(1),
+                make_record(2, reply_to_message_id=1),
+                make_record(3),
+                make_record(4, reply_to_message_id=2),
+                make_record(5, reply_to_message_id=1),
+                make_record(6, reply_to_message_id=3),
+                make_record(7, reply_to_message_id=100),
+                make_record(8, reply_to_message_id=7),
+            ],
+        }
+    )
+
+
+def test_thread():
+    chat = make_chat()
+
+    for id_ in (1, 2, 4, 5):
+        vampytest.assert_eq([message.id_ for message in chat.thread(id_)], [1, 2, 4, 5])
+
+    vampytest.assert_eq([message.id_ for message in chat.thread(6)], [3, 6])
+    vampytest.assert_eq([message.id_ for message in chat.thread(8)], [7, 8])
+    vampytest.assert_eq(list(chat.thread(100)), [])
+    vampytest.assert_is(chat.thread(4)[2], chat.messages[3])
+
+
+def test_replies_to():
+    chat = make_chat()
+
+    vampytest.assert_eq([message.id_ for message in chat.replies_to(1)], [2, 5])
+    vampytest.assert_eq([message.id_ for message in chat.replies_to(4)], [])
+    vampytest.assert_eq([message.id_ for message in chat.replies_to(100)], [7])
+
+
+def test_reply_graph():
+    reply_graph = ReplyGraph.from_messages(make_chat().messages)
+
+    vampytest.assert_eq(len(reply_graph), 6)
+    vampytest.assert_eq(reply_graph.parents[4], 2)
+    vampytest.assert_eq(reply_graph.get_root(4), 1)
+    vampytest.assert_eq(reply_graph.get_depth(4), 2)
+    vampytest.assert_eq(reply_graph.get_root(3), 3)
+    vampytest.assert_eq(reply_graph.get_depth(3), 0)
+    vampytest.assert_eq(reply_graph.get_root(8), 7)
+    vampytest.assert_eq(reply_graph.get_depth(8), 1)
@@ -0,0 +1,90 @@
+from datetime import date, datetime, timedelta, timezone
+
+import vampytest
+from helpers import make_chat_data, make_record
+from margelet import Chat, LazyMessageList
+from margelet.timeline import parse_date
+
+
+DAY = 86400
+START = int(datetime(2023, 2, 27, tzinfo=timezone.utc).timestamp())
+
+
+def test_messages_between_sorted():
+    chat = Chat.from_dict(
+        {
+            "name": "chat",
+            "type": "personal_chat",
+            "id": 1,
+            "messages": [
+                make_record(id_, date_unixtime=str(START + id_ * 3600))
+                for id_ in range(72)
+            ],
+        }
+    )
+
+    messages = chat.messages_between(START + 10 * 3600, START + 12 * 3600)
+    vampytest.assert_instance(messages, LazyMessageList)
+    vampytest.assert_eq([message.id_ for message in messages], [10, 11])
+
+    vampytest.assert_eq(len(chat.messages_on(date(2023, 2, 28))), 24)
+    vampytest.assert_eq(len(chat.messages_on(date(2023, 3, 5))), 0)
+    vampytest.assert_eq(
+        len(chat.messages_between(datetime(2023, 2, 27), datetime(2023, 3, 1))), 48
+    )
+
+
+def test_messages_between_unsorted():
+    chat = Chat.from_dict(
+        {
+            "name": "chat",
+            "type": "personal_chat",
+            "id": 1,
+            "messages": [
+                make_record(1, date_unixtime=str(START + DAY)),
+                make_record(2, date_unixtime=str(START)),
+                make_record(3, date_unixtime=str(START + DAY + 1)),
+                make_record(4, date_unixtime=str(START + 2 * DAY)),
+            ],
+        }
+    )
+
+    messages = chat.messages_on(date(2023, 2, 28))
+    vampytest.assert_eq([message.id_ for message in messages], [1, 3])
+    vampytest.assert_is(messages[0], chat.messages[0])
+
+
+def test_messages_between_without_date():
+    chat = Chat.from_dict(
+        make_chat_data(
+            [
+                make_record(1, date_unixtime=str(START)),
+                make_record(2, date=None, date_unixtime=None),
+                make_record(3, date_unixtime=str(START + 1)),
+            ]
+        )
+    )
+
+    messages = chat.messages_on(date(2023, 2, 27))
+    vampytest.assert_eq([message.id_ for message in messages], [1, 3])
+    vampytest.assert_eq(len(chat.time_index), 2)
+
+
+def test_parse_date():
+    utc = timezone.utc
+    vampytest.assert_eq(parse_date("2023-02-27T00:00:00", utc), START)
+    vampytest.assert_eq(parse_date("2023-02-28T10:11:12", utc), START + DAY + 36672)
+    vampytest.assert_eq(
+        parse_date("2023-02-27T10:00:00", timezone(timedelta(hours=1))),
+        START + 9 * 3600,
+    )
+
+    # Without a time zone the date is in local time, like the exporter wrote it.
+    vampytest.assert_eq(
+        parse_date("2023-02-27T10:00:00"),
+        int(datetime(2023, 2, 27, 10).timestamp()),
+    )
+
+    for date_string in ("2023-02-27 10:00:00", "2023-02-27T24:00:00", "27.02.2023"):
+        with vampytest.assert_raises(ValueError):
+            parse_date(date_string)